@@ -2,6 +2,23 @@
 Analizador Semántico - Fase 3 del Compilador
 Adaptado para trabajar con NodoAST de logic.py
 """
+import math
+
+from internador import NOMBRES
+from recorrido import ejecutar_recorrido
+from registro import logger_fase, depuracion_activa
+
+log_semantico = logger_fase("semantico")
+
+# Nodos de expresión sin subexpresiones (ver AnalizadorSemantico.evaluar_hoja)
+HOJAS_EXPRESION = frozenset(["numero", "id", "bool"])
+
+# Errores que reporta el analizador semántico antes de detenerse (None: sin límite)
+MAXIMO_ERRORES_SEMANTICOS = 100
+
+# Bits que puede tener el resultado entero de plegar una potencia constante. Con '^'
+# asociativo a la derecha, 9 ^ 9 ^ 9 es 9 ^ 387420489: calcularlo no termina.
+MAXIMO_BITS_POTENCIA = 4096
 
 class ErrorSemantico:
     """Representa un error semántico."""
@@ -25,6 +42,10 @@ class ErrorSemantico:
             "fatal": self.fatal
         }
 
+class DemasiadosErroresSemanticos(Exception):
+    """El análisis llegó a su máximo de errores; el último de la lista es el resumen"""
+
+
 class Simbolo:
     """Representa un símbolo en la tabla de símbolos."""
     def __init__(self, nombre, tipo, valor=None, linea=0, columna=0, ambito='global'):
@@ -35,21 +56,28 @@ class Simbolo:
         self.columna = columna
         self.ambito = ambito
         self.ubicaciones = [(linea, columna)] if linea > 0 else []  # ⭐ Solo agregar si es válida
+        # Las mismas ubicaciones en un conjunto: ubicaciones conserva el orden de uso y
+        # esto evita recorrerla en cada uso (cuadrático con miles de usos)
+        self.ubicaciones_registradas = set(self.ubicaciones)
     
     def agregar_uso(self, linea, columna):
         """Registra un nuevo uso de la variable (solo si es válido)."""
         # ⭐ Validar que línea y columna sean números válidos
         if linea and isinstance(linea, int) and linea > 0:
-            if (linea, columna) not in self.ubicaciones:
-                self.ubicaciones.append((linea, columna))
+            self._registrar_ubicacion(linea, columna)
 
     def agregar_ubicacion(self, linea, columna):
         """Agrega una nueva ubicación (línea, columna) de uso del símbolo."""
         # ⭐ Validar antes de agregar
         if linea and isinstance(linea, int) and linea > 0:
-            if (linea, columna) not in self.ubicaciones:
-                self.ubicaciones.append((linea, columna))
+            self._registrar_ubicacion(linea, columna)
     
+    def _registrar_ubicacion(self, linea, columna):
+        ubicacion = (linea, columna)
+        if ubicacion not in self.ubicaciones_registradas:
+            self.ubicaciones_registradas.add(ubicacion)
+            self.ubicaciones.append(ubicacion)
+
     def get_ubicaciones_str(self):
         """Retorna las ubicaciones como string."""
         return "; ".join([f"{l}:{c}" for l, c in self.ubicaciones])
@@ -69,11 +97,40 @@ class Simbolo:
         return f"Simbolo({self.nombre}, {self.tipo}, valor={self.valor}, ámbito={self.ambito})"
 
 class TablaSimbolos:
-    """Tabla de símbolos con soporte para ámbitos."""
+    """Tabla de símbolos con soporte para ámbitos.
+
+    Los símbolos se guardan por ámbito con el id del nombre como clave, en el
+    internador que la tabla toma de NOMBRES al crearse; la búsqueda recorre la pila
+    de ámbitos sin armar cadenas.
+    """
     def __init__(self):
-        self.tabla = {}
+        self.internador = NOMBRES.tabla()
+        self.tabla = {}  # (ámbito, id del nombre) -> Simbolo, en orden de declaración
+        self.por_ambito = {'global': {}}
         self.pila_ambitos = ['global']
+        self.pila_tablas = [self.por_ambito['global']]
+        self.depurar = depuracion_activa(log_semantico)
     
+    def __getstate__(self):
+        # Los ids valen solo en este proceso y en este internador: se guardan los nombres
+        nombre = self.internador.nombre
+        estado = self.__dict__.copy()
+        estado['tabla'] = [(ambito, nombre(id_nombre), simbolo)
+                           for (ambito, id_nombre), simbolo in self.tabla.items()]
+        estado['por_ambito'] = {ambito: [(nombre(id_nombre), simbolo) for id_nombre, simbolo in tabla.items()]
+                                for ambito, tabla in self.por_ambito.items()}
+        del estado['pila_tablas'], estado['internador']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.internador = NOMBRES.tabla()
+        id_nombre = self.internador.id
+        self.tabla = {(ambito, id_nombre(nombre)): simbolo for ambito, nombre, simbolo in estado['tabla']}
+        self.por_ambito = {ambito: {id_nombre(nombre): simbolo for nombre, simbolo in simbolos}
+                           for ambito, simbolos in estado['por_ambito'].items()}
+        self.pila_tablas = [self.por_ambito[ambito] for ambito in self.pila_ambitos]
+
     def get_ambito_actual(self):
         """Retorna el ámbito actual."""
         return self.pila_ambitos[-1]
@@ -82,11 +139,14 @@ class TablaSimbolos:
         """Entra en un nuevo ámbito."""
         nuevo_ambito = f"{self.get_ambito_actual()}.{nombre_ambito}"
         self.pila_ambitos.append(nuevo_ambito)
+        # Un ámbito con el mismo nombre comparte sus símbolos
+        self.pila_tablas.append(self.por_ambito.setdefault(nuevo_ambito, {}))
     
     def exit_scope(self):
         """Sale del ámbito actual."""
         if len(self.pila_ambitos) > 1:
             self.pila_ambitos.pop()
+            self.pila_tablas.pop()
     
     def declare(self, nombre, tipo, linea, columna):
         """
@@ -94,27 +154,32 @@ class TablaSimbolos:
         Retorna (success, mensaje).
         """
         ambito = self.get_ambito_actual()
-        clave = f"{ambito}_{nombre}"
+        id_nombre = self.internador.id(nombre)
+        tabla_ambito = self.pila_tablas[-1]
         
-        if clave in self.tabla:
+        if id_nombre in tabla_ambito:
             return False, f"Variable '{nombre}' ya declarada en el ámbito {ambito}"
         
         simbolo = Simbolo(nombre, tipo, None, linea, columna, ambito)
-        self.tabla[clave] = simbolo
+        tabla_ambito[id_nombre] = simbolo
+        self.tabla[(ambito, id_nombre)] = simbolo
         return True, None
     
     def lookup(self, nombre, linea, columna):
-        for i in range(len(self.pila_ambitos) - 1, -1, -1):
-            ambito = self.pila_ambitos[i]
-            clave = f"{ambito}_{nombre}"
-            if clave in self.tabla:
-                simbolo = self.tabla[clave]
+        id_nombre = self.internador.ids.get(nombre)
+        if id_nombre is None:
+            return None, f"Variable '{nombre}' no declarada"
+
+        for tabla_ambito in reversed(self.pila_tablas):
+            simbolo = tabla_ambito.get(id_nombre)
+            if simbolo is not None:
 
                 if linea and isinstance(linea, int) and linea > 0:
-                    print(f"Registrando uso de '{nombre}' en línea {linea}")  # DEBUG
+                    if self.depurar:
+                        log_semantico.debug("Registrando uso de '%s' en línea %s", nombre, linea)
                     simbolo.agregar_uso(linea, columna)
-                else:
-                    print(f"Intentando registrar '{nombre}' con linea={linea}, columna={columna}")  # DEBUG
+                elif self.depurar:
+                    log_semantico.debug("Intentando registrar '%s' con linea=%s, columna=%s", nombre, linea, columna)
                 return simbolo, None
         
         return None, f"Variable '{nombre}' no declarada"
@@ -157,13 +222,37 @@ class NodoAnotado:
 class AnalizadorSemantico:
     """Analizador semántico que recorre el AST y verifica reglas semánticas."""
     
-    def __init__(self):
+    def __init__(self, maximo_errores=MAXIMO_ERRORES_SEMANTICOS):
         self.tabla_simbolos = TablaSimbolos()
         self.errores = []
         self.should_stop = False
+        self.maximo_errores = maximo_errores
+        # Posiciones con error: un segundo error en la misma posición se descarta
+        self.posiciones_error = set()
+        self.errores_suprimidos = 0
     
     def report_error(self, tipo, descripcion, linea, columna, fatal=False):
-        """Reporta un error semántico."""
+        """
+        Reporta un error semántico. Se descarta (retorna None) si ya hay uno en
+        la misma posición. Pasados maximo_errores se agrega un resumen fatal y el
+        análisis se detiene con DemasiadosErroresSemanticos.
+        """
+        if linea:
+            posicion = (linea, columna)
+            if posicion in self.posiciones_error:
+                self.errores_suprimidos += 1
+                return None
+            self.posiciones_error.add(posicion)
+
+        if self.maximo_errores is not None and len(self.errores) >= self.maximo_errores:
+            self.errores.append(ErrorSemantico(
+                "LIMITE_ERRORES",
+                f"Se alcanzó el máximo de {self.maximo_errores} errores semánticos; el análisis se detuvo aquí",
+                linea, columna, fatal=True,
+            ))
+            self.should_stop = True
+            raise DemasiadosErroresSemanticos()
+
         error = ErrorSemantico(tipo, descripcion, linea, columna, fatal)
         self.errores.append(error)
         if fatal:
@@ -188,6 +277,10 @@ class AnalizadorSemantico:
         """Verifica compatibilidad de tipos."""
         if tipo_dest == tipo_src:
             return True, None
+
+        # Un operando con tipo "error" ya se reportó: no se reporta otra vez en cascada
+        if tipo_dest == "error" or tipo_src == "error":
+            return True, None
         
         # Promoción int -> float permitida
         if tipo_dest == 'float' and tipo_src == 'int':
@@ -211,17 +304,30 @@ class AnalizadorSemantico:
             self.report_error("AST_INVALIDO", "El AST está vacío", 0, 0, fatal=True)
             return None, self.tabla_simbolos, self.errores
         
-        # Imprimir el AST original
-        self.imprimir_ast(ast_root)
+        # AST original en el registro de depuración
+        if depuracion_activa(log_semantico):
+            self.imprimir_ast(ast_root)
 
         # Anotar el AST completo
-        ast_anotado = self.anotar_nodo(ast_root)
+        try:
+            ast_anotado = self.anotar_nodo(ast_root)
+        except DemasiadosErroresSemanticos:
+            log_semantico.warning("%s (%d errores repetidos suprimidos)",
+                                  self.errores[-1].descripcion, self.errores_suprimidos)
+            return None, self.tabla_simbolos, self.errores
         
         return ast_anotado, self.tabla_simbolos, self.errores
 
     
     def anotar_nodo(self, nodo):
         """Anota un nodo del AST con información semántica."""
+        return ejecutar_recorrido(self._anotar_nodo(nodo))
+
+    def _anotar_nodo(self, nodo):
+        """
+        Generador de anotar_nodo para ejecutar_recorrido: los nodos hijos se piden
+        con yield, así la profundidad del AST no consume la pila de Python.
+        """
         if nodo is None:
             return None
         
@@ -233,10 +339,10 @@ class AnalizadorSemantico:
             
         # Procesar según tipo de nodo
         if nodo.tipo == "programa":
-            self.procesar_programa(nodo, nodo_anotado)
+            yield from self.procesar_programa(nodo, nodo_anotado)
         
         elif nodo.tipo == "main":
-            self.procesar_main(nodo, nodo_anotado)
+            yield from self.procesar_main(nodo, nodo_anotado)
         
         elif nodo.tipo == "declaracion_variable":
             self.procesar_declaracion(nodo, nodo_anotado)
@@ -248,13 +354,13 @@ class AnalizadorSemantico:
             self.procesar_incremento_decremento(nodo, nodo_anotado)
         
         elif nodo.tipo == "seleccion":
-            self.procesar_seleccion(nodo, nodo_anotado)
+            yield from self.procesar_seleccion(nodo, nodo_anotado)
         
         elif nodo.tipo == "iteracion":
-            self.procesar_iteracion(nodo, nodo_anotado)
+            yield from self.procesar_iteracion(nodo, nodo_anotado)
         
         elif nodo.tipo == "repeticion":
-            self.procesar_repeticion(nodo, nodo_anotado)
+            yield from self.procesar_repeticion(nodo, nodo_anotado)
         
         elif nodo.tipo == "sent_in":
             self.procesar_entrada(nodo, nodo_anotado)
@@ -265,23 +371,23 @@ class AnalizadorSemantico:
         else:
             # Para otros nodos, anotar hijos recursivamente
             for hijo in nodo.hijos:
-                hijo_anotado = self.anotar_nodo(hijo)
+                hijo_anotado = yield self._anotar_nodo(hijo)
                 if hijo_anotado:
                     nodo_anotado.agregar_hijo(hijo_anotado)
         
         return nodo_anotado
     
     def procesar_programa(self, nodo, nodo_anotado):
-        """Procesa el nodo programa."""
+        """Procesa el nodo programa (generador, ver _anotar_nodo)."""
         for hijo in nodo.hijos:
-            hijo_anotado = self.anotar_nodo(hijo)
+            hijo_anotado = yield self._anotar_nodo(hijo)
             if hijo_anotado:
                 nodo_anotado.agregar_hijo(hijo_anotado)
     
     def procesar_main(self, nodo, nodo_anotado):
-        """Procesa el bloque main."""
+        """Procesa el bloque main (generador, ver _anotar_nodo)."""
         for hijo in nodo.hijos:
-            hijo_anotado = self.anotar_nodo(hijo)
+            hijo_anotado = yield self._anotar_nodo(hijo)
             if hijo_anotado:
                 nodo_anotado.agregar_hijo(hijo_anotado)
     
@@ -419,12 +525,80 @@ class AnalizadorSemantico:
     
     def evaluar_expresion(self, nodo):
         """Evalúa una expresión y retorna nodo anotado con tipo y valor."""
+        return ejecutar_recorrido(self._evaluar_expresion(nodo))
+
+    def _evaluar_expresion(self, nodo):
+        """Generador de evaluar_expresion para ejecutar_recorrido."""
         if nodo is None:
             nodo_error = NodoAnotado("error", None)
             nodo_error.tipo_dato = "error"
             nodo_error.valor_calculado = "error"
             return nodo_error
         
+        hoja = self.evaluar_hoja(nodo)
+        if hoja is not None:
+            return hoja
+
+        nodo_anotado = NodoAnotado(nodo.tipo, nodo.valor)
+        nodo_anotado.linea = getattr(nodo, 'linea', 0)
+        nodo_anotado.columna = getattr(nodo, 'columna', 0)
+        
+        # Operadores suma/resta
+        if nodo.tipo == "suma_op":
+            yield from self.evaluar_operacion_aritmetica(nodo, nodo_anotado)
+        
+        # Operadores multiplicación/división
+        elif nodo.tipo == "mult_op":
+            yield from self.evaluar_operacion_aritmetica(nodo, nodo_anotado)
+        
+        # Operador potencia
+        elif nodo.tipo == "pot_op":
+            yield from self.evaluar_operacion_aritmetica(nodo, nodo_anotado)
+        
+        # Operadores relacionales
+        elif nodo.tipo == "rel_op":
+            yield from self.evaluar_operacion_relacional(nodo, nodo_anotado)
+        
+        # Operadores lógicos
+        elif nodo.tipo == "log_op":
+            yield from self.evaluar_operacion_logica(nodo, nodo_anotado)
+        
+        # Expresiones compuestas
+        elif nodo.tipo in ["expresion_simple", "expresion_logica", "expresion_relacional", "expresion"]:
+            if len(nodo.hijos) == 1:
+                return (yield self._evaluar_expresion(nodo.hijos[0]))
+            else:
+                for hijo in nodo.hijos:
+                    hijo_anotado = yield self._evaluar_expresion(hijo)
+                    nodo_anotado.agregar_hijo(hijo_anotado)
+                
+                if nodo_anotado.hijos:
+                    ultimo = nodo_anotado.hijos[-1]
+                    nodo_anotado.tipo_dato = ultimo.tipo_dato
+                    nodo_anotado.valor_calculado = ultimo.valor_calculado
+        
+        else:
+            # Otros nodos: procesar hijos
+            for hijo in nodo.hijos:
+                hijo_anotado = yield self._evaluar_expresion(hijo)
+                nodo_anotado.agregar_hijo(hijo_anotado)
+            
+            if nodo_anotado.hijos:
+                ultimo = nodo_anotado.hijos[-1]
+                nodo_anotado.tipo_dato = ultimo.tipo_dato
+                nodo_anotado.valor_calculado = ultimo.valor_calculado
+        
+        return nodo_anotado
+    
+    def evaluar_hoja(self, nodo):
+        """
+        Evalúa un número, identificador o booleano; None si nodo no es una hoja.
+        Las operaciones evalúan así sus operandos simples sin pasar por la pila
+        de ejecutar_recorrido.
+        """
+        if nodo.tipo not in HOJAS_EXPRESION:
+            return None
+
         nodo_anotado = NodoAnotado(nodo.tipo, nodo.valor)
         nodo_anotado.linea = getattr(nodo, 'linea', 0)
         nodo_anotado.columna = getattr(nodo, 'columna', 0)
@@ -467,59 +641,14 @@ class AnalizadorSemantico:
                 nodo_anotado.valor_calculado = "error"
             
         # Booleano
-        elif nodo.tipo == "bool":
+        else:
             nodo_anotado.tipo_dato = "bool"
             nodo_anotado.valor_calculado = nodo.valor == "true"
         
-        # Operadores suma/resta
-        elif nodo.tipo == "suma_op":
-            self.evaluar_operacion_aritmetica(nodo, nodo_anotado)
-        
-        # Operadores multiplicación/división
-        elif nodo.tipo == "mult_op":
-            self.evaluar_operacion_aritmetica(nodo, nodo_anotado)
-        
-        # Operador potencia
-        elif nodo.tipo == "pot_op":
-            self.evaluar_operacion_aritmetica(nodo, nodo_anotado)
-        
-        # Operadores relacionales
-        elif nodo.tipo == "rel_op":
-            self.evaluar_operacion_relacional(nodo, nodo_anotado)
-        
-        # Operadores lógicos
-        elif nodo.tipo == "log_op":
-            self.evaluar_operacion_logica(nodo, nodo_anotado)
-        
-        # Expresiones compuestas
-        elif nodo.tipo in ["expresion_simple", "expresion_logica", "expresion_relacional", "expresion"]:
-            if len(nodo.hijos) == 1:
-                return self.evaluar_expresion(nodo.hijos[0])
-            else:
-                for hijo in nodo.hijos:
-                    hijo_anotado = self.evaluar_expresion(hijo)
-                    nodo_anotado.agregar_hijo(hijo_anotado)
-                
-                if nodo_anotado.hijos:
-                    ultimo = nodo_anotado.hijos[-1]
-                    nodo_anotado.tipo_dato = ultimo.tipo_dato
-                    nodo_anotado.valor_calculado = ultimo.valor_calculado
-        
-        else:
-            # Otros nodos: procesar hijos
-            for hijo in nodo.hijos:
-                hijo_anotado = self.evaluar_expresion(hijo)
-                nodo_anotado.agregar_hijo(hijo_anotado)
-            
-            if nodo_anotado.hijos:
-                ultimo = nodo_anotado.hijos[-1]
-                nodo_anotado.tipo_dato = ultimo.tipo_dato
-                nodo_anotado.valor_calculado = ultimo.valor_calculado
-        
         return nodo_anotado
-    
+
     def evaluar_operacion_aritmetica(self, nodo, nodo_anotado):
-        """Evalúa operaciones aritméticas."""
+        """Evalúa operaciones aritméticas (generador, ver _evaluar_expresion)."""
         if len(nodo.hijos) < 2:
             # nodo_anotado.tipo_dato = "desconocido"
             # nodo_anotado.valor_calculado = None
@@ -527,8 +656,8 @@ class AnalizadorSemantico:
             nodo_anotado.valor_calculado = "error"
             return
         
-        izq = self.evaluar_expresion(nodo.hijos[0])
-        der = self.evaluar_expresion(nodo.hijos[1])
+        izq = self.evaluar_hoja(nodo.hijos[0]) or (yield self._evaluar_expresion(nodo.hijos[0]))
+        der = self.evaluar_hoja(nodo.hijos[1]) or (yield self._evaluar_expresion(nodo.hijos[1]))
         
         nodo_anotado.agregar_hijo(izq)
         nodo_anotado.agregar_hijo(der)
@@ -578,7 +707,16 @@ class AnalizadorSemantico:
                 elif nodo.valor == '%':
                     resultado = val_izq % val_der
                 elif nodo.valor == '^':
-                    resultado = val_izq ** val_der
+                    # Con |base| >= 2 cada unidad del exponente agrega al menos un bit
+                    if tipo_resultado == 'int' and abs(val_izq) > 1 and (
+                            val_der > MAXIMO_BITS_POTENCIA
+                            or val_der * math.log2(abs(val_izq)) > MAXIMO_BITS_POTENCIA):
+                        self.report_error("DESBORDAMIENTO",
+                                        f"La potencia {val_izq} ^ {val_der} excede {MAXIMO_BITS_POTENCIA} bits",
+                                        getattr(nodo, 'linea', 0), getattr(nodo, 'columna', 0))
+                        resultado = None
+                    else:
+                        resultado = val_izq ** val_der
                 else:
                     resultado = None
                 
@@ -588,14 +726,14 @@ class AnalizadorSemantico:
                 nodo_anotado.valor_calculado = None
 
     def evaluar_operacion_relacional(self, nodo, nodo_anotado):
-        """Evalúa operaciones relacionales (<, >, <=, >=, ==, !=)."""
+        """Evalúa operaciones relacionales (<, >, <=, >=, ==, !=) (generador, ver _evaluar_expresion)."""
         if len(nodo.hijos) < 2:
             nodo_anotado.tipo_dato = "bool"
             nodo_anotado.valor_calculado = None
             return
 
-        izq = self.evaluar_expresion(nodo.hijos[0])
-        der = self.evaluar_expresion(nodo.hijos[1])
+        izq = self.evaluar_hoja(nodo.hijos[0]) or (yield self._evaluar_expresion(nodo.hijos[0]))
+        der = self.evaluar_hoja(nodo.hijos[1]) or (yield self._evaluar_expresion(nodo.hijos[1]))
 
         nodo_anotado.agregar_hijo(izq)
         nodo_anotado.agregar_hijo(der)
@@ -630,10 +768,10 @@ class AnalizadorSemantico:
             nodo_anotado.valor_calculado = None
 
     def evaluar_operacion_logica(self, nodo, nodo_anotado):
-        """Evalúa operaciones lógicas (AND, OR, NOT)."""
+        """Evalúa operaciones lógicas (AND, OR, NOT) (generador, ver _evaluar_expresion)."""
         # NOT es unario
         if nodo.valor == 'not':
-            hijo = self.evaluar_expresion(nodo.hijos[0])
+            hijo = self.evaluar_hoja(nodo.hijos[0]) or (yield self._evaluar_expresion(nodo.hijos[0]))
             nodo_anotado.agregar_hijo(hijo)
             nodo_anotado.tipo_dato = "bool"
             
@@ -644,14 +782,18 @@ class AnalizadorSemantico:
             return
 
         # AND / OR binarios
-        izq = self.evaluar_expresion(nodo.hijos[0])
-        der = self.evaluar_expresion(nodo.hijos[1])
+        izq = self.evaluar_hoja(nodo.hijos[0]) or (yield self._evaluar_expresion(nodo.hijos[0]))
+        der = self.evaluar_hoja(nodo.hijos[1]) or (yield self._evaluar_expresion(nodo.hijos[1]))
 
         nodo_anotado.agregar_hijo(izq)
         nodo_anotado.agregar_hijo(der)
 
         nodo_anotado.tipo_dato = "bool"
 
+        if "error" in (izq.tipo_dato, der.tipo_dato):
+            nodo_anotado.valor_calculado = None
+            return
+
         if izq.tipo_dato != "bool" or der.tipo_dato != "bool":
             self.report_error("TIPO_INCOMPATIBLE",
                             "Operación lógica requiere operandos booleanos",
@@ -667,30 +809,26 @@ class AnalizadorSemantico:
             nodo_anotado.valor_calculado = None
 
 
+    # Con errores sintácticos el parser puede dejar un bloque sin su lista de
+    # sentencias o sin condición: se recorren los hijos que hay, según su tipo
     def procesar_seleccion(self, nodo, nodo_anotado):
-        condicion = self.evaluar_expresion(nodo.hijos[0])
-        nodo_anotado.agregar_hijo(condicion)
-        bloque_then = self.anotar_nodo(nodo.hijos[1])
-        nodo_anotado.agregar_hijo(bloque_then)
-
-        if len(nodo.hijos) > 2:
-            bloque_else = self.anotar_nodo(nodo.hijos[2])
-            nodo_anotado.agregar_hijo(bloque_else)
+        yield from self._procesar_control(nodo, nodo_anotado)
     
     def procesar_iteracion(self, nodo, nodo_anotado):
-        condicion = self.evaluar_expresion(nodo.hijos[0])
-        nodo_anotado.agregar_hijo(condicion)
-
-        bloque = self.anotar_nodo(nodo.hijos[1])
-        nodo_anotado.agregar_hijo(bloque)
+        yield from self._procesar_control(nodo, nodo_anotado)
 
 
     def procesar_repeticion(self, nodo, nodo_anotado):
-        bloque = self.anotar_nodo(nodo.hijos[0])
-        nodo_anotado.agregar_hijo(bloque)
+        yield from self._procesar_control(nodo, nodo_anotado)
 
-        condicion = self.evaluar_expresion(nodo.hijos[1])
-        nodo_anotado.agregar_hijo(condicion)
+    def _procesar_control(self, nodo, nodo_anotado):
+        """Condición y bloques de un if, while o do, en el orden en que están"""
+        for hijo in nodo.hijos:
+            if hijo.tipo == "condicion":
+                anotado = yield self._evaluar_expresion(hijo)
+            else:
+                anotado = yield self._anotar_nodo(hijo)
+            nodo_anotado.agregar_hijo(anotado)
 
     
     def procesar_entrada(self, nodo, nodo_anotado):
@@ -752,17 +890,18 @@ class AnalizadorSemantico:
             nodo_anotado.agregar_hijo(hijo_anotado)
 
     def imprimir_ast(self, nodo, nivel=0):
-        """Imprime el AST de forma legible."""
+        """Escribe el AST de forma legible en el registro de depuración."""
         if nodo is None:
             return
         
-        indent = "  " * nivel
-        print(f"{indent}{nodo.tipo} = {nodo.valor}")
-        
-        for hijo in nodo.hijos:
-            self.imprimir_ast(hijo, nivel + 1)
+        pila = [(nodo, nivel)]
+        while pila:
+            nodo, nivel = pila.pop()
+            indent = "  " * nivel
+            log_semantico.debug("%s%s = %s", indent, nodo.tipo, nodo.valor)
+            pila.extend((hijo, nivel + 1) for hijo in reversed(nodo.hijos))
 
-def ejecutar_analisis_semantico(ast):
+def ejecutar_analisis_semantico(ast, maximo_errores=MAXIMO_ERRORES_SEMANTICOS):
     """Función principal para ejecutar el análisis semántico."""
-    analizador = AnalizadorSemantico()
+    analizador = AnalizadorSemantico(maximo_errores)
     return analizador.analizar(ast)
\ No newline at end of file
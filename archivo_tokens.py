@@ -0,0 +1,153 @@
+# archivo_tokens.py
+# Formato binario de tokens, mapeable en memoria:
+#   encabezado   b'TOKB', versión, cantidad de tokens, cantidad de cadenas (4 x uint32)
+#   registros    por token: tipo, línea, columna, valor (4 x uint32); tipo y valor
+#                son índices en la tabla de cadenas
+#   cadenas      offsets (cantidad + 1 x uint32) seguidos de los bytes UTF-8
+# Todos los enteros van en little-endian. Abrir el archivo no lee los tokens:
+# cada acceso decodifica solo el registro pedido.
+#
+# Uso: python archivo_tokens.py tokens.bin --text [salida.txt]
+
+import mmap
+import struct
+import sys
+from array import array
+
+MAGIA = b'TOKB'
+VERSION = 1
+ENCABEZADO = struct.Struct('<4sIII')
+CAMPOS_REGISTRO = 4
+
+
+def _little_endian(datos):
+    if sys.byteorder == 'big':
+        datos.byteswap()
+    return datos
+
+
+class TokenBinario:
+    """Token leído de un ArchivoTokens"""
+    __slots__ = ('tipo', 'valor', 'linea', 'columna')
+
+    def __init__(self, tipo, valor, linea, columna):
+        self.tipo = tipo
+        self.valor = valor
+        self.linea = linea
+        self.columna = columna
+
+    def __repr__(self):
+        return f"{self.tipo}('{self.valor}') en línea {self.linea}, columna {self.columna}"
+
+
+def escribir_tokens_binarios(tokens, ruta):
+    """Guarda los tokens (cualquier objeto con tipo, valor, linea y columna) en ruta"""
+    with open(ruta, 'wb') as f:
+        f.write(tokens_binarios(tokens))
+
+
+def tokens_binarios(tokens):
+    """Contenido del archivo binario para los tokens"""
+    indices = {}
+    cadenas = []
+
+    def indice(cadena):
+        i = indices.get(cadena)
+        if i is None:
+            i = indices[cadena] = len(cadenas)
+            cadenas.append(cadena)
+        return i
+
+    registros = array('I')
+    for token in tokens:
+        registros.extend((indice(token.tipo), token.linea, token.columna, indice(token.valor)))
+
+    datos = [cadena.encode('utf-8') for cadena in cadenas]
+    offsets = array('I', [0])
+    for dato in datos:
+        offsets.append(offsets[-1] + len(dato))
+
+    return b''.join([
+        ENCABEZADO.pack(MAGIA, VERSION, len(registros) // CAMPOS_REGISTRO, len(cadenas)),
+        _little_endian(registros).tobytes(),
+        _little_endian(offsets).tobytes(),
+    ] + datos)
+
+
+def es_archivo_binario(ruta):
+    """Indica si ruta empieza con la marca del formato binario"""
+    try:
+        with open(ruta, 'rb') as f:
+            return f.read(len(MAGIA)) == MAGIA
+    except OSError:
+        return False
+
+
+class ArchivoTokens:
+    """
+    Tokens de un archivo binario, accesibles como una lista de solo lectura.
+    El archivo se mapea en memoria; las cadenas se decodifican al pedirlas y
+    quedan en caché.
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, 'rb') as f:
+            self.mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        vista = memoryview(self.mapa)
+
+        magia, version, self.cantidad, cantidad_cadenas = ENCABEZADO.unpack_from(vista)
+        if magia != MAGIA or version != VERSION:
+            raise ValueError(f"{ruta} no es un archivo de tokens binario (versión {VERSION})")
+
+        inicio = ENCABEZADO.size
+        fin_registros = inicio + 4 * CAMPOS_REGISTRO * self.cantidad
+        fin_offsets = fin_registros + 4 * (cantidad_cadenas + 1)
+        if sys.byteorder == 'little':
+            self.registros = vista[inicio:fin_registros].cast('I')
+            self.offsets = vista[fin_registros:fin_offsets].cast('I')
+        else:
+            self.registros = _little_endian(array('I', vista[inicio:fin_registros]))
+            self.offsets = _little_endian(array('I', vista[fin_registros:fin_offsets]))
+        self.datos = vista[fin_offsets:]
+        self.cadenas = {}
+
+    def cadena(self, indice):
+        cadena = self.cadenas.get(indice)
+        if cadena is None:
+            cadena = str(self.datos[self.offsets[indice]:self.offsets[indice + 1]], 'utf-8')
+            self.cadenas[indice] = cadena
+        return cadena
+
+    def __len__(self):
+        return self.cantidad
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self.cantidad
+        if not 0 <= indice < self.cantidad:
+            raise IndexError("índice de token fuera de rango")
+        base = indice * CAMPOS_REGISTRO
+        tipo, linea, columna, valor = self.registros[base:base + CAMPOS_REGISTRO]
+        return TokenBinario(self.cadena(tipo), self.cadena(valor), linea, columna)
+
+    def __iter__(self):
+        for indice in range(self.cantidad):
+            yield self[indice]
+
+
+def exportar_texto(ruta, salida):
+    """Escribe los tokens de ruta en el formato de texto TIPO('valor') en línea X, columna Y"""
+    for token in ArchivoTokens(ruta):
+        salida.write(f"{token}\n")
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    if len(argumentos) not in (2, 3) or argumentos[1] != '--text':
+        print("Uso: python archivo_tokens.py tokens.bin --text [salida.txt]")
+        sys.exit(1)
+    if len(argumentos) == 3:
+        with open(argumentos[2], 'w', encoding='utf-8') as salida:
+            exportar_texto(argumentos[0], salida)
+    else:
+        exportar_texto(argumentos[0], sys.stdout)
@@ -0,0 +1,200 @@
+# arena_ast.py
+# AST en arena: cada nodo es un índice en arreglos paralelos (tipo, valor, primer
+# hijo, siguiente hermano, línea, columna) en lugar de un objeto con su dict y su
+# lista de hijos. El tipo y el valor se guardan como ids del internador que la
+# arena toma de NOMBRES al crearse. NodoArena es una vista de un índice con la
+# interfaz de NodoAST (tipo, valor, hijos, linea, columna, agregar_hijo,
+# set_posicion), así el analizador sintáctico arma el árbol igual que con objetos
+# y las fases siguientes lo leen sin cambios.
+
+from array import array
+
+from internador import NOMBRES
+
+# Valor None, línea/columna None o sin hijo/hermano
+NINGUNO = -1
+
+# Nodos cuyas vistas de hijos guarda una arena (ver ArenaAST.vistas)
+VISTAS_GUARDADAS = 64
+
+
+class ArenaAST:
+    """Nodos de un AST en arreglos paralelos indexados por el número de nodo"""
+
+    def __init__(self):
+        self.internador = NOMBRES.tabla()
+        self.tipos = array('i')
+        self.valores = array('i')
+        self.primer_hijo = array('i')
+        self.siguiente = array('i')
+        self.lineas = array('i')
+        self.columnas = array('i')
+        # Último hijo de cada nodo, para agregar hijos al final en O(1)
+        self.ultimo_hijo = array('i')
+        # Índice -> tupla de vistas de sus hijos, de los últimos nodos consultados. Se
+        # acota para no retener una vista por nodo después de recorrer el árbol.
+        self.vistas_hijos = {}
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def nuevo(self, tipo, valor=None):
+        """Agrega un nodo sin hijos ni posición; retorna su índice"""
+        indice = len(self.tipos)
+        self.tipos.append(self.internador.id(tipo))
+        self.valores.append(NINGUNO if valor is None else self.internador.id(valor))
+        self.primer_hijo.append(NINGUNO)
+        self.siguiente.append(NINGUNO)
+        self.lineas.append(NINGUNO)
+        self.columnas.append(NINGUNO)
+        self.ultimo_hijo.append(NINGUNO)
+        return indice
+
+    def nodo(self, tipo, valor=None):
+        """Agrega un nodo y retorna su vista; misma firma que NodoAST"""
+        return NodoArena(self, self.nuevo(tipo, valor))
+
+    def agregar_hijo(self, padre, hijo):
+        """
+        Agrega hijo al final de los hijos de padre. Un hijo que se mueve de otro
+        nodo corta la lista de ese nodo: el parser solo mueve todos los hijos de un
+        nodo descartado, en orden.
+        """
+        if self.vistas_hijos:
+            self.vistas_hijos.clear()
+        self.siguiente[hijo] = NINGUNO
+        ultimo = self.ultimo_hijo[padre]
+        if ultimo == NINGUNO:
+            self.primer_hijo[padre] = hijo
+        else:
+            self.siguiente[ultimo] = hijo
+        self.ultimo_hijo[padre] = hijo
+
+    def hijos(self, indice):
+        """Índices de los hijos de indice, en orden"""
+        siguiente = self.siguiente
+        resultado = []
+        hijo = self.primer_hijo[indice]
+        while hijo != NINGUNO:
+            resultado.append(hijo)
+            hijo = siguiente[hijo]
+        return resultado
+
+    def vistas(self, indice):
+        """
+        Tupla de NodoArena de los hijos de indice. Se guarda para los últimos
+        VISTAS_GUARDADAS nodos: leer varias veces los hijos de un nodo (len(nodo.hijos)
+        y después nodo.hijos[i]) los arma una sola vez.
+        """
+        vistas = self.vistas_hijos.get(indice)
+        if vistas is None:
+            siguiente = self.siguiente
+            lista = []
+            hijo = self.primer_hijo[indice]
+            while hijo != NINGUNO:
+                lista.append(NodoArena(self, hijo))
+                hijo = siguiente[hijo]
+            vistas = tuple(lista)
+            if len(self.vistas_hijos) >= VISTAS_GUARDADAS:
+                del self.vistas_hijos[next(iter(self.vistas_hijos))]
+            self.vistas_hijos[indice] = vistas
+        return vistas
+
+    def preorden(self, raiz, nivel=0):
+        """(índice, nivel) de cada nodo bajo raiz en preorden, con una pila de índices"""
+        primer_hijo, siguiente = self.primer_hijo, self.siguiente
+        pila = [(raiz, nivel)]
+        while pila:
+            indice, nivel = pila.pop()
+            yield indice, nivel
+            # El primer hijo queda arriba de la pila: se apilan de atrás hacia adelante
+            hijos = []
+            hijo = primer_hijo[indice]
+            while hijo != NINGUNO:
+                hijos.append((hijo, nivel + 1))
+                hijo = siguiente[hijo]
+            hijos.reverse()
+            pila.extend(hijos)
+
+    def tipo(self, indice):
+        return self.internador.nombres[self.tipos[indice]]
+
+    def valor(self, indice):
+        valor = self.valores[indice]
+        return None if valor == NINGUNO else self.internador.nombres[valor]
+
+    def bytes_por_nodo(self):
+        """Bytes que ocupa cada nodo en los arreglos (sin contar la reserva de crecimiento)"""
+        return sum(arreglo.itemsize for arreglo in (
+            self.tipos, self.valores, self.primer_hijo, self.siguiente,
+            self.lineas, self.columnas, self.ultimo_hijo,
+        ))
+
+
+class NodoArena:
+    """Vista de un nodo de una ArenaAST con la interfaz de NodoAST"""
+    __slots__ = ('arena', 'indice')
+
+    def __init__(self, arena, indice):
+        self.arena = arena
+        self.indice = indice
+
+    @property
+    def tipo(self):
+        arena = self.arena
+        return arena.internador.nombres[arena.tipos[self.indice]]
+
+    @property
+    def valor(self):
+        arena = self.arena
+        valor = arena.valores[self.indice]
+        return None if valor == NINGUNO else arena.internador.nombres[valor]
+
+    @property
+    def hijos(self):
+        """Vistas de los hijos en una tupla: los hijos se agregan con agregar_hijo"""
+        return self.arena.vistas(self.indice)
+
+    @property
+    def linea(self):
+        linea = self.arena.lineas[self.indice]
+        return None if linea == NINGUNO else linea
+
+    @linea.setter
+    def linea(self, linea):
+        self.arena.lineas[self.indice] = NINGUNO if linea is None else linea
+
+    @property
+    def columna(self):
+        columna = self.arena.columnas[self.indice]
+        return None if columna == NINGUNO else columna
+
+    @columna.setter
+    def columna(self, columna):
+        self.arena.columnas[self.indice] = NINGUNO if columna is None else columna
+
+    def agregar_hijo(self, hijo):
+        if hijo:
+            self.arena.agregar_hijo(self.indice, hijo.indice)
+
+    def set_posicion(self, linea, columna):
+        """Establece la posición del nodo"""
+        self.linea = linea
+        self.columna = columna
+        return self
+
+    def debug(self, nivel=0):
+        arena = self.arena
+        for indice, nivel in arena.preorden(self.indice, nivel):
+            nodo = NodoArena(arena, indice)
+            sangria = "  " * nivel
+            print(f"{sangria}- {nodo.tipo} (valor={nodo.valor}, linea={nodo.linea}, columna={nodo.columna})")
+
+    def __eq__(self, otro):
+        return isinstance(otro, NodoArena) and otro.arena is self.arena and otro.indice == self.indice
+
+    def __hash__(self):
+        return hash((id(self.arena), self.indice))
+
+    def __str__(self):
+        return f"NodoAST({self.tipo}, {self.valor})"
@@ -0,0 +1,575 @@
+# automata_lexico.py
+# Especificación léxica única del lenguaje y su compilación a un autómata finito
+# determinista mínimo guardado en tablas (estados x clases de caracteres).
+# La usan el analizador léxico, el resaltador de sintaxis y el mapeo de tipos
+# del analizador sintáctico, así que los tres reconocen siempre lo mismo.
+
+from array import array
+
+# ============================================================
+#                 ESPECIFICACIÓN DE TOKENS
+# ============================================================
+
+# (clase, patrón, tipo de token que produce). El orden es la prioridad cuando dos
+# clases reconocen el mismo lexema; se toma siempre el lexema más largo.
+# Sintaxis de los patrones: literales, '.', [...], [^...], (...), |, *, +, ?
+# y los escapes \n, \t, \l (letra: str.isalpha), \d (dígito: str.isdigit),
+# \w (str.isalnum o '_'); cualquier otro carácter escapado es literal.
+ESPECIFICACION_TOKENS = [
+    ('SALTO_LINEA', r'\n', None),
+    ('ESPACIO', r'[ \t]+', None),
+    ('COMENTARIO_LINEA', r'//[^\n]*', None),
+    # Termina en el primer '*/' (el '*' de la apertura no cuenta) o al final del texto
+    ('COMENTARIO_BLOQUE', r'/\*([^*]|\*+[^*/])*(\*+/|\**)', None),
+    ('IDENTIFICADOR', r'\l\w*', 'IDENTIFICADOR'),
+    ('NUMERO_REAL', r'\d+\.\d+', 'NUMERO_REAL'),
+    ('NUMERO_INCOMPLETO', r'\d+\.', 'ERROR'),
+    ('NUMERO_ENTERO', r'\d+', 'NUMERO_ENTERO'),
+    ('OPERADOR_ARITMETICO', r'\+\+|--|[-+*/%^]', 'OPERADOR_ARITMETICO'),
+    ('OPERADOR_RELACIONAL', r'[<>!=]=|<<|>>|[<>!]', 'OPERADOR_RELACIONAL'),
+    ('OPERADOR_ASIGNACION', r'=', 'OPERADOR_ASIGNACION'),
+    ('OPERADOR_LOGICO', r'&+|\|+', 'OPERADOR_LOGICO'),
+    ('ESPECIAL', r'[(){}\[\];,:°\'"]', 'ESPECIAL'),
+    ('ERROR', r'[^ \t]', 'ERROR'),
+]
+
+# Identificadores que el léxico reporta como PALABRA_RESERVADA
+PALABRAS_RESERVADAS = frozenset([
+    "if", "else", "end", "do", "while", "for", "switch", "case", "break", "int", "float", "string",
+    "main", "cin", "cout", "def", "class", "import", "from", "return", "then", "until"
+])
+
+# Nombre que usa el analizador sintáctico para los tipos que renombra
+TIPOS_SINTACTICOS = {
+    'NUMERO_REAL': 'NUMERO_DECIMAL',
+}
+
+# ============================================================
+#                 LECTURA DE PATRONES
+# ============================================================
+
+_CATEGORIAS = {'l': 'LETRA', 'd': 'DIGITO', 'w': 'ALFANUMERICO'}
+_ESCAPES = {'n': '\n', 't': '\t'}
+
+
+class _Conjunto:
+    """Conjunto de caracteres de un patrón: literales y categorías, posiblemente negado."""
+
+    def __init__(self, caracteres=(), categorias=(), negado=False):
+        self.caracteres = frozenset(caracteres)
+        self.categorias = frozenset(categorias)
+        self.negado = negado
+
+
+_CUALQUIERA = _Conjunto(negado=True)
+
+
+class _LectorPatron:
+    """Analizador descendente de la sintaxis de patrones; produce un árbol de tuplas."""
+
+    def __init__(self, patron):
+        self.patron = patron
+        self.i = 0
+
+    def leer(self):
+        nodo = self._alternativa()
+        if self.i < len(self.patron):
+            raise ValueError(f"Patrón inválido {self.patron!r} en la posición {self.i}")
+        return nodo
+
+    def _ver(self):
+        return self.patron[self.i] if self.i < len(self.patron) else None
+
+    def _alternativa(self):
+        opciones = [self._secuencia()]
+        while self._ver() == '|':
+            self.i += 1
+            opciones.append(self._secuencia())
+        return opciones[0] if len(opciones) == 1 else ('alt', opciones)
+
+    def _secuencia(self):
+        partes = []
+        while self._ver() not in (None, '|', ')'):
+            partes.append(self._repeticion())
+        return ('cat', partes)
+
+    def _repeticion(self):
+        nodo = self._atomo()
+        while self._ver() in ('*', '+', '?'):
+            nodo = (self.patron[self.i], nodo)
+            self.i += 1
+        return nodo
+
+    def _atomo(self):
+        c = self.patron[self.i]
+        self.i += 1
+        if c == '(':
+            nodo = self._alternativa()
+            if self._ver() != ')':
+                raise ValueError(f"Falta ')' en el patrón {self.patron!r}")
+            self.i += 1
+            return nodo
+        if c == '[':
+            return ('conjunto', self._clase())
+        if c == '.':
+            return ('conjunto', _CUALQUIERA)
+        if c == '\\':
+            caracter, categoria = self._escape()
+            if categoria:
+                return ('conjunto', _Conjunto(categorias=[categoria]))
+            return ('conjunto', _Conjunto(caracteres=[caracter]))
+        if c in '*+?)':
+            raise ValueError(f"'{c}' inesperado en el patrón {self.patron!r}")
+        return ('conjunto', _Conjunto(caracteres=[c]))
+
+    def _escape(self):
+        c = self.patron[self.i]
+        self.i += 1
+        if c in _CATEGORIAS:
+            return None, _CATEGORIAS[c]
+        return _ESCAPES.get(c, c), None
+
+    def _clase(self):
+        negado = self._ver() == '^'
+        if negado:
+            self.i += 1
+        caracteres, categorias = [], []
+        while self._ver() != ']':
+            if self._ver() is None:
+                raise ValueError(f"Falta ']' en el patrón {self.patron!r}")
+            c = self.patron[self.i]
+            self.i += 1
+            if c == '\\':
+                caracter, categoria = self._escape()
+                if categoria:
+                    categorias.append(categoria)
+                else:
+                    caracteres.append(caracter)
+            else:
+                caracteres.append(c)
+        self.i += 1
+        return _Conjunto(caracteres, categorias, negado)
+
+
+def _caracteres_explicitos(nodo, encontrados):
+    """Reúne los caracteres que un árbol de patrón menciona literalmente."""
+    if nodo[0] == 'conjunto':
+        encontrados.update(nodo[1].caracteres)
+    elif nodo[0] in ('cat', 'alt'):
+        for hijo in nodo[1]:
+            _caracteres_explicitos(hijo, encontrados)
+    else:
+        _caracteres_explicitos(nodo[1], encontrados)
+
+
+# ============================================================
+#                 TRADUCCIÓN A EXPRESIONES DE re
+# ============================================================
+
+# Equivalentes en re de las categorías. Coinciden con str.isalpha/isdigit salvo en
+# los caracteres numéricos no decimales (ver logic.patrones_exactos).
+_CATEGORIAS_RE = {'LETRA': r'[^\W\d_]', 'DIGITO': r'\d', 'ALFANUMERICO': r'\w'}
+_CATEGORIAS_RE_EN_CLASE = {'DIGITO': r'\d', 'ALFANUMERICO': r'\w'}
+
+
+def _escapar_en_clase(c):
+    return '\\' + c if c in '\\]^-[' else c.replace('\n', r'\n').replace('\t', r'\t')
+
+
+def _a_re(nodo):
+    tipo = nodo[0]
+    if tipo == 'conjunto':
+        conjunto = nodo[1]
+        if conjunto is _CUALQUIERA:
+            return r'[\s\S]'
+        if not conjunto.negado and not conjunto.categorias and len(conjunto.caracteres) == 1:
+            c = next(iter(conjunto.caracteres))
+            return {'\n': r'\n', '\t': r'\t'}.get(c, _escapar_re(c))
+        if not conjunto.negado and not conjunto.caracteres and len(conjunto.categorias) == 1:
+            return _CATEGORIAS_RE[next(iter(conjunto.categorias))]
+        partes = [_escapar_en_clase(c) for c in sorted(conjunto.caracteres)]
+        for categoria in sorted(conjunto.categorias):
+            if categoria not in _CATEGORIAS_RE_EN_CLASE:
+                raise ValueError(f"La categoría {categoria} no se puede usar dentro de [...]")
+            partes.append(_CATEGORIAS_RE_EN_CLASE[categoria])
+        return '[' + ('^' if conjunto.negado else '') + ''.join(partes) + ']'
+    if tipo == 'cat':
+        return ''.join(_a_re(hijo) for hijo in nodo[1])
+    if tipo == 'alt':
+        return '(?:' + '|'.join(_a_re(hijo) for hijo in nodo[1]) + ')'
+    interior = _a_re(nodo[1])
+    if nodo[1][0] == 'cat':
+        interior = '(?:' + interior + ')'
+    return interior + tipo
+
+
+def _escapar_re(c):
+    return '\\' + c if c in '.^$*+?{}[]\\|()' else c
+
+
+def especificacion_re(especificacion=None):
+    """
+    Traduce la especificación a pares (clase, expresión de re) para el motor de
+    expresión maestra. ESPACIO no se incluye: ese motor absorbe los espacios y
+    tabuladores como prefijo de cada lexema.
+    """
+    especificacion = especificacion or ESPECIFICACION_TOKENS
+    return [
+        (nombre, _a_re(_LectorPatron(patron).leer()))
+        for nombre, patron, _ in especificacion if nombre != 'ESPACIO'
+    ]
+
+
+# ============================================================
+#                 CONSTRUCCIÓN DEL AUTÓMATA
+# ============================================================
+
+# Símbolos para los caracteres que el patrón no menciona uno por uno
+_RESTO = ('LETRA', 'DIGITO', 'ALFANUMERICO_RESTO', 'OTRO')
+
+
+def _categoria_de(c):
+    if c.isalpha():
+        return 'LETRA'
+    if c.isdigit():
+        return 'DIGITO'
+    if c.isalnum():
+        return 'ALFANUMERICO_RESTO'
+    return 'OTRO'
+
+
+class _NFA:
+    """Autómata no determinista construido por Thompson sobre los símbolos."""
+
+    def __init__(self, simbolos_de):
+        self.simbolos_de = simbolos_de  # _Conjunto -> frozenset de símbolos
+        self.vacias = []      # estado -> estados alcanzables sin consumir
+        self.aristas = []     # estado -> [(símbolos, destino)]
+
+    def nuevo(self):
+        self.vacias.append([])
+        self.aristas.append([])
+        return len(self.vacias) - 1
+
+    def construir(self, nodo):
+        """Retorna (inicio, fin) del fragmento que reconoce nodo."""
+        tipo = nodo[0]
+        if tipo == 'conjunto':
+            inicio, fin = self.nuevo(), self.nuevo()
+            self.aristas[inicio].append((self.simbolos_de(nodo[1]), fin))
+            return inicio, fin
+        if tipo == 'cat':
+            inicio = fin = self.nuevo()
+            for hijo in nodo[1]:
+                h_inicio, h_fin = self.construir(hijo)
+                self.vacias[fin].append(h_inicio)
+                fin = h_fin
+            return inicio, fin
+        if tipo == 'alt':
+            inicio, fin = self.nuevo(), self.nuevo()
+            for hijo in nodo[1]:
+                h_inicio, h_fin = self.construir(hijo)
+                self.vacias[inicio].append(h_inicio)
+                self.vacias[h_fin].append(fin)
+            return inicio, fin
+        h_inicio, h_fin = self.construir(nodo[1])
+        inicio, fin = self.nuevo(), self.nuevo()
+        self.vacias[inicio].append(h_inicio)
+        self.vacias[h_fin].append(fin)
+        if tipo in ('*', '?'):
+            self.vacias[inicio].append(fin)
+        if tipo in ('*', '+'):
+            self.vacias[h_fin].append(h_inicio)
+        return inicio, fin
+
+    def clausura(self, estados):
+        pila = list(estados)
+        vistos = set(estados)
+        while pila:
+            for destino in self.vacias[pila.pop()]:
+                if destino not in vistos:
+                    vistos.add(destino)
+                    pila.append(destino)
+        return frozenset(vistos)
+
+
+class AutomataLexico:
+    """
+    AFD mínimo de la especificación, en tablas:
+    transiciones[estado * n_clases + clase] es el estado siguiente (0 = sin salida),
+    aceptacion[estado] es 1 + índice de la clase de token que acepta (0 = ninguna).
+    El estado inicial es 1. Los caracteres ASCII se clasifican con la tabla
+    clase_ascii; el resto por categoría, con caché.
+
+    Ofrece la misma interfaz que logic.PatronesLexicos (maestro.findall y
+    clasificar), así que EstadoLexico puede usarlo en lugar de las expresiones.
+    """
+
+    INICIAL = 1
+
+    def __init__(self, especificacion):
+        self.especificacion = especificacion
+        self.nombres = [nombre for nombre, _, _ in especificacion]
+        self.tipos_token = {nombre: tipo for nombre, _, tipo in especificacion}
+        arboles = [_LectorPatron(patron).leer() for _, patron, _ in especificacion]
+
+        explicitos = {'_'}  # '_' no se deduce de isalpha/isdigit/isalnum
+        for arbol in arboles:
+            _caracteres_explicitos(arbol, explicitos)
+        self.explicitos = frozenset(c for c in explicitos if c is not None)
+        simbolos = sorted(self.explicitos) + list(_RESTO)
+        self._todos = frozenset(simbolos)
+
+        nfa = _NFA(self._simbolos_de)
+        inicio = nfa.nuevo()
+        aceptan = {}
+        for prioridad, arbol in enumerate(arboles):
+            a_inicio, a_fin = nfa.construir(arbol)
+            nfa.vacias[inicio].append(a_inicio)
+            aceptan[a_fin] = prioridad
+
+        estados_dfa, transiciones, etiquetas = self._determinizar(nfa, inicio, aceptan, simbolos)
+        self._minimizar(estados_dfa, transiciones, etiquetas, simbolos)
+
+        self.estado_comentario = self.recorrer('/*')
+        self.estado_comentario_cerrado = self.recorrer('/**/')
+        self.maestro = self
+
+    # ---------------- construcción ----------------
+
+    def _simbolos_de(self, conjunto):
+        simbolos = set(conjunto.caracteres)
+        for categoria in conjunto.categorias:
+            if categoria == 'LETRA':
+                simbolos.add('LETRA')
+                simbolos.update(c for c in self.explicitos if c.isalpha())
+            elif categoria == 'DIGITO':
+                simbolos.add('DIGITO')
+                simbolos.update(c for c in self.explicitos if c.isdigit())
+            else:
+                simbolos.update(('LETRA', 'DIGITO', 'ALFANUMERICO_RESTO'))
+                simbolos.update(c for c in self.explicitos if c.isalnum() or c == '_')
+        if conjunto.negado:
+            return self._todos - simbolos
+        return frozenset(simbolos)
+
+    def _determinizar(self, nfa, inicio, aceptan, simbolos):
+        """Construcción de subconjuntos; el estado 0 es el estado muerto."""
+        muerto = frozenset()
+        primero = nfa.clausura([inicio])
+        indice = {muerto: 0, primero: 1}
+        estados = [muerto, primero]
+        transiciones = [[0] * len(simbolos), None]
+        pendientes = [primero]
+        while pendientes:
+            actual = pendientes.pop()
+            fila = [0] * len(simbolos)
+            for s, simbolo in enumerate(simbolos):
+                alcanzados = [
+                    destino
+                    for estado in actual
+                    for conjunto, destino in nfa.aristas[estado]
+                    if simbolo in conjunto
+                ]
+                if not alcanzados:
+                    continue
+                siguiente = nfa.clausura(alcanzados)
+                if siguiente not in indice:
+                    indice[siguiente] = len(estados)
+                    estados.append(siguiente)
+                    transiciones.append(None)
+                    pendientes.append(siguiente)
+                fila[s] = indice[siguiente]
+            transiciones[indice[actual]] = fila
+        etiquetas = []
+        for estado in estados:
+            prioridades = [aceptan[e] for e in estado if e in aceptan]
+            etiquetas.append(min(prioridades) + 1 if prioridades else 0)
+        return estados, transiciones, etiquetas
+
+    def _minimizar(self, estados, transiciones, etiquetas, simbolos):
+        """Refinamiento de particiones (Moore) y compresión de columnas iguales."""
+        # El muerto queda solo en su bloque para conservar el 0 como "sin salida"
+        bloque = [0 if i == 0 else etiquetas[i] + 1 for i in range(len(estados))]
+        while True:
+            firmas = {}
+            nuevo = []
+            for i in range(len(estados)):
+                firma = (bloque[i], tuple(bloque[d] for d in transiciones[i]))
+                nuevo.append(firmas.setdefault(firma, len(firmas)))
+            if len(firmas) == len(set(bloque)):
+                break
+            bloque = nuevo
+
+        # Renumerar: muerto = 0, inicial = 1, el resto en orden de aparición
+        numero = {bloque[0]: 0, bloque[1]: 1}
+        for i in range(len(estados)):
+            numero.setdefault(bloque[i], len(numero))
+        n_estados = len(numero)
+        representante = {}
+        for i in range(len(estados)):
+            representante.setdefault(numero[bloque[i]], i)
+
+        # Columnas (símbolos) con el mismo comportamiento comparten clase
+        columnas = {}
+        clase_simbolo = {}
+        for s, simbolo in enumerate(simbolos):
+            columna = tuple(numero[bloque[transiciones[representante[e]][s]]] for e in range(n_estados))
+            clase_simbolo[simbolo] = columnas.setdefault(columna, len(columnas))
+        self.n_clases = len(columnas)
+        self.n_estados = n_estados
+
+        self.transiciones = array('H', [0]) * (n_estados * self.n_clases)
+        for columna, clase in columnas.items():
+            for estado, destino in enumerate(columna):
+                self.transiciones[estado * self.n_clases + clase] = destino
+        self.aceptacion = array('B', [etiquetas[representante[e]] for e in range(n_estados)])
+
+        self.clase_simbolo = clase_simbolo
+        self.clase_ascii = array('B', [self._clase_caracter(chr(o)) for o in range(128)])
+        self._clases_unicode = {}
+
+        # Tablas para el recorrido: el estado se maneja como inicio de su fila
+        # (estado * n_clases) y el texto como bytes de clases (ver codificar)
+        self.saltos = array('I', [destino * self.n_clases for destino in self.transiciones])
+        self.acepta_fila = array('B', [0]) * (n_estados * self.n_clases)
+        for estado in range(n_estados):
+            self.acepta_fila[estado * self.n_clases] = self.aceptacion[estado]
+        self.traduccion = _TraduccionClases(self)
+
+    def _clase_caracter(self, c):
+        if c in self.explicitos:
+            return self.clase_simbolo[c]
+        return self.clase_simbolo[_categoria_de(c)]
+
+    # ---------------- recorrido ----------------
+
+    def clase_de(self, c):
+        """Clase de caracteres de c."""
+        o = ord(c)
+        if o < 128:
+            return self.clase_ascii[o]
+        clase = self._clases_unicode.get(c)
+        if clase is None:
+            clase = self._clases_unicode[c] = self._clase_caracter(c)
+        return clase
+
+    def codificar(self, texto):
+        """Texto convertido en bytes con la clase de cada carácter (str.translate)."""
+        return texto.translate(self.traduccion).encode('latin-1')
+
+    def recorrer(self, texto, estado=INICIAL):
+        """Estado al que se llega leyendo todo texto desde estado (0 si se bloquea)."""
+        for c in texto:
+            estado = self.transiciones[estado * self.n_clases + self.clase_de(c)]
+            if not estado:
+                break
+        return estado
+
+    def _coincidencia(self, codigos, inicio, fila):
+        """
+        Lexema más largo desde inicio sobre el texto codificado. Retorna (fin,
+        índice de clase + 1, fila del estado de aceptación); fin es -1 si ningún
+        prefijo es un lexema.
+        """
+        saltos = self.saltos
+        acepta = self.acepta_fila
+        fin = -1
+        regla = 0
+        aceptado = 0
+        i = inicio
+        longitud = len(codigos)
+        while i < longitud:
+            fila = saltos[fila + codigos[i]]
+            if not fila:
+                break
+            i += 1
+            if acepta[fila]:
+                fin = i
+                regla = acepta[fila]
+                aceptado = fila
+        return fin, regla, aceptado
+
+    def lexemas(self, texto, en_comentario=False):
+        """
+        Recorre texto y produce (inicio, fin, clase, estado de aceptación) por lexema,
+        incluidos espacios y comentarios. Con en_comentario el primer lexema se
+        lee como continuación de un comentario de bloque abierto.
+        """
+        codigos = self.codificar(texto)
+        inicial = self.INICIAL * self.n_clases
+        fila = self.estado_comentario * self.n_clases if en_comentario else inicial
+        n_clases = self.n_clases
+        nombres = self.nombres
+        i = 0
+        longitud = len(codigos)
+        while i < longitud:
+            fin, regla, aceptado = self._coincidencia(codigos, i, fila)
+            if fin < 0:
+                # No ocurre con ESPECIFICACION_TOKENS: ERROR acepta cualquier carácter
+                break
+            yield i, fin, nombres[regla - 1], aceptado // n_clases
+            i = fin
+            fila = inicial
+
+    def comentario_abierto(self, clase, aceptado):
+        """Indica si un lexema termina dentro de un comentario de bloque sin cerrar."""
+        return clase == 'COMENTARIO_BLOQUE' and aceptado != self.estado_comentario_cerrado
+
+    def findall(self, texto):
+        """Pares (espacios previos, lexema) como PatronesLexicos.maestro.findall."""
+        codigos = self.codificar(texto)
+        saltos = self.saltos
+        acepta = self.acepta_fila
+        inicial = self.INICIAL * self.n_clases
+        espacio_clase = self.nombres.index('ESPACIO') + 1
+        pares = []
+        agregar = pares.append
+        espacio = ''
+        inicio = 0
+        longitud = len(codigos)
+        # Mismo recorrido que _coincidencia, en línea para no pagar una llamada por lexema
+        while inicio < longitud:
+            fila = inicial
+            fin = -1
+            regla = 0
+            i = inicio
+            while i < longitud:
+                fila = saltos[fila + codigos[i]]
+                if not fila:
+                    break
+                i += 1
+                if acepta[fila]:
+                    fin = i
+                    regla = acepta[fila]
+            if fin < 0:
+                break
+            if regla == espacio_clase:
+                espacio = texto[inicio:fin]
+            else:
+                agregar((espacio, texto[inicio:fin]))
+                espacio = ''
+            inicio = fin
+        return pares
+
+    def clasificar(self, lexema):
+        """Clase de token del lexema completo, como PatronesLexicos.clasificar."""
+        fin, regla, _ = self._coincidencia(self.codificar(lexema), 0, self.INICIAL * self.n_clases)
+        if fin == len(lexema) and regla:
+            return self.nombres[regla - 1]
+        return 'ERROR'
+
+
+class _TraduccionClases(dict):
+    """Tabla para str.translate: código de carácter -> carácter con el número de su clase."""
+
+    def __init__(self, automata):
+        super().__init__((o, chr(automata.clase_ascii[o])) for o in range(128))
+        self.automata = automata
+
+    def __missing__(self, codigo):
+        clase = self[codigo] = chr(self.automata.clase_de(chr(codigo)))
+        return clase
+
+
+AUTOMATA_LEXICO = AutomataLexico(ESPECIFICACION_TOKENS)
@@ -0,0 +1,239 @@
+# benchmark_complejidad.py
+# Comprueba que cada fase del compilador escala linealmente. Genera familias de
+# entradas patológicas (paréntesis anidados, una línea muy larga, muchas
+# declaraciones, una tormenta de errores, cadenas largas de &&/||, miles de usos de
+# una variable) en tamaños que se duplican, mide el tiempo y el pico de memoria
+# (tracemalloc) de analizador_lexico, AnalizadorSintactico, AnalizadorSemantico,
+# CodigoIntermedioGenerator e InterpreteCI, y ajusta el exponente de crecimiento
+# (pendiente de log(medida) contra log(tamaño)). Termina con código 1 si alguna
+# fase crece más rápido que tamaño^UMBRAL_EXPONENTE; un tiempo superlineal se
+# vuelve a medir (hasta CONFIRMACIONES veces) antes de informarlo.
+# Los analizadores corren sin límite de errores ni de profundidad, para que la
+# recuperación y el anidamiento se midan completos.
+#
+# Uso: python benchmark_complejidad.py [tamaño_máximo] [puntos] [repeticiones]
+
+import gc
+import math
+import sys
+import time
+import tracemalloc
+
+from logic import AnalizadorSintactico, analizador_lexico, tokens_sintacticos
+from analizador_semantico import AnalizadorSemantico
+from generador_codigo_intermedio import CodigoIntermedioGenerator
+from interprete import InterpreteCI
+from registro import configurar
+
+# Exponente por encima del cual una fase se considera superlineal
+UMBRAL_EXPONENTE = 1.3
+# Medidas menores no se ajustan: el ruido del reloj y del intérprete domina.
+# Por debajo de 1 MB el pico de tracemalloc sigue los saltos de capacidad de
+# listas y diccionarios más que el tamaño de la entrada (usos_variable en el
+# intérprete da n^1.37 entre 1000 y 4000 y n^1.03 entre 8000 y 64000).
+TIEMPO_MINIMO = 0.005
+MEMORIA_MINIMA = 1024 * 1024
+# Veces que se vuelve a medir un tiempo superlineal antes de informarlo
+CONFIRMACIONES = 3
+
+
+# -------- FAMILIAS DE ENTRADAS -------- #
+
+def parentesis_profundos(n):
+    """Una asignación con n paréntesis anidados"""
+    return f"main {{\n    int x;\n    x = 1;\n    x = {'(' * n}x + 1{')' * n};\n}}\n"
+
+
+def linea_larga(n):
+    """Una sola línea con una asignación de n sumandos"""
+    return "main { int x; x = 1; x = " + " + ".join(["x"] * n) + "; }\n"
+
+
+def declaraciones(n):
+    """n declaraciones, una por línea, y una asignación a cada variable"""
+    lineas = ["main {"]
+    lineas.extend(f"    int v_{i};" for i in range(n))
+    lineas.extend(f"    v_{i} = {i};" for i in range(n))
+    lineas.append("}")
+    return "\n".join(lineas) + "\n"
+
+
+def tormenta_errores(n):
+    """n sentencias con errores sintácticos, uno por línea"""
+    lineas = ["main {", "    int x;"]
+    lineas.extend("    x = * ;" if i % 2 else "    ) x 1 ;" for i in range(n))
+    lineas.append("}")
+    return "\n".join(lineas) + "\n"
+
+
+def cadena_logica(n):
+    """Una condición con n comparaciones unidas por && y ||"""
+    comparaciones = [f"x {'<' if i % 2 else '>'} {i}" for i in range(n)]
+    condicion = comparaciones[0]
+    for i, comparacion in enumerate(comparaciones[1:]):
+        condicion += (" && " if i % 2 else " || ") + comparacion
+    return f"main {{\n    int x;\n    x = 1;\n    if {condicion} then x = 2; end\n}}\n"
+
+
+def usos_variable(n):
+    """n sentencias que usan la misma variable, cada una en su línea"""
+    lineas = ["main {", "    int x;", "    x = 0;"]
+    lineas.extend("    x = x + 1;" for _ in range(n))
+    lineas.append("}")
+    return "\n".join(lineas) + "\n"
+
+
+FAMILIAS = {
+    "parentesis": parentesis_profundos,
+    "linea_larga": linea_larga,
+    "declaraciones": declaraciones,
+    "tormenta_errores": tormenta_errores,
+    "cadena_logica": cadena_logica,
+    "usos_variable": usos_variable,
+}
+
+
+# -------- FASES -------- #
+
+def fases(texto):
+    """
+    (nombre, función sin argumentos) de cada fase que puede correr sobre texto.
+    Cada fase recibe el resultado de la anterior calculado una vez antes de medir;
+    la generación de código y la ejecución solo corren si no hay errores semánticos.
+    """
+    resultado = [("lexico", lambda: analizador_lexico(texto))]
+    tokens = tokens_sintacticos(analizador_lexico(texto))
+
+    def sintactico():
+        return AnalizadorSintactico(tokens, profundidad_maxima=math.inf, maximo_errores=None).analizar()
+
+    resultado.append(("sintactico", sintactico))
+    ast, _ = sintactico()
+    if ast is None:
+        return resultado
+
+    def semantico():
+        return AnalizadorSemantico(maximo_errores=None).analizar(ast)
+
+    resultado.append(("semantico", semantico))
+    ast_anotado, _, errores = semantico()
+    if errores:
+        return resultado
+
+    resultado.append(("codigo_intermedio", lambda: CodigoIntermedioGenerator().generar(ast_anotado)))
+    generador = CodigoIntermedioGenerator()
+    generador.generar(ast_anotado)
+    cuadruplas = generador.obtener_tuplas()
+    resultado.append(("interprete", lambda: InterpreteCI().ejecutar(cuadruplas, max_steps=math.inf)))
+    return resultado
+
+
+def medir_tiempo(funcion, repeticiones):
+    """
+    Mejor tiempo en segundos de llamar a funcion. Como timeit, mide con el
+    recolector de ciclos apagado: sus pasadas recorren todo lo que sigue vivo en el
+    proceso (las entradas de las otras fases) y agregan ruido que no es de la fase.
+    """
+    mejor = None
+    for _ in range(repeticiones):
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            funcion()
+            transcurrido = time.perf_counter() - inicio
+        finally:
+            gc.enable()
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor
+
+
+def medir_memoria(funcion):
+    """Pico de memoria en bytes reservada durante la llamada a funcion"""
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def exponente(tamanos, medidas, minimo):
+    """
+    Pendiente por mínimos cuadrados de log(medida) contra log(tamaño), o None si
+    alguna medida es menor que minimo (demasiado chica para ajustarla).
+    """
+    if len(medidas) < 2 or min(medidas) < minimo:
+        return None
+    xs = [math.log(tamano) for tamano in tamanos]
+    ys = [math.log(medida) for medida in medidas]
+    media_x = sum(xs) / len(xs)
+    media_y = sum(ys) / len(ys)
+    covarianza = sum((x - media_x) * (y - media_y) for x, y in zip(xs, ys))
+    varianza = sum((x - media_x) ** 2 for x in xs)
+    return covarianza / varianza
+
+
+def medir_familia(generador, tamanos, repeticiones):
+    """fase -> (tamaños, tiempos, memorias) de la familia en cada tamaño donde corre la fase"""
+    medidas = {}
+    for tamano in tamanos:
+        for nombre, funcion in fases(generador(tamano)):
+            tamanos_fase, tiempos, memorias = medidas.setdefault(nombre, ([], [], []))
+            tamanos_fase.append(tamano)
+            tiempos.append(medir_tiempo(funcion, repeticiones))
+            memorias.append(medir_memoria(funcion))
+    return medidas
+
+
+def confirmar_tiempos(generador, fase, tamanos, tiempos, repeticiones):
+    """
+    Vuelve a medir el tiempo de fase en cada tamaño y se queda con el menor de las
+    dos mediciones: una pausa del sistema en un solo tamaño no alcanza para marcar
+    la fase como superlineal.
+    """
+    return [
+        min(tiempo, medir_tiempo(dict(fases(generador(tamano)))[fase], repeticiones))
+        for tamano, tiempo in zip(tamanos, tiempos)
+    ]
+
+
+def main(argumentos):
+    maximo = int(argumentos[0]) if argumentos else 100000
+    puntos = int(argumentos[1]) if len(argumentos) > 1 else 4
+    repeticiones = int(argumentos[2]) if len(argumentos) > 2 else 2
+    tamanos = [maximo >> desplazamiento for desplazamiento in reversed(range(puntos))]
+
+    superlineales = []
+    print(f"tamaños: {', '.join(map(str, tamanos))}; umbral: exponente {UMBRAL_EXPONENTE}")
+    print(f"{'FAMILIA':<18} {'FASE':<18} {'TIEMPO MÁX':>11} {'EXP':>6} {'MEMORIA MÁX':>12} {'EXP':>6}")
+    for familia, generador in FAMILIAS.items():
+        for fase, (tamanos_fase, tiempos, memorias) in medir_familia(generador, tamanos, repeticiones).items():
+            exponente_tiempo = exponente(tamanos_fase, tiempos, TIEMPO_MINIMO)
+            for _ in range(CONFIRMACIONES):
+                if exponente_tiempo is None or exponente_tiempo <= UMBRAL_EXPONENTE:
+                    break
+                tiempos = confirmar_tiempos(generador, fase, tamanos_fase, tiempos, repeticiones)
+                exponente_tiempo = exponente(tamanos_fase, tiempos, TIEMPO_MINIMO)
+            exponente_memoria = exponente(tamanos_fase, memorias, MEMORIA_MINIMA)
+            marcas = ""
+            for medida, valor in (("tiempo", exponente_tiempo), ("memoria", exponente_memoria)):
+                if valor is not None and valor > UMBRAL_EXPONENTE:
+                    superlineales.append(f"{familia}/{fase} ({medida}: n^{valor:.2f})")
+                    marcas = "  SUPERLINEAL"
+            texto_tiempo = "-" if exponente_tiempo is None else f"{exponente_tiempo:.2f}"
+            texto_memoria = "-" if exponente_memoria is None else f"{exponente_memoria:.2f}"
+            print(f"{familia:<18} {fase:<18} {tiempos[-1]:>9.3f} s {texto_tiempo:>6} "
+                  f"{memorias[-1] / 2 ** 20:>9.1f} MB {texto_memoria:>6}{marcas}")
+
+    if superlineales:
+        print("Fases superlineales: " + "; ".join(superlineales))
+        return 1
+    print("Todas las fases escalan linealmente")
+    return 0
+
+
+if __name__ == "__main__":
+    configurar()
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,136 @@
+# benchmark_sintactico.py
+# Mide el rendimiento del analizador sintáctico sobre un programa generado con
+# todas las sentencias de la gramática. Los tokens se lexean una sola vez; se mide
+# AnalizadorSintactico (clasificación de tokens incluida) y se informa la mejor vuelta.
+# También se mide AnalizadorIncremental al editar una sentencia en la mitad del programa
+# y AnalizadorPredictivo (motor "tabla"), cuyo AST se compara con el del descendente.
+# Con el AST en arena (arena_ast.py) se informan el tiempo y la memoria por nodo, y
+# se mide el análisis de esqueleto (AnalizadorSintactico.esquema).
+#
+# Uso: python benchmark_sintactico.py [sentencias] [repeticiones]
+
+import random
+import sys
+import time
+import tracemalloc
+
+from logic import (
+    AnalizadorIncremental, AnalizadorPredictivo, AnalizadorSintactico, LexerIncremental, TokenBuffer,
+    analizador_lexico, mapear_tipo_token, mostrar_ast_texto,
+)
+from registro import configurar
+
+
+def programa_sintetico(sentencias, semilla=1):
+    """Programa válido con `sentencias` sentencias de todos los tipos"""
+    r = random.Random(semilla)
+    variables = [f"var_{i}" for i in range(50)]
+    lineas = [
+        "main {",
+        "    int " + ", ".join(variables[:25]) + ";",
+        "    float " + ", ".join(variables[25:]) + ";",
+    ]
+    for i in range(sentencias):
+        a, b, c = r.choice(variables), r.choice(variables), r.choice(variables)
+        tipo = i % 6
+        if tipo == 0:
+            lineas.append(f"    {a} = ({b} + {r.randint(0, 999)}) * {c} - 3.25 / 2;")
+        elif tipo == 1:
+            lineas.append(f"    if {a} >= {b} && {c} != 0 then {a} = {a} % 7; else {b}++; end")
+        elif tipo == 2:
+            lineas.append(f"    cout << {a};")
+        elif tipo == 3:
+            lineas.append(f"    while {a} < 10 {a} = {a} + 1; end")
+        elif tipo == 4:
+            lineas.append(f"    cin >> {a};")
+        else:
+            lineas.append(f"    do {b}--; until {b} <= {r.randint(0, 50)} ^ 2")
+    lineas.append("}")
+    return "\n".join(lineas) + "\n"
+
+
+def medir(tokens, repeticiones=3, clase_analizador=AnalizadorSintactico, arena=False):
+    """Mejor tiempo en segundos de analizar tokens (un TokenBuffer)"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        clase_analizador(tokens, arena=arena).analizar()
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor
+
+
+def medir_esquema(tokens, repeticiones=3):
+    """Mejor tiempo en segundos del análisis de esqueleto de tokens"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        AnalizadorSintactico(tokens).esquema()
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor
+
+
+def memoria_por_nodo(tokens, arena=False):
+    """Bytes que retiene el AST de tokens por nodo, medidos con tracemalloc"""
+    tracemalloc.start()
+    ast, _ = AnalizadorSintactico(tokens, arena=arena).analizar()
+    retenido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retenido / mostrar_ast_texto(ast).count("\n")
+
+
+def medir_reanalisis(texto, repeticiones=3):
+    """Mejor tiempo en segundos de reanalizar texto tras cambiar una asignación de la mitad"""
+    lexer = LexerIncremental(texto)
+    analizador = AnalizadorIncremental()
+    analizador.analizar(lexer.tokens())
+    linea = len(lexer.textos) // 2
+    mejor = None
+    for vuelta in range(repeticiones):
+        lexer.reemplazar_lineas(linea, 1, [f"    var_0 = var_1 * {vuelta};"])
+        analizador.registrar_edicion(linea + 1, 1, 1)
+        tokens = lexer.tokens()
+        inicio = time.perf_counter()
+        analizador.analizar(tokens)
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor
+
+
+def main(argumentos):
+    sentencias = int(argumentos[0]) if argumentos else 100000
+    repeticiones = int(argumentos[1]) if len(argumentos) > 1 else 3
+
+    tokens = TokenBuffer()
+    for token in analizador_lexico(programa_sintetico(sentencias)):
+        if token.tipo != 'ERROR':
+            tokens.agregar(mapear_tipo_token(token.tipo), token.valor, token.linea, token.columna)
+
+    segundos = medir(tokens, repeticiones)
+    print(f"{sentencias} sentencias, {len(tokens)} tokens: {segundos:.3f} s "
+          f"({len(tokens) / segundos:,.0f} tokens/s)")
+
+    esqueleto = medir_esquema(tokens, repeticiones)
+    print(f"esquema: {esqueleto:.3f} s ({segundos / esqueleto:.1f} veces más rápido que el análisis completo)")
+
+    segundos = medir_reanalisis(programa_sintetico(sentencias), repeticiones)
+    print(f"reanálisis incremental de una sentencia: {segundos * 1000:.1f} ms")
+
+    segundos = medir(tokens, repeticiones, AnalizadorPredictivo)
+    iguales = (mostrar_ast_texto(AnalizadorSintactico(tokens).analizar()[0])
+               == mostrar_ast_texto(AnalizadorPredictivo(tokens).analizar()[0]))
+    print(f"motor tabla LL(1): {segundos:.3f} s ({len(tokens) / segundos:,.0f} tokens/s), "
+          f"AST {'igual al' if iguales else 'DISTINTO del'} descendente")
+
+    segundos = medir(tokens, repeticiones, arena=True)
+    print(f"AST en arena: {segundos:.3f} s, {memoria_por_nodo(tokens, arena=True):.0f} bytes por nodo "
+          f"(objetos: {memoria_por_nodo(tokens):.0f})")
+
+
+if __name__ == "__main__":
+    configurar()
+    main(sys.argv[1:])
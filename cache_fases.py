@@ -0,0 +1,189 @@
+# cache_fases.py
+# Caché de resultados de fases (tokens, AST, AST anotado con tabla de símbolos,
+# cuádruplas) indexada por un hash del código fuente y de la versión del compilador.
+# Nivel en memoria: LRU con cantidad máxima de entradas.
+# Nivel en disco: un archivo pickle por entrada; al pasar del tamaño máximo se
+# borran primero los menos usados. Sobrevive a reiniciar el IDE. El tamaño total se
+# lleva al escribir y al borrar, en el hilo escritor: el directorio se recorre una
+# sola vez.
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from escritor_artefactos import escritor_artefactos
+from registro import logger_fase
+
+log_cache = logger_fase("cache")
+
+# Módulos cuyo código define el resultado de las fases: si cambian, cambia la versión
+MODULOS_COMPILADOR = (
+    'automata_lexico.py', 'internador.py', 'logic.py', 'analizador_semantico.py',
+    'generador_codigo_intermedio.py', 'recorrido.py', 'gramatica.py', 'arena_ast.py', 'pipeline.py',
+    'cache_fases.py',
+)
+
+DIRECTORIO_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "ide_compilador")
+
+_version_compilador = None
+
+
+def version_compilador():
+    """Hash del código de los módulos del compilador"""
+    global _version_compilador
+    if _version_compilador is None:
+        base = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256()
+        for modulo in MODULOS_COMPILADOR:
+            try:
+                with open(os.path.join(base, modulo), 'rb') as f:
+                    h.update(f.read())
+            except OSError:
+                h.update(modulo.encode('utf-8'))
+        _version_compilador = h.hexdigest()
+    return _version_compilador
+
+
+class CacheFases:
+    """Caché de dos niveles para los resultados de CompilationPipeline"""
+
+    def __init__(self, directorio=DIRECTORIO_CACHE, max_entradas=64, max_bytes_disco=256 * 1024 * 1024,
+                 escritor=None):
+        self.memoria = OrderedDict()  # (clave, fase) -> resultado
+        self.max_entradas = max_entradas
+        self.directorio = directorio
+        self.max_bytes_disco = max_bytes_disco
+        self.escritor = escritor
+        # Archivos del nivel en disco: ruta -> bytes, del usado hace más tiempo al más
+        # reciente. Se arma recorriendo el directorio en la primera escritura.
+        self.archivos = None
+        self.bytes_disco = 0
+        self.candado_disco = threading.Lock()
+        if directorio is not None:
+            try:
+                os.makedirs(directorio, exist_ok=True)
+            except OSError as e:
+                log_cache.warning("No se pudo crear el directorio de caché %s: %s", directorio, e)
+                self.directorio = None
+
+    def clave(self, texto):
+        """Clave del código fuente para la versión actual del compilador"""
+        h = hashlib.sha256(version_compilador().encode('ascii'))
+        h.update(texto.encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def _ruta(self, clave, fase):
+        return os.path.join(self.directorio, f"{clave}.{fase}.pkl")
+
+    def obtener(self, clave, fase, solo_memoria=False):
+        """Resultado guardado de la fase o None; con solo_memoria no se busca en disco"""
+        entrada = (clave, fase)
+        resultado = self.memoria.get(entrada)
+        if resultado is not None:
+            self.memoria.move_to_end(entrada)
+            return resultado
+
+        if self.directorio is None or solo_memoria:
+            return None
+        ruta = self._ruta(clave, fase)
+        try:
+            with open(ruta, 'rb') as f:
+                resultado = pickle.load(f)
+            # La fecha de modificación marca el último uso para el desalojo
+            os.utime(ruta)
+            with self.candado_disco:
+                if self.archivos is not None and ruta in self.archivos:
+                    self.archivos.move_to_end(ruta)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log_cache.warning("Entrada de caché inválida %s: %s", ruta, e)
+            return None
+        self._guardar_en_memoria(entrada, resultado)
+        return resultado
+
+    def guardar(self, clave, fase, resultado, solo_memoria=False):
+        """
+        Guarda el resultado de la fase. Con solo_memoria no se escribe en disco: para
+        resultados que siguen cambiando después de guardarse, que no se pueden
+        serializar más tarde en el hilo escritor.
+        """
+        self._guardar_en_memoria((clave, fase), resultado)
+        if self.directorio is None or solo_memoria:
+            return
+        # Se serializa, se escribe y se desaloja en el hilo escritor, fuera del hilo de la interfaz
+        escritor = self.escritor or escritor_artefactos()
+        ruta = self._ruta(clave, fase)
+        escritor.escribir(ruta, lambda: self._serializar(ruta, resultado))
+
+    def _serializar(self, ruta, resultado):
+        """Bytes de resultado para ruta; los cuenta en el tamaño del disco y desaloja"""
+        datos = pickle.dumps(resultado, pickle.HIGHEST_PROTOCOL)
+        with self.candado_disco:
+            if self.archivos is None:
+                self._leer_directorio()
+            self.bytes_disco += len(datos) - self.archivos.pop(ruta, 0)
+            self.archivos[ruta] = len(datos)
+            self._desalojar(conservar_ultimo=True)
+        return datos
+
+    def _guardar_en_memoria(self, entrada, resultado):
+        self.memoria[entrada] = resultado
+        self.memoria.move_to_end(entrada)
+        while len(self.memoria) > self.max_entradas:
+            self.memoria.popitem(last=False)
+
+    def _leer_directorio(self):
+        """Arma archivos y bytes_disco desde el directorio (con candado_disco tomado)"""
+        self.archivos = OrderedDict()
+        self.bytes_disco = 0
+        try:
+            entradas = []
+            for nombre in os.listdir(self.directorio):
+                if nombre.endswith('.pkl'):
+                    ruta = os.path.join(self.directorio, nombre)
+                    estado = os.stat(ruta)
+                    entradas.append((estado.st_mtime, estado.st_size, ruta))
+        except OSError:
+            return
+        for _, tamano, ruta in sorted(entradas):
+            self.archivos[ruta] = tamano
+            self.bytes_disco += tamano
+
+    def desalojar_disco(self):
+        """Borra las entradas de disco usadas hace más tiempo hasta quedar bajo max_bytes_disco"""
+        with self.candado_disco:
+            if self.archivos is None:
+                self._leer_directorio()
+            self._desalojar()
+
+    def _desalojar(self, conservar_ultimo=False):
+        """
+        desalojar_disco con candado_disco tomado. Con conservar_ultimo no se borra el
+        archivo usado más recientemente (el que se está escribiendo).
+        """
+        quedan = 1 if conservar_ultimo else 0
+        while self.bytes_disco > self.max_bytes_disco and len(self.archivos) > quedan:
+            ruta, tamano = self.archivos.popitem(last=False)
+            self.bytes_disco -= tamano
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+    def limpiar(self):
+        """Vacía los dos niveles"""
+        self.memoria.clear()
+        if self.directorio is None:
+            return
+        with self.candado_disco:
+            self.archivos = OrderedDict()
+            self.bytes_disco = 0
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith('.pkl'):
+                try:
+                    os.remove(os.path.join(self.directorio, nombre))
+                except OSError:
+                    pass
@@ -0,0 +1,113 @@
+# escritor_artefactos.py
+# Escritura de los archivos de artefactos en un hilo de fondo. Las escrituras
+# pendientes se guardan por ruta: una escritura nueva del mismo archivo reemplaza
+# a la anterior si esta todavía no empezó, así que las intermedias se descartan.
+# Cada archivo se escribe en un temporal del mismo directorio y se renombra.
+
+import atexit
+import os
+import tempfile
+import threading
+
+from registro import logger_fase
+
+log_artefactos = logger_fase("artefactos")
+
+
+class EscritorArtefactos:
+    """Hilo escritor con una cola de escrituras indexada por ruta"""
+
+    def __init__(self):
+        self.pendientes = {}  # ruta -> contenido (str, bytes o función que lo genera)
+        self.condicion = threading.Condition()
+        self.escribiendo = False
+        self.cerrado = False
+        self.hilo = threading.Thread(target=self._ejecutar, name="EscritorArtefactos", daemon=True)
+        self.hilo.start()
+
+    def escribir(self, ruta, contenido):
+        """
+        Programa la escritura de contenido en ruta. contenido puede ser una función
+        sin argumentos: se llama en el hilo escritor, solo si la escritura no fue
+        reemplazada antes.
+        """
+        with self.condicion:
+            if self.cerrado:
+                raise RuntimeError("El escritor de artefactos está cerrado")
+            # Reinsertar para que la ruta quede al final del orden de escritura
+            self.pendientes.pop(ruta, None)
+            self.pendientes[ruta] = contenido
+            self.condicion.notify_all()
+
+    def esperar(self):
+        """Bloquea hasta que no quede ninguna escritura pendiente ni en curso"""
+        with self.condicion:
+            while self.pendientes or self.escribiendo:
+                self.condicion.wait()
+
+    def cerrar(self):
+        """Escribe lo pendiente y termina el hilo"""
+        with self.condicion:
+            self.cerrado = True
+            self.condicion.notify_all()
+        self.hilo.join()
+
+    def _ejecutar(self):
+        while True:
+            with self.condicion:
+                while not self.pendientes and not self.cerrado:
+                    self.condicion.wait()
+                if not self.pendientes:
+                    return
+                ruta = next(iter(self.pendientes))
+                contenido = self.pendientes.pop(ruta)
+                self.escribiendo = True
+
+            try:
+                if callable(contenido):
+                    contenido = contenido()
+                escribir_atomico(ruta, contenido)
+            except Exception as e:
+                log_artefactos.error("Error al guardar %s: %s", ruta, e)
+            finally:
+                with self.condicion:
+                    self.escribiendo = False
+                    self.condicion.notify_all()
+
+
+def escribir_atomico(ruta, contenido):
+    """Escribe en un temporal junto a ruta y lo renombra: nunca queda un archivo a medias"""
+    if isinstance(contenido, str):
+        contenido = contenido.encode('utf-8')
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, prefix=f".{os.path.basename(ruta)}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(contenido)
+        # mkstemp crea el temporal solo legible por el dueño; se conservan los permisos de siempre
+        try:
+            modo = os.stat(ruta).st_mode & 0o777
+        except FileNotFoundError:
+            modo = 0o644
+        os.chmod(temporal, modo)
+        os.replace(temporal, ruta)
+    except BaseException:
+        try:
+            os.unlink(temporal)
+        except OSError:
+            pass
+        raise
+
+
+_escritor = None
+_candado_escritor = threading.Lock()
+
+
+def escritor_artefactos():
+    """Escritor compartido; se crea al primer uso y vacía su cola al salir del programa"""
+    global _escritor
+    with _candado_escritor:
+        if _escritor is None:
+            _escritor = EscritorArtefactos()
+            atexit.register(_escritor.cerrar)
+        return _escritor
@@ -2,6 +2,12 @@
 # Generador de Código Intermedio (TAC - Cuádruplas)
 # Representación mediante cuádruplas de 4 campos: (op, addr1, addr2, addr3)
 
+from recorrido import ejecutar_recorrido
+
+# Tipos de nodo de literales e identificadores: su dirección es su propio valor
+TIPOS_HOJA = frozenset(("numero", "NUM", "FLOAT", "INT", "entero", "flotante",
+                        "id", "ID", "identificador", "variable"))
+
 class Cuadrupla:
     """Representa una instrucción de código de 3 direcciones como cuádruple."""
     
@@ -68,7 +74,7 @@ class CodigoIntermedioGenerator:
     def generar(self, nodo_raiz):
         """Genera y retorna la lista de strings con las cuádruplas."""
         self.reset()
-        self._recorrer(nodo_raiz)
+        ejecutar_recorrido(self._recorrer(nodo_raiz))
         return [str(cuad) for cuad in self.code]
 
     def obtener_cuadruplas(self):
@@ -85,7 +91,11 @@ class CodigoIntermedioGenerator:
 
     def _recorrer(self, nodo):
         """Dispatcher principal: recibe un NodoAST/NodoAnotado y devuelve
-        un temporal o literal (string) para expresiones, o None para sentencias."""
+        un temporal o literal (string) para expresiones, o None para sentencias.
+
+        Es un generador que corre ejecutar_recorrido(): los hijos se visitan con
+        `yield self._recorrer(hijo)` y los métodos de cada construcción con
+        `yield from`, así la profundidad del AST no consume la pila de Python."""
         if nodo is None:
             return None
 
@@ -97,103 +107,100 @@ class CodigoIntermedioGenerator:
         if tipo in ("lista_sentencias", "bloque", "bloque_if", "bloque_else", 
                     "bloque_do", "bloque_while"):
             for h in hijos:
-                self._recorrer(h)
+                yield self._recorrer(h)
             return None
 
         # Nodos estructurales
         if tipo == "programa":
             if hijos:
-                return self._recorrer(hijos[0])
+                return (yield self._recorrer(hijos[0]))
             return None
 
         if tipo == "main":
             for h in hijos:
-                self._recorrer(h)
+                yield self._recorrer(h)
             return None
 
         if tipo == "condicion":
-            return self._recorrer(hijos[0]) if hijos else None
+            return (yield self._recorrer(hijos[0])) if hijos else None
 
         if tipo == "declaracion_variable":
             return None
 
         # Sentencias
         if tipo == "asignacion":
-            return self._asignacion(nodo)
+            return (yield from self._asignacion(nodo))
 
         if tipo in ("post_inc", "post_increment", "post_dec", "post_decrement", 
                     "incremento", "decremento"):
-            return self._post_inc_dec(nodo)
+            return (yield from self._post_inc_dec(nodo))
 
         if tipo == "seleccion":
-            return self._if_else(nodo)
+            return (yield from self._if_else(nodo))
 
         if tipo in ("iteracion", "while"):
-            return self._while(nodo)
+            return (yield from self._while(nodo))
 
         if tipo in ("repeticion", "do"):
-            return self._do_until(nodo)
+            return (yield from self._do_until(nodo))
 
         if tipo in ("sent_in", "cin", "INPUT"):
-            return self._cin(nodo)
+            return (yield from self._cin(nodo))
 
         if tipo in ("sent_out", "cout", "OUTPUT"):
-            return self._cout(nodo)
+            return (yield from self._cout(nodo))
 
         # Expresiones unarias (negación, not)
         if tipo in ("negacion", "neg", "unario", "menos_unario", "-u", "operador_unario"):
-            return self._negacion(nodo)
+            return (yield from self._negacion(nodo))
 
         # Expresiones aritméticas
         if tipo in ("suma_op", "SUMA", "suma", "expresion_simple", "expresion_aditiva", 
                     "termino", "expresion", "exp", "exp_simple"):
             # Si tiene operador, es una operación binaria
             if valor in ("+", "-") and len(hijos) >= 2:
-                return self._suma(nodo)
+                return (yield from self._suma(nodo))
             # Si solo tiene un hijo, delegar
             elif len(hijos) == 1:
-                return self._recorrer(hijos[0])
+                return (yield self._recorrer(hijos[0]))
             # Si tiene 2+ hijos sin operador explícito, asumir suma
             elif len(hijos) >= 2:
-                return self._suma(nodo)
+                return (yield from self._suma(nodo))
             return None
 
         if tipo in ("mult_op", "MULT", "mult", "factor", "expresion_multiplicativa", "term"):
             # Si tiene operador, es una operación binaria
             if valor in ("*", "/", "%") and len(hijos) >= 2:
-                return self._mult(nodo)
+                return (yield from self._mult(nodo))
             # Si solo tiene un hijo, delegar
             elif len(hijos) == 1:
-                return self._recorrer(hijos[0])
+                return (yield self._recorrer(hijos[0]))
             # Si tiene 2+ hijos sin operador explícito, asumir multiplicación
             elif len(hijos) >= 2:
-                return self._mult(nodo)
+                return (yield from self._mult(nodo))
             return None
 
         # Expresiones relacionales y lógicas
         if tipo in ("rel_op", "REL", "relacional", "comparacion"):
-            return self._rel(nodo)
+            return (yield from self._rel(nodo))
 
         if tipo in ("log_op", "AND", "OR", "logico"):
-            return self._log(nodo)
+            return (yield from self._log(nodo))
 
         # Literales e identificadores
-        if tipo in ("numero", "NUM", "FLOAT", "INT", "entero", "flotante"):
-            return str(valor)
-
-        if tipo in ("id", "ID", "identificador", "variable"):
+        if tipo in TIPOS_HOJA:
             return str(valor)
 
         # Expresión entre paréntesis - procesar el contenido
         if tipo in ("expresion_paren", "parentesis", "paren"):
             if hijos:
-                return self._recorrer(hijos[0])
+                return (yield self._recorrer(hijos[0]))
             return None
 
         # Por defecto, recorrer hijos buscando expresiones
         resultado = None
         for h in hijos:
-            res = self._recorrer(h)
+            res = yield self._recorrer(h)
             if res is not None:
                 resultado = res
         
@@ -203,6 +210,12 @@ class CodigoIntermedioGenerator:
     #          GENERADORES PARA EXPRESIONES / SENTENCIAS
     # ============================================================
 
+    def _hoja(self, nodo):
+        """Dirección de un literal o identificador sin pasar por ejecutar_recorrido; None si no lo es."""
+        if nodo is not None and getattr(nodo, "tipo", None) in TIPOS_HOJA:
+            return str(getattr(nodo, "valor", None))
+        return None
+
     def _asignacion(self, nodo):
         """Genera código para una asignación.
         Formato: (asn, valor, variable, _)
@@ -212,7 +225,7 @@ class CodigoIntermedioGenerator:
             return None
             
         expr = nodo.hijos[0] if nodo.hijos else None
-        val = self._recorrer(expr)
+        val = self._hoja(expr) or (yield self._recorrer(expr))
 
         if val is None:
             return None
@@ -233,7 +246,7 @@ class CodigoIntermedioGenerator:
             return None
             
         idn = hijos[0]
-        nombre = getattr(idn, "valor", None) or self._recorrer(idn)
+        nombre = getattr(idn, "valor", None) or (yield self._recorrer(idn))
         if nombre is None:
             return None
 
@@ -266,14 +279,14 @@ class CodigoIntermedioGenerator:
             
         # Si solo hay un hijo, delegar el procesamiento a ese hijo
         if len(hijos) == 1:
-            return self._recorrer(hijos[0])
+            return (yield self._recorrer(hijos[0]))
         
         # Procesar operandos
         left = hijos[0] if len(hijos) > 0 else None
         right = hijos[1] if len(hijos) > 1 else None
 
-        l = self._recorrer(left)
-        r = self._recorrer(right)
+        l = self._hoja(left) or (yield self._recorrer(left))
+        r = self._hoja(right) or (yield self._recorrer(right))
 
         # Fallback: intentar obtener valor del nodo directamente
         if l is None and left is not None:
@@ -318,13 +331,13 @@ class CodigoIntermedioGenerator:
         
         # Si solo hay un hijo, no es realmente una suma, delegar
         if len(hijos) == 1:
-            return self._recorrer(hijos[0])
+            return (yield self._recorrer(hijos[0]))
         
         # Si no hay hijos, retornar None
         if len(hijos) == 0:
             return None
             
-        return self._operacion_binaria(nodo, "add")
+        return (yield from self._operacion_binaria(nodo, "add"))
 
     def _mult(self, nodo):
         """Multiplicación / división binaria."""
@@ -332,21 +345,21 @@ class CodigoIntermedioGenerator:
         
         # Si solo hay un hijo, no es realmente una multiplicación, delegar
         if len(hijos) == 1:
-            return self._recorrer(hijos[0])
+            return (yield self._recorrer(hijos[0]))
         
         # Si no hay hijos, retornar None
         if len(hijos) == 0:
             return None
             
-        return self._operacion_binaria(nodo, "mul")
+        return (yield from self._operacion_binaria(nodo, "mul"))
 
     def _rel(self, nodo):
         """Relacionales: >, <, ==, etc."""
-        return self._operacion_binaria(nodo, "eq")
+        return (yield from self._operacion_binaria(nodo, "eq"))
 
     def _log(self, nodo):
         """Operadores lógicos (&&, ||)."""
-        return self._operacion_binaria(nodo, "and")
+        return (yield from self._operacion_binaria(nodo, "and"))
 
     def _negacion(self, nodo):
         """Operador unario de negación (-expr) o positivo (+expr).
@@ -356,7 +369,7 @@ class CodigoIntermedioGenerator:
         if not hijos:
             return None
         
-        operando = self._recorrer(hijos[0])
+        operando = self._hoja(hijos[0]) or (yield self._recorrer(hijos[0]))
         
         if operando is None:
             return None
@@ -388,14 +401,14 @@ class CodigoIntermedioGenerator:
         bloque_if = hijos[1] if len(hijos) > 1 else None
         bloque_else = hijos[2] if len(hijos) > 2 else None
 
-        t_cond = self._recorrer(cond_node)
+        t_cond = yield self._recorrer(cond_node)
         
         if t_cond is None:
             # Recorrer bloques aunque la condición sea inválida
             if bloque_if:
-                self._recorrer(bloque_if)
+                yield self._recorrer(bloque_if)
             if bloque_else:
-                self._recorrer(bloque_else)
+                yield self._recorrer(bloque_else)
             return None
 
         L_else = self.nueva_etiqueta()
@@ -406,7 +419,7 @@ class CodigoIntermedioGenerator:
 
         # Código del bloque if
         if bloque_if:
-            self._recorrer(bloque_if)
+            yield self._recorrer(bloque_if)
 
         # Saltar al fin después del bloque if
         self.emitir("goto", L_fin, None, None)
@@ -416,7 +429,7 @@ class CodigoIntermedioGenerator:
 
         # Código del bloque else
         if bloque_else:
-            self._recorrer(bloque_else)
+            yield self._recorrer(bloque_else)
 
         # Etiqueta de fin
         self.emitir("lab", L_fin, None, None)
@@ -443,11 +456,11 @@ class CodigoIntermedioGenerator:
         self.emitir("lab", L_inicio, None, None)
 
         # Evaluar condición
-        t_cond = self._recorrer(cond_node)
+        t_cond = yield self._recorrer(cond_node)
         
         if t_cond is None:
             if bloque:
-                self._recorrer(bloque)
+                yield self._recorrer(bloque)
             self.emitir("lab", L_fin, None, None)
             return None
 
@@ -456,7 +469,7 @@ class CodigoIntermedioGenerator:
         
         # Código del bloque
         if bloque:
-            self._recorrer(bloque)
+            yield self._recorrer(bloque)
             
         # Regresar al inicio
         self.emitir("goto", L_inicio, None, None)
@@ -486,10 +499,10 @@ class CodigoIntermedioGenerator:
         
         # Código del bloque
         if bloque_do:
-            self._recorrer(bloque_do)
+            yield self._recorrer(bloque_do)
 
         # Evaluar condición
-        t_cond = self._recorrer(cond_node)
+        t_cond = yield self._recorrer(cond_node)
         
         if t_cond is None:
             self.emitir("lab", L_fin, None, None)
@@ -515,7 +528,7 @@ class CodigoIntermedioGenerator:
             return None
             
         var_node = hijos[0]
-        nombre = getattr(var_node, "valor", None) or self._recorrer(var_node)
+        nombre = getattr(var_node, "valor", None) or (yield self._recorrer(var_node))
         
         if nombre is None:
             return None
@@ -531,7 +544,7 @@ class CodigoIntermedioGenerator:
         if not hijos:
             return None
             
-        salida = self._recorrer(hijos[0])
+        salida = self._hoja(hijos[0]) or (yield self._recorrer(hijos[0]))
         
         if salida is None:
             salida = getattr(hijos[0], "valor", None)
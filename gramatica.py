@@ -0,0 +1,232 @@
+# gramatica.py
+# Gramática del lenguaje en una notación legible por máquina y el cálculo de sus
+# conjuntos PRIMEROS y SIGUIENTES. El analizador sintáctico toma de aquí los
+# tokens donde retoma el análisis después de un error.
+
+# ============================================================
+#                 ESPECIFICACIÓN DE LA GRAMÁTICA
+# ============================================================
+
+# Una producción por línea: "no_terminal -> símbolos | símbolos ...". Una línea que
+# empieza con '|' agrega alternativas a la anterior; 'ε' es la alternativa vacía y
+# '#' empieza un comentario. Los no terminales van en minúsculas; los terminales
+# son tipos de token en mayúsculas o valores entre comillas simples, los mismos
+# nombres que ClasesToken.mascara. La primera producción es la inicial.
+# '@nombre' al final de una alternativa indica el método accion_nombre de
+# AnalizadorPredictivo, que arma su nodo con los valores de sus símbolos (el token
+# de cada terminal y el resultado de cada no terminal); sin acción, los valores
+# pasan tal cual a la producción que la contiene.
+# Está escrita sin recursión izquierda y tal como la reconoce AnalizadorSintactico.
+GRAMATICA_TEXTO = r"""
+programa             -> 'main' '{' lista_declaracion '}' @programa
+lista_declaracion    -> declaraciones lista_sentencias
+declaraciones        -> declaracion_variable declaraciones | ε
+declaracion_variable -> tipo identificador ';' @declaracion_variable
+tipo                 -> 'int' | 'float' | 'bool'
+identificador        -> IDENTIFICADOR mas_identificadores @identificador
+mas_identificadores  -> ',' IDENTIFICADOR mas_identificadores | ε
+
+# Una lista termina en '}', 'end', 'else' o 'until'
+lista_sentencias     -> sentencia lista_sentencias | ε
+sentencia            -> seleccion | iteracion | repeticion | sent_in | sent_out
+                      | IDENTIFICADOR sentencia_id @asignacion
+# asignacion o incremento/decremento
+sentencia_id         -> '=' sent_expresion | '++' ';' | '--' ';'
+sent_expresion       -> expresion ';' | ';'
+seleccion            -> 'if' expresion 'then' bloque_if bloque_else 'end' @seleccion
+bloque_if            -> lista_sentencias @bloque_if
+bloque_else          -> 'else' lista_sentencias @bloque_else | ε
+iteracion            -> 'while' expresion bloque_while 'end' @iteracion
+bloque_while         -> lista_sentencias @bloque_while
+# 'while' no termina la lista del cuerpo: empieza una iteración dentro de él
+repeticion           -> 'do' bloque_do 'until' expresion @repeticion
+bloque_do            -> lista_sentencias @bloque_do
+sent_in              -> 'cin' '>>' IDENTIFICADOR ';' @sent_in
+# El léxico no produce cadenas y '<<' después de una expresión es un operador
+# relacional, así que la salida es siempre una expresión
+sent_out             -> 'cout' '<<' expresion ';' @sent_out
+
+# Un nivel por precedencia de OPERADORES_BINARIOS; @binaria agrupa a la izquierda
+# la secuencia operando operador operando..., '^' agrupa a la derecha por la
+# recursión de resto_factor
+expresion            -> expresion_relacional resto_logica @binaria
+resto_logica         -> OPERADOR_LOGICO expresion_relacional resto_logica | ε
+expresion_relacional -> expresion_simple resto_relacional @binaria
+resto_relacional     -> OPERADOR_RELACIONAL expresion_simple | ε
+expresion_simple     -> termino resto_simple @binaria
+resto_simple         -> '+' termino resto_simple | '-' termino resto_simple | ε
+termino              -> factor resto_termino @binaria
+resto_termino        -> '*' factor resto_termino | '/' factor resto_termino
+                      | '%' factor resto_termino | ε
+factor               -> componente resto_factor @binaria
+resto_factor         -> '^' factor | ε
+# '!' es OPERADOR_RELACIONAL para el léxico y no llega a ser operador unario
+componente           -> IDENTIFICADOR @hoja | NUMERO_ENTERO @hoja | NUMERO_DECIMAL @hoja
+                      | '(' expresion ')' @parentesis | '+' componente @unario | '-' componente @unario
+"""
+
+VACIO = 'ε'
+# Terminal del final de la entrada en los conjuntos SIGUIENTES
+FIN = '$'
+
+
+def leer_gramatica(texto):
+    """
+    (inicial, producciones, acciones) de texto en la notación de GRAMATICA_TEXTO.
+    producciones: no_terminal -> lista de alternativas, cada una una tupla de
+    símbolos (la alternativa vacía es la tupla vacía). Los terminales entre
+    comillas quedan sin ellas. acciones: no_terminal -> nombre de la acción de
+    cada alternativa, o None.
+    """
+    producciones = {}
+    acciones = {}
+    usados = {}  # no terminal -> cabeza donde aparece, para validar
+    inicial = None
+    actual = None
+    for numero, linea in enumerate(texto.splitlines(), 1):
+        linea = linea.split('#', 1)[0].strip()
+        if not linea:
+            continue
+        if linea.startswith('|'):
+            if actual is None:
+                raise ValueError(f"Línea {numero}: alternativa sin producción")
+            cuerpo = linea[1:]
+        else:
+            cabeza, flecha, cuerpo = linea.partition('->')
+            actual = cabeza.strip()
+            if not flecha or not actual.islower():
+                raise ValueError(f"Línea {numero}: se esperaba 'no_terminal -> ...'")
+            if inicial is None:
+                inicial = actual
+            producciones.setdefault(actual, [])
+            acciones.setdefault(actual, [])
+        for alternativa in cuerpo.split('|'):
+            simbolos = []
+            accion = None
+            for simbolo in alternativa.split():
+                if accion is not None:
+                    raise ValueError(f"Línea {numero}: la acción @{accion} debe ir al final de la alternativa")
+                if simbolo.startswith('@'):
+                    accion = simbolo[1:]
+                    continue
+                if simbolo.startswith("'"):
+                    simbolo = simbolo[1:-1]
+                elif simbolo.islower() and simbolo != VACIO:
+                    usados.setdefault(simbolo, actual)
+                simbolos.append(simbolo)
+            producciones[actual].append(() if simbolos == [VACIO] else tuple(simbolos))
+            acciones[actual].append(accion)
+
+    for simbolo, cabeza in usados.items():
+        if simbolo not in producciones:
+            raise ValueError(f"'{simbolo}' (en {cabeza}) no tiene producciones")
+    return inicial, producciones, acciones
+
+
+def primeros_secuencia(simbolos, primeros):
+    """PRIMEROS de una secuencia de símbolos; incluye VACIO si puede derivar la cadena vacía"""
+    resultado = set()
+    for simbolo in simbolos:
+        conjunto = primeros.get(simbolo)
+        if conjunto is None:  # terminal
+            resultado.add(simbolo)
+            return resultado
+        resultado |= conjunto - {VACIO}
+        if VACIO not in conjunto:
+            return resultado
+    resultado.add(VACIO)
+    return resultado
+
+
+def calcular_primeros(producciones):
+    """no_terminal -> frozenset de PRIMEROS (con VACIO si es anulable), por punto fijo"""
+    primeros = {cabeza: set() for cabeza in producciones}
+    cambio = True
+    while cambio:
+        cambio = False
+        for cabeza, alternativas in producciones.items():
+            conjunto = primeros[cabeza]
+            antes = len(conjunto)
+            for alternativa in alternativas:
+                conjunto |= primeros_secuencia(alternativa, primeros)
+            cambio |= len(conjunto) != antes
+    return {cabeza: frozenset(conjunto) for cabeza, conjunto in primeros.items()}
+
+
+def calcular_siguientes(producciones, inicial, primeros):
+    """no_terminal -> frozenset de SIGUIENTES (FIN tras el símbolo inicial), por punto fijo"""
+    siguientes = {cabeza: set() for cabeza in producciones}
+    siguientes[inicial].add(FIN)
+    cambio = True
+    while cambio:
+        cambio = False
+        for cabeza, alternativas in producciones.items():
+            for alternativa in alternativas:
+                for i, simbolo in enumerate(alternativa):
+                    if simbolo not in producciones:
+                        continue
+                    conjunto = siguientes[simbolo]
+                    antes = len(conjunto)
+                    resto = primeros_secuencia(alternativa[i + 1:], primeros)
+                    conjunto |= resto - {VACIO}
+                    if VACIO in resto:
+                        conjunto |= siguientes[cabeza]
+                    cambio |= len(conjunto) != antes
+    return {cabeza: frozenset(conjunto) for cabeza, conjunto in siguientes.items()}
+
+
+def tabla_ll1(producciones, primeros, siguientes):
+    """
+    Tabla de análisis LL(1): no_terminal -> {terminal: índice de la alternativa}.
+    La alternativa va en la celda de cada terminal de sus PRIMEROS y, si puede
+    derivar la cadena vacía, en las de SIGUIENTES del no terminal. ValueError si
+    dos alternativas comparten una celda (la gramática no es LL(1)).
+    """
+    tabla = {}
+    conflictos = []
+    for cabeza, alternativas in producciones.items():
+        fila = tabla[cabeza] = {}
+        for indice, alternativa in enumerate(alternativas):
+            terminales = primeros_secuencia(alternativa, primeros)
+            if VACIO in terminales:
+                terminales = (terminales - {VACIO}) | siguientes[cabeza]
+            for terminal in terminales:
+                if terminal in fila and fila[terminal] != indice:
+                    conflictos.append(f"{cabeza} con '{terminal}': alternativas {fila[terminal]} y {indice}")
+                fila[terminal] = indice
+    if conflictos:
+        raise ValueError("La gramática no es LL(1): " + "; ".join(conflictos))
+    return tabla
+
+
+INICIAL, PRODUCCIONES, ACCIONES = leer_gramatica(GRAMATICA_TEXTO)
+PRIMEROS = calcular_primeros(PRODUCCIONES)
+SIGUIENTES = calcular_siguientes(PRODUCCIONES, INICIAL, PRIMEROS)
+TABLA_LL1 = tabla_ll1(PRODUCCIONES, PRIMEROS, SIGUIENTES)
+
+
+def terminales_sincronizacion(*no_terminales, excluir=()):
+    """
+    Terminales donde retomar el análisis tras un error dentro de no_terminales:
+    sus PRIMEROS y SIGUIENTES, sin VACIO, FIN ni los de excluir.
+    """
+    conjunto = set()
+    for no_terminal in no_terminales:
+        conjunto |= PRIMEROS[no_terminal] | SIGUIENTES[no_terminal]
+    return frozenset(conjunto - {VACIO, FIN} - set(excluir))
+
+
+def texto_tabla(tabla=None, producciones=None):
+    """Tabla LL(1) legible: una línea por celda, 'no_terminal, terminal -> alternativa'"""
+    tabla = TABLA_LL1 if tabla is None else tabla
+    producciones = PRODUCCIONES if producciones is None else producciones
+    lineas = []
+    for cabeza, fila in tabla.items():
+        for terminal in sorted(fila):
+            alternativa = producciones[cabeza][fila[terminal]]
+            lineas.append(f"{cabeza}, {terminal} -> {' '.join(alternativa) or VACIO}")
+    return "\n".join(lineas) + "\n"
+
+
+if __name__ == "__main__":
+    print(texto_tabla(), end="")
@@ -14,11 +14,13 @@ import sys
 import os
 
 
-from logic import analizador_sintactico, mostrar_ast_texto
 from interprete import InterpreteCI
 from PyQt6.QtGui import QFont
 from logic import HighlightSyntax
-from logic import analizador_lexico
+from logic import analizador_lexico, LexerIncremental, AnalizadorIncremental
+from pipeline import CompilationPipeline
+from cache_fases import CacheFases
+from registro import configurar
 
 
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QTextEdit, 
@@ -182,6 +184,18 @@ class CodeEditor(QPlainTextEdit):
         # Establece la referencia a la ventana principal (solo una vez)
         self.main_window = parent
         
+        # Lexer incremental: cada edición relexea solo las líneas afectadas
+        self.lexer_incremental = LexerIncremental()
+        # Las mismas ediciones le indican al sintáctico qué sentencias reanalizar
+        self.analizador_incremental = AnalizadorIncremental()
+        self.document().contentsChange.connect(self.documento_editado)
+
+        # Las salidas del análisis léxico se refrescan cuando se deja de escribir
+        self.temporizador_lexico = QTimer(self)
+        self.temporizador_lexico.setSingleShot(True)
+        self.temporizador_lexico.setInterval(250)
+        self.temporizador_lexico.timeout.connect(self.refrescar_lexico)
+
         # Conecta la señal textChanged directamente a este editor
         self.textChanged.connect(self.texto_cambiado)
         
@@ -200,7 +214,38 @@ class CodeEditor(QPlainTextEdit):
         # Para asegurar que los saltos de línea se contabilicen correctamente
         self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
     
+    def documento_editado(self, posicion, eliminados, agregados):
+        """Actualiza el lexer incremental con las líneas que tocó la edición"""
+        documento = self.document()
+        lexer = self.lexer_incremental
+        primera = documento.findBlock(posicion).blockNumber()
+        bloque_final = documento.findBlock(posicion + agregados)
+        ultima = bloque_final.blockNumber() if bloque_final.isValid() else documento.blockCount() - 1
+        nuevas = ultima - primera + 1
+        viejas = nuevas - (documento.blockCount() - len(lexer.textos))
+
+        if primera < 0 or viejas < 1 or primera + viejas > len(lexer.textos):
+            # Cambio que no corresponde con las líneas guardadas: relexear todo
+            lexer.reiniciar(self.toPlainText())
+            self.analizador_incremental.invalidar()
+            return
+
+        lineas = [documento.findBlockByNumber(numero).text() for numero in range(primera, ultima + 1)]
+        relexeadas = lexer.reemplazar_lineas(primera, viejas, lineas)
+        # Las líneas siguientes que se relexearon (p. ej. al abrir un comentario) también cambiaron
+        extra = max(0, relexeadas - nuevas)
+        self.analizador_incremental.registrar_edicion(primera + 1, viejas + extra, nuevas + extra)
+
     def texto_cambiado(self):
+        self.temporizador_lexico.start()
+
+    def refrescar_lexico_pendiente(self):
+        """Refresca ya las salidas léxicas si quedó una actualización en espera"""
+        if self.temporizador_lexico.isActive():
+            self.temporizador_lexico.stop()
+            self.refrescar_lexico()
+
+    def refrescar_lexico(self):
         # Solo llamar a ejecutar_analisis_lexico si main_window está definido
         if self.main_window is not None:
             try:
@@ -343,6 +388,13 @@ class CompilerIDE(QMainWindow):
         self.hash_table_widget = None
         self.tabla_simbolos_widget = None
         self.error_semantico = None # Se inicializa en load_editor.
+
+        # Resultados de las fases del texto actual; se rehace en cada análisis léxico
+        self.pipeline = None
+        # Los archivos de artefactos (tokens.bin, ast.txt...) solo se escriben si se activa
+        self.escribir_artefactos = False
+        # Resultados de fases por hash del código, en memoria y en disco
+        self.cache_fases = CacheFases()
         
         self.initUI()
 
@@ -351,10 +403,9 @@ class CompilerIDE(QMainWindow):
         if not hasattr(self, 'text_edit') or self.text_edit is None:
             return
             
-        texto = self.text_edit.toPlainText()
-        tokens = analizador_lexico(texto)
+        self.text_edit.temporizador_lexico.stop()
+        tokens = self.text_edit.lexer_incremental.tokens()
         
-        salida = ""
         salida_simple = ""
         salida_errores = ""
         
@@ -362,27 +413,78 @@ class CompilerIDE(QMainWindow):
             if token.tipo == 'ERROR':
                 salida_errores += f"{token}\n"
             else:
-                salida += f"{token}\n"  # para tokens2.txt
-                salida_simple += f"{token.tipo}('{token.valor}')\n"  # para tokens.txt
+                salida_simple += f"{token.tipo}('{token.valor}')\n"
 
         self.lexico_output.setPlainText(salida_simple)
         self.error_lexico.setPlainText(salida_errores)
 
-        # Guardar en archivos de texto
-        try:
-            with open("tokens.txt", "w", encoding="utf-8") as f_tokens:
-                f_tokens.write(salida)  # Solo tipo y valor
-
-            with open("errores.txt", "w", encoding="utf-8") as f_errores:
-                f_errores.write(salida_errores)
-        except Exception as e:
-            print(f"Error al guardar los archivos: {e}")
+        # Las demás fases parten de estos tokens en memoria
+        self.pipeline = CompilationPipeline(
+            texto=self.text_edit.toPlainText(), tokens=tokens,
+            escribir_artefactos=self.escribir_artefactos, cache=self.cache_fases,
+            analizador_incremental=self.text_edit.analizador_incremental,
+        )
         
+        if self.tabs.currentWidget() is self.tree_esquema:
+            self.actualizar_esquema()
+
         # Solo cambia a la pestaña si se solicita explícitamente
         if cambiar_pestaña:
             self.tabs.setCurrentWidget(self.lexico_output)
             self.errors_tabs.setCurrentWidget(self.error_lexico)
 
+    def pestana_cambiada(self, _indice):
+        if self.tabs.currentWidget() is self.tree_esquema:
+            self.actualizar_esquema()
+
+    def actualizar_esquema(self):
+        """Muestra el esquema del texto actual en la pestaña Esquema"""
+        esquema = self.pipeline_actual().esquema()
+        self.tree_esquema.clear()
+        if esquema is None:
+            return
+        # Se arman los ítems fuera del árbol (con una pila explícita: el anidamiento
+        # no está limitado) y cada lista de hijos se agrega de una vez
+        raiz = QTreeWidgetItem()
+        pila = [(esquema, raiz)]
+        while pila:
+            nodo, item = pila.pop()
+            hijos = []
+            for hijo in nodo.hijos:
+                texto = f"{hijo.tipo}: {hijo.valor}" if hijo.valor else hijo.tipo
+                hijo_item = QTreeWidgetItem([f"{texto}  (línea {hijo.linea})"])
+                hijo_item.setData(0, Qt.ItemDataRole.UserRole, hijo.linea)
+                hijos.append(hijo_item)
+                if hijo.hijos:
+                    pila.append((hijo, hijo_item))
+            item.addChildren(hijos)
+        self.tree_esquema.addTopLevelItems(raiz.takeChildren())
+        for indice in range(self.tree_esquema.topLevelItemCount()):
+            self.tree_esquema.topLevelItem(indice).setExpanded(True)
+
+    def ir_a_linea_esquema(self, item, _columna):
+        """Lleva el cursor del editor a la línea del elemento del esquema"""
+        linea = item.data(0, Qt.ItemDataRole.UserRole)
+        if not linea:
+            return
+        bloque = self.text_edit.document().findBlockByNumber(linea - 1)
+        cursor = self.text_edit.textCursor()
+        cursor.setPosition(bloque.position())
+        self.text_edit.setTextCursor(cursor)
+        self.text_edit.setFocus()
+
+    def pipeline_actual(self):
+        """Pipeline con los tokens del texto actual del editor"""
+        self.text_edit.refrescar_lexico_pendiente()
+        if self.pipeline is None:
+            self.ejecutar_analisis_lexico()
+        return self.pipeline
+
+    def cambiar_escribir_artefactos(self, activo):
+        self.escribir_artefactos = activo
+        # El siguiente análisis vuelve a ejecutar las fases para escribir sus archivos
+        self.pipeline = None
+
     def initUI(self):
         status_bar = QStatusBar()
         self.setStatusBar(status_bar)
@@ -489,6 +591,12 @@ class CompilerIDE(QMainWindow):
 
         compilar_menu.addAction(compilar_action)
 
+        artefactos_action = QAction("Guardar archivos de cada fase", self)
+        artefactos_action.setCheckable(True)
+        artefactos_action.toggled.connect(self.cambiar_escribir_artefactos)
+        compilar_menu.addSeparator()
+        compilar_menu.addAction(artefactos_action)
+
 
         # compilar_todo_action = QAction("Compilar Todo", self)
         # ver_codigo_intermedio_action = QAction("Ver Código Intermedio", self)
@@ -539,6 +647,7 @@ class CompilerIDE(QMainWindow):
         self.cursor_position_label.setText(f"Línea: {line}   Columna: {column}")
     
     def load_editor(self):
+        self.pipeline = None
         self.text_edit = CodeEditor()
         self.text_edit.set_main_window(self)  # Set reference to main window
         
@@ -589,6 +698,14 @@ class CompilerIDE(QMainWindow):
 
         self.tabs.addTab(self.sintactico_widget, "Sintáctico")
 
+        # Pestaña Esquema: estructura del programa con el análisis de esqueleto, que
+        # se refresca con el léxico mientras está visible; un clic lleva a la línea
+        self.tree_esquema = QTreeWidget()
+        self.tree_esquema.setHeaderLabels(["Esquema del programa"])
+        self.tree_esquema.itemClicked.connect(self.ir_a_linea_esquema)
+        self.tabs.addTab(self.tree_esquema, "Esquema")
+        self.tabs.currentChanged.connect(self.pestana_cambiada)
+
         self.tabs.addTab(QLabel("Inicializando Pestaña Semántico..."), "Semántico")
 
         # Pestaña de Código Intermedio (editor real)
@@ -704,7 +821,7 @@ class CompilerIDE(QMainWindow):
                 return
                 
             # Ejecutar análisis sintáctico
-            ast, errores = analizador_sintactico("tokens.txt")
+            ast, errores = self.pipeline_actual().sintactico()
             
             # Limpiar el árbol antes de agregar nuevos elementos
             self.tree_ast.clear()
@@ -746,25 +863,7 @@ class CompilerIDE(QMainWindow):
                 self.error_sintactico.setPlainText(" No se encontraron errores sintácticos")
             
 
-            ast_texto = mostrar_ast_texto(ast) if ast else "No se pudo generar el AST debido a errores sintácticos"
 
-            try:
-                with open("ast.txt", "w", encoding="utf-8") as f_ast:
-                    f_ast.write(ast_texto)
-                
-                with open("errores_sintacticos.txt", "w", encoding="utf-8") as f_errores:
-                    if errores:
-                        for error in errores:
-                            f_errores.write(f"{error}\n")
-                    else:
-                        f_errores.write("No se encontraron errores sintácticos")
-                        
-                print("Archivos del análisis sintáctico guardados: ast.txt y errores_sintacticos.txt")
-
-            except Exception as e:
-                print(f"Error al guardar archivos del análisis sintáctico: {e}")
-
-                        
             # Cambiar a la pestaña si se solicita
             if cambiar_pestaña:
                 self.tabs.setCurrentWidget(self.sintactico_widget)  # Cambiar a sintactico_widget
@@ -800,7 +899,8 @@ class CompilerIDE(QMainWindow):
         """Ejecuta el análisis semántico completo"""
         try:
             # Primero ejecutar análisis sintáctico para obtener el AST
-            ast, errores_sint = analizador_sintactico("tokens.txt")
+            pipeline = self.pipeline_actual()
+            ast, errores_sint = pipeline.sintactico()
             
             if not ast:
                 self.status_label.setText("No se puede ejecutar análisis semántico sin AST válido")
@@ -811,15 +911,8 @@ class CompilerIDE(QMainWindow):
                     self.errors_tabs.setCurrentWidget(self.error_sintactico)
                 return
             
-            # Importar el analizador semántico
-            try:
-                from analizador_semantico import ejecutar_analisis_semantico, NodoAnotado
-            except ImportError:
-                self.status_label.setText("Error: No se encontró 'analizador_semantico.py'")
-                return
-            
             # Ejecutar análisis semántico
-            ast_anotado, tabla_simbolos, errores_sem = ejecutar_analisis_semantico(ast)
+            ast_anotado, tabla_simbolos, errores_sem = pipeline.semantico()
             
             # Crear pestañas si no existen (ya se llamaron en load_editor, pero se verifica)
             if not hasattr(self, 'tree_semantico') or self.tree_semantico is None:
@@ -922,44 +1015,6 @@ class CompilerIDE(QMainWindow):
                 self.error_semantico.setPlainText("No se encontraron errores semánticos")
 
 
-            # ===== GUARDAR RESULTADOS EN ARCHIVOS =====
-            try:
-                # Guardar AST anotado
-                with open("ast_anotado.txt", "w", encoding="utf-8") as f:
-                    f.write(self.generar_texto_ast_anotado(ast_anotado))
-                
-                # Guardar tabla de símbolos
-                with open("tabla_simbolos.txt", "w", encoding="utf-8") as f:
-                    f.write("TABLA DE SÍMBOLOS\n")
-                    f.write("="*100 + "\n")
-                    f.write(f"{'NAME':<15} {'TYPE':<10} {'OFFSET':<10} {'COUNT':<7} {'LINES':<30}\n")
-                    f.write("-"*100 + "\n")
-
-                    offset_counter = 0
-                    for simbolo in simbolos:
-                        name = simbolo.nombre
-                        tipo = simbolo.tipo
-                        offset = offset_counter
-                        count = len(simbolo.ubicaciones)
-                        lines = ", ".join([str(l) for l, c in simbolo.ubicaciones])
-
-                        f.write(f"{name:<15} {tipo:<10} {offset:<10} {count:<7} {lines:<30}\n")
-                        offset_counter += 1
-
-                # Guardar errores semánticos
-                with open("errores_semanticos.txt", "w", encoding="utf-8") as f:
-                    if errores_sem:
-                        for error in errores_sem:
-                            f.write(f"{error}\n")
-                    else:
-                        f.write("No se encontraron errores semánticos\n")
-                
-                print("Archivos del análisis semántico guardados exitosamente")
-
-            except Exception as e:
-                print(f"Error al guardar archivos del análisis semántico: {e}")
-
-                        
             # Cambiar a pestañas si se solicita
             if cambiar_pestaña:
                 self.tabs.setCurrentWidget(self.semantico_widget)
@@ -1046,30 +1101,6 @@ class CompilerIDE(QMainWindow):
         self.errors_tabs.insertTab(2, self.error_semantico, "Errores Semánticos")
 
 
-    def generar_texto_ast_anotado(self, nodo, nivel=0):
-        """Genera representación en texto del AST anotado"""
-        if nodo is None:
-            return ""
-        
-        indentacion = "  " * nivel
-        resultado = f"{indentacion}{nodo.tipo}"
-        
-        if hasattr(nodo, 'valor') and nodo.valor:
-            resultado += f": {nodo.valor}"
-        
-        if hasattr(nodo, 'tipo_dato') and nodo.tipo_dato:
-            resultado += f" | Tipo: {nodo.tipo_dato}"
-        
-        if hasattr(nodo, 'valor_calculado') and nodo.valor_calculado is not None:
-            resultado += f" | Valor: {nodo.valor_calculado}"
-        
-        resultado += "\n"
-        
-        for hijo in nodo.hijos:
-            resultado += self.generar_texto_ast_anotado(hijo, nivel + 1)
-        
-        return resultado
-    
     #################################FIN MÉTODOS SEMÁNTICO############################
 
     ################################# CODIGO INTERMEDIO ##########################################
@@ -1079,17 +1110,14 @@ class CompilerIDE(QMainWindow):
         
         try:
             # ---------------------------------------------------------
-            # 0. ANALISIS LÉXICO (asegura tokens.txt actualizado)
+            # 0. ANALISIS LÉXICO (tokens del texto actual, en memoria)
             # ---------------------------------------------------------
-            if hasattr(self, "ejecutar_analisis_lexico"):
-                self.ejecutar_analisis_lexico()
-            else:
-                print("Advertencia: No existe ejecutar_analisis_lexico()")
+            pipeline = self.pipeline_actual()
 
             # ---------------------------------------------------------
             # 1. ANALISIS SINTÁCTICO
             # ---------------------------------------------------------
-            ast, errores_sint = analizador_sintactico("tokens.txt")
+            ast, errores_sint = pipeline.sintactico()
 
             if not ast:
                 self.status_label.setText("Error: No se puede compilar sin un AST válido")
@@ -1101,13 +1129,7 @@ class CompilerIDE(QMainWindow):
             # ---------------------------------------------------------
             # 2. ANALISIS SEMÁNTICO
             # ---------------------------------------------------------
-            try:
-                from analizador_semantico import ejecutar_analisis_semantico
-            except ImportError:
-                self.status_label.setText("Error: Falta 'analizador_semantico.py'")
-                return
-
-            ast_anotado, tabla_simbolos, errores_sem = ejecutar_analisis_semantico(ast)
+            ast_anotado, tabla_simbolos, errores_sem = pipeline.semantico()
 
             if errores_sem:
                 self.status_label.setText("Errores semánticos: compilación detenida")
@@ -1118,18 +1140,7 @@ class CompilerIDE(QMainWindow):
             # ---------------------------------------------------------
             # 3. GENERAR CÓDIGO INTERMEDIO (IR)
             # ---------------------------------------------------------
-            try:
-                from generador_codigo_intermedio import CodigoIntermedioGenerator
-
-                gen = CodigoIntermedioGenerator()
-                codigo_ir = gen.generar(ast_anotado)   # devuelve lista de strings "(op, a1, a2, res)"
-
-                # mostrar en UI
-                self.codigo_intermedio.setPlainText("\n".join(codigo_ir))
-
-            except ImportError:
-                self.status_label.setText("Error: Falta 'generador_codigo_intermedio.py'")
-                return
+            codigo_ir = pipeline.codigo_intermedio()   # lista de strings "(op, a1, a2, res)"
 
 
             # ---------------------------------------------------------
@@ -1234,6 +1245,7 @@ class CompilerIDE(QMainWindow):
     
 
 if __name__ == "__main__":
+    configurar()
     app = QApplication(sys.argv)
     font = QFont("Courier New", 11)
     app.setStyleSheet("""
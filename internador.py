@@ -0,0 +1,81 @@
+# internador.py
+# Tabla global de nombres internados: cada identificador, palabra reservada o
+# valor de token distinto recibe un entero pequeño la primera vez que aparece.
+# Las fases comparan y guardan esos enteros; el nombre se recupera solo para mostrarlo.
+# Cada estructura que guarda ids (TokenBuffer, ArenaAST, TablaSimbolos, InterpreteCI)
+# toma al crearse el Internador vigente con NOMBRES.tabla() y lo conserva. Cuando la
+# tabla vigente pasa de MAXIMO_NOMBRES, la siguiente estructura empieza una nueva: los
+# nombres de un editor abierto por horas (cada identificador a medio escribir) se
+# liberan junto con las estructuras que los usaban.
+
+# Nombres de la tabla vigente a partir de los cuales las estructuras nuevas usan otra
+MAXIMO_NOMBRES = 200000
+
+
+class Internador:
+    """Asigna un id entero estable a cada cadena distinta."""
+
+    def __init__(self):
+        self.nombres = []  # id -> nombre
+        self.ids = {}      # nombre -> id
+
+    def id(self, nombre):
+        """Retorna el id de nombre, registrándolo si es nuevo."""
+        id_nombre = self.ids.get(nombre)
+        if id_nombre is None:
+            id_nombre = len(self.nombres)
+            self.nombres.append(nombre)
+            self.ids[nombre] = id_nombre
+        return id_nombre
+
+    def nombre(self, id_nombre):
+        """Retorna la cadena registrada con id_nombre."""
+        return self.nombres[id_nombre]
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __contains__(self, nombre):
+        return nombre in self.ids
+
+
+class NombresCompartidos:
+    """
+    Internador vigente compartido por las fases, acotado a maximo nombres. id(),
+    nombre(), nombres e ids usan el vigente; una estructura que guarda ids toma el
+    suyo con tabla() y lo usa siempre, aunque después haya otro vigente.
+    """
+
+    def __init__(self, maximo=MAXIMO_NOMBRES):
+        self.maximo = maximo
+        self.vigente = Internador()
+
+    def tabla(self):
+        """Internador para una estructura nueva: el vigente, o uno nuevo si pasó de maximo"""
+        if len(self.vigente) > self.maximo:
+            self.vigente = Internador()
+        return self.vigente
+
+    def id(self, nombre):
+        return self.vigente.id(nombre)
+
+    def nombre(self, id_nombre):
+        return self.vigente.nombres[id_nombre]
+
+    @property
+    def nombres(self):
+        return self.vigente.nombres
+
+    @property
+    def ids(self):
+        return self.vigente.ids
+
+    def __len__(self):
+        return len(self.vigente)
+
+    def __contains__(self, nombre):
+        return nombre in self.vigente
+
+
+# Instancia compartida por léxico, sintáctico, semántico e intérprete
+NOMBRES = NombresCompartidos()
@@ -2,13 +2,45 @@
 # Intérprete de Código Intermedio basado en Cuádruplas
 # Ejecuta el código de 3 direcciones generado por CodigoIntermedioGenerator
 
+from internador import NOMBRES
+
+# Operandos que se leen, se escriben o son etiquetas en cada operación
+_LECTURAS = {
+    'asn': (1,), 'neg': (1,), 'if_t': (1,), 'if_f': (1,), 'wri': (1,),
+    'add': (1, 2), 'sub': (1, 2), 'mul': (1, 2), 'div': (1, 2), 'mod': (1, 2),
+    'gt': (1, 2), 'lt': (1, 2), 'ge': (1, 2), 'le': (1, 2), 'eq': (1, 2), 'ne': (1, 2),
+    'and': (1, 2), 'or': (1, 2), 'not': (1, 2),
+}
+_ESCRITURAS = {
+    'asn': 2, 'neg': 3, 'rd': 1,
+    'add': 3, 'sub': 3, 'mul': 3, 'div': 3, 'mod': 3,
+    'gt': 3, 'lt': 3, 'ge': 3, 'le': 3, 'eq': 3, 'ne': 3,
+    'and': 3, 'or': 3, 'not': 3,
+}
+
+# Operando ya resuelto que no es variable (literal o vacío)
+class _Constante:
+    __slots__ = ('valor',)
+
+    def __init__(self, valor):
+        self.valor = valor
+
+
 class InterpreteCI:
-    """Intérprete que ejecuta código intermedio representado como cuádruplas."""
+    """Intérprete que ejecuta código intermedio representado como cuádruplas.
+
+    Al cargar, cada operando se resuelve una sola vez: los literales se convierten
+    a su valor y las variables y temporales a su id en el internador que se toma de
+    NOMBRES al cargar. La memoria se indexa por esos ids; los nombres solo se
+    recuperan para mostrar el estado.
+    """
     
     def __init__(self):
-        self.memoria = {}  # Memoria para variables y temporales
+        self.internador = NOMBRES.tabla()
+        self.memoria = {}  # Memoria para variables y temporales (id del nombre -> valor)
         self.pc = 0        # Program Counter (índice de cuádruple actual)
         self.cuadruplas = []
+        self.resueltas = []  # cuádruplas con operandos ya resueltos
         self.etiquetas = {}  # Mapeo de etiquetas a índices de cuádruplas
         self.salida = []   # Buffer de salida para print/write
         self.entrada_buffer = []  # Buffer de entrada para read
@@ -22,8 +54,10 @@ class InterpreteCI:
             cuadruplas: Lista de objetos Cuadrupla o lista de tuplas (op, addr1, addr2, addr3)
         """
         self.cuadruplas = []
+        self.resueltas = []
         self.etiquetas = {}
         self.pc = 0
+        self.internador = NOMBRES.tabla()
         
         # Convertir a tuplas si es necesario
         for i, cuad in enumerate(cuadruplas):
@@ -33,12 +67,51 @@ class InterpreteCI:
                 tupla = cuad
             
             self.cuadruplas.append(tupla)
+            self.resueltas.append(self._resolver_cuadrupla(tupla))
             
             # Registrar etiquetas
             if tupla[0] == 'lab':
                 etiqueta = tupla[1]
                 self.etiquetas[etiqueta] = i
     
+    def _resolver_cuadrupla(self, tupla):
+        """Resuelve los operandos de lectura y escritura de una cuádrupla."""
+        op = tupla[0]
+        resuelta = list(tupla)
+        for i in _LECTURAS.get(op, ()):
+            resuelta[i] = self._resolver_operando(tupla[i])
+        destino = _ESCRITURAS.get(op)
+        if destino is not None:
+            resuelta[destino] = self.internador.id(str(tupla[destino]))
+        return tuple(resuelta)
+
+    def _resolver_operando(self, addr):
+        """Retorna una _Constante para literales y vacíos, o el id de la variable."""
+        if addr is None or addr == '_':
+            return _Constante(None)
+        
+        # Si es un número literal
+        try:
+            # Intentar convertir a float primero (maneja int y float)
+            if '.' in str(addr):
+                return _Constante(float(addr))
+            else:
+                return _Constante(int(addr))
+        except (ValueError, TypeError):
+            pass
+        
+        # Si es una cadena literal (entre comillas)
+        addr_str = str(addr)
+        if addr_str.startswith('"') and addr_str.endswith('"'):
+            return _Constante(addr_str[1:-1])  # Remover comillas
+        
+        # Es una variable o temporal
+        return self.internador.id(addr_str)
+
+    def memoria_por_nombre(self):
+        """Retorna la memoria con los nombres de variables y temporales como claves."""
+        return {self.internador.nombre(id_nombre): valor for id_nombre, valor in self.memoria.items()}
+
     def reset(self):
         """Reinicia el estado del intérprete."""
         self.memoria = {}
@@ -89,7 +162,7 @@ class InterpreteCI:
             
             return {
                 'salida': self.salida.copy(),
-                'memoria': self.memoria.copy(),
+                'memoria': self.memoria_por_nombre(),
                 'steps': steps,
                 'completado': not self.ejecutando or self.pc >= len(self.cuadruplas)
             }
@@ -103,7 +176,7 @@ class InterpreteCI:
             self.ejecutando = False
             return
         
-        op, addr1, addr2, addr3 = self.cuadruplas[self.pc]
+        op, addr1, addr2, addr3 = self.resueltas[self.pc]
         
         # Ejecutar según la operación
         if op == 'asn':
@@ -135,36 +208,21 @@ class InterpreteCI:
             raise ValueError(f"Operación desconocida: {op}")
     
     def _obtener_valor(self, addr):
-        """Obtiene el valor de una dirección (variable, temporal o literal)."""
-        if addr is None or addr == '_':
-            return None
-        
-        # Si es un número literal
-        try:
-            # Intentar convertir a float primero (maneja int y float)
-            if '.' in str(addr):
-                return float(addr)
-            else:
-                return int(addr)
-        except (ValueError, TypeError):
-            pass
-        
-        # Si es una cadena literal (entre comillas)
-        addr_str = str(addr)
-        if addr_str.startswith('"') and addr_str.endswith('"'):
-            return addr_str[1:-1]  # Remover comillas
+        """Obtiene el valor de un operando resuelto (literal o id de variable/temporal)."""
+        if addr.__class__ is _Constante:
+            return addr.valor
         
         # Es una variable o temporal
-        if addr_str not in self.memoria:
+        if addr not in self.memoria:
             # Inicializar en 0 si no existe
-            self.memoria[addr_str] = 0
+            self.memoria[addr] = 0
         
-        return self.memoria[addr_str]
+        return self.memoria[addr]
     
     def _ejecutar_asignacion(self, origen, destino):
         """Ejecuta una asignación: destino = origen"""
         valor = self._obtener_valor(origen)
-        self.memoria[str(destino)] = valor
+        self.memoria[destino] = valor
         self.pc += 1
     
     def _ejecutar_aritmetica(self, op, addr1, addr2, addr3):
@@ -187,7 +245,7 @@ class InterpreteCI:
         else:
             raise ValueError(f"Operación aritmética desconocida: {op}")
         
-        self.memoria[str(addr3)] = resultado
+        self.memoria[addr3] = resultado
         self.pc += 1
     
     def _ejecutar_relacional(self, op, addr1, addr2, addr3):
@@ -211,7 +269,7 @@ class InterpreteCI:
             raise ValueError(f"Operación relacional desconocida: {op}")
         
         # Convertir booleano a entero (1 o 0)
-        self.memoria[str(addr3)] = 1 if resultado else 0
+        self.memoria[addr3] = 1 if resultado else 0
         self.pc += 1
     
     def _ejecutar_logico(self, op, addr1, addr2, addr3):
@@ -230,13 +288,13 @@ class InterpreteCI:
                 raise ValueError(f"Operación lógica desconocida: {op}")
         
         # Convertir booleano a entero
-        self.memoria[str(addr3)] = 1 if resultado else 0
+        self.memoria[addr3] = 1 if resultado else 0
         self.pc += 1
     
     def _ejecutar_negacion(self, addr1, addr3):
         """Ejecuta negación unaria: addr3 = -addr1"""
         valor = self._obtener_valor(addr1)
-        self.memoria[str(addr3)] = -valor
+        self.memoria[addr3] = -valor
         self.pc += 1
     
     def _ejecutar_if_true(self, condicion, etiqueta):
@@ -288,7 +346,7 @@ class InterpreteCI:
         except:
             pass
 
-        self.memoria[str(variable)] = valor
+        self.memoria[variable] = valor
         self.pc += 1
 
     
@@ -307,7 +365,7 @@ class InterpreteCI:
         """Imprime el estado actual del intérprete (útil para debugging)."""
         print(f"\n=== Estado del Intérprete ===")
         print(f"PC: {self.pc}")
-        print(f"Memoria: {self.memoria}")
+        print(f"Memoria: {self.memoria_por_nombre()}")
         print(f"Salida: {self.salida}")
         if self.pc < len(self.cuadruplas):
             print(f"Próxima instrucción: {self.cuadruplas[self.pc]}")
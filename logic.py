@@ -1,107 +1,91 @@
 from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor
 from PyQt6.QtCore import QRegularExpression 
 from PyQt6.QtCore import QRegularExpression as QtRegex
+import copy
 import re
 import os
+import mmap
+import gc
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+from gramatica import (
+    ACCIONES, FIN, INICIAL, PRIMEROS, PRODUCCIONES, SIGUIENTES, TABLA_LL1, VACIO, terminales_sincronizacion,
+)
+from internador import NOMBRES
+from arena_ast import ArenaAST, NodoArena
+from recorrido import ejecutar_recorrido
+from registro import logger_fase, depuracion_activa
+from archivo_tokens import ArchivoTokens, es_archivo_binario
+
+from automata_lexico import (
+    AUTOMATA_LEXICO, ESPECIFICACION_TOKENS, PALABRAS_RESERVADAS, TIPOS_SINTACTICOS, especificacion_re
+)
 
 
 class HighlightSyntax(QSyntaxHighlighter):
+    """
+    Resalta cada bloque recorriéndolo con AUTOMATA_LEXICO, el mismo autómata del
+    analizador léxico: se colorea exactamente lo que el léxico reconoce.
+    El estado del bloque es 1 si termina dentro de un comentario de bloque.
+    """
     
     def __init__(self, document):
         super().__init__(document)
-        self.highlightingRules = []
 
-        # Números enteros y reales
-        numberFormat = QTextCharFormat()
-        numberFormat.setForeground(QColor("#9c7692"))
-        numberPattern = QRegularExpression(r"\b\d+(\.\d+)?(?=\D|\b)")
-        self.highlightingRules.append((numberPattern, numberFormat))
-
-        # Identificadores (letras y dígitos que no empiezan por dígito o _)
-        identifierFormat = QTextCharFormat()
-        identifierFormat.setForeground(QColor("#da9f40"))
-        identifierPattern = QRegularExpression(r"[a-zA-Z][a-zA-Z0-9_]*")
-        self.highlightingRules.append((identifierPattern, identifierFormat))
+        def formato(color):
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            return fmt
 
+        # Números enteros y reales
+        numberFormat = formato("#9c7692")
+        # Identificadores
+        self.identifierFormat = formato("#da9f40")
         # Palabras Reservadas
-        keywordFormat = QTextCharFormat()
-        keywordFormat.setForeground(QColor("#7e8def"))
-        keywords = ["if", "else", "end", "do", "while", "for", "switch", "case", "break", 
-                    "int", "float", "string", "main", "cin", "cout", "def", "class", 
-                    "import", "from", "return", "then", "until", "real"]
-
-        for word in keywords:  
-            pattern = QRegularExpression(r"\b" + word + r"\b")
-            self.highlightingRules.append((pattern, keywordFormat))
-
-        #Operadores aritméticos
-        arithmeticFormat= QTextCharFormat()
-        arithmeticFormat.setForeground(QColor("#70a483"))
-        arithmeticPattern = QRegularExpression(r"(\+\+|\-\-|\+|\-|\*|\/|\%|\^)")
-        self.highlightingRules.append((arithmeticPattern, arithmeticFormat))
-
-        #Simbolo de igual
-        self.highlightingRules.append((QRegularExpression(r"=(?!=)"), QColor("#065710")))
-
-        #Operadores relacionales
-        relationalFormat = QTextCharFormat()
-        relationalFormat.setForeground(QColor("#bb776f"))
-        relationalPattern = QRegularExpression(r"(<=|>=|==|!=|<|>|\|\||&&|!(?!=))")
-        self.highlightingRules.append((relationalPattern, relationalFormat))
-
-        #Simbolos
-        self.highlightingRules.append((QRegularExpression(r"[\(\)\{\},;.]"), QColor("#0d6b4a")))
-
-         # Formato para comentarios de una línea (// ...)
-        singleLineCommentFormat = QTextCharFormat()
-        singleLineCommentFormat.setForeground(QColor("#a2a9a5"))
-        self.highlightingRules.append((QRegularExpression(r'//[^\n]*'), singleLineCommentFormat))
-        
-        # Define format for multiline comments
-        self.multiLineCommentFormat = QTextCharFormat()
-        self.multiLineCommentFormat.setForeground(QColor("#a2a9a5"))
-        
-        # Compile regular expressions
-        self.multiLineCommentStartExpression = QtRegex(r'/\*')
-        self.multiLineCommentEndExpression = QtRegex(r'\*/')
+        self.keywordFormat = formato("#7e8def")
+        #Operadores relacionales y lógicos
+        relationalFormat = formato("#bb776f")
+        # Comentarios de una y de varias líneas
+        self.multiLineCommentFormat = formato("#a2a9a5")
+
+        self.formatos = {
+            'NUMERO_ENTERO': numberFormat,
+            'NUMERO_REAL': numberFormat,
+            'OPERADOR_ARITMETICO': formato("#70a483"),
+            'OPERADOR_ASIGNACION': formato("#065710"),
+            'OPERADOR_RELACIONAL': relationalFormat,
+            'OPERADOR_LOGICO': relationalFormat,
+            'ESPECIAL': formato("#0d6b4a"),
+            'COMENTARIO_LINEA': self.multiLineCommentFormat,
+            'COMENTARIO_BLOQUE': self.multiLineCommentFormat,
+        }
         
     # highlightBlock override
     def highlightBlock(self, text):
-        # Apply single-line highlighting rules
-        for pattern, format in self.highlightingRules:
-            expression = QtRegex(pattern)
-            iterator = expression.globalMatch(text)
-            while iterator.hasNext():
-                match = iterator.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), format)
-        
-        # Handle multiline comments
-        self.setCurrentBlockState(0)
-        
-        startIndex = 0
-        if self.previousBlockState() != 1:
-            startMatch = self.multiLineCommentStartExpression.match(text)
-            if startMatch.hasMatch():
-                startIndex = startMatch.capturedStart()
+        automata = AUTOMATA_LEXICO
+        en_comentario = self.previousBlockState() == 1
+        abierto = False
+        for inicio, fin, clase, aceptado in automata.lexemas(text, en_comentario):
+            if clase == 'IDENTIFICADOR':
+                fmt = self.keywordFormat if text[inicio:fin] in PALABRAS_RESERVADAS else self.identifierFormat
             else:
-                startIndex = -1
-        
-        while startIndex >= 0:
-            endMatch = self.multiLineCommentEndExpression.match(text, startIndex)
-            if endMatch.hasMatch():
-                endIndex = endMatch.capturedEnd()
-                commentLength = endIndex - startIndex
-                self.setFormat(startIndex, commentLength, self.multiLineCommentFormat)
-                
-                # Busca el siguiente comentario multilinea
-                nextStartMatch = self.multiLineCommentStartExpression.match(text, endIndex)
-                startIndex = nextStartMatch.capturedStart() if nextStartMatch.hasMatch() else -1
-            else:
-                self.setFormat(startIndex, len(text) - startIndex, self.multiLineCommentFormat)
-                self.setCurrentBlockState(1)
-                startIndex = -1
+                fmt = self.formatos.get(clase)
+            if fmt is not None:
+                self.setFormat(inicio, fin - inicio, fmt)
+            abierto = automata.comentario_abierto(clase, aceptado)
+
+        if not text and en_comentario:
+            abierto = True
+        self.setCurrentBlockState(1 if abierto else 0)
+
 
 class Token:
+    # Un programa grande produce cientos de miles de tokens: sin __dict__ cada uno
+    # se crea más rápido y ocupa menos de la mitad
+    __slots__ = ('tipo', 'valor', 'linea', 'columna')
+
     def __init__(self, tipo, valor, linea, columna):
         self.tipo = tipo
         self.valor = valor
@@ -117,7 +101,25 @@ class Token:
         else:
             return f"{self.tipo}('{self.valor}') en línea {self.linea}, columna {self.columna}"
 
-def analizador_lexico(texto):
+def analizador_lexico(texto, motor="clasico"):
+    """
+    Analiza el texto y retorna la lista de tokens.
+    motor: "clasico" (recorrido carácter por carácter), "regex" (expresión maestra)
+    "offsets" (expresión maestra con posiciones por offset, ver TokensFuente)
+    "dfa" (tabla de transiciones de AUTOMATA_LEXICO) o "paralelo" (fragmentos de
+    líneas lexeados en varios procesos, ver analizador_lexico_paralelo)
+    """
+    if motor == "regex":
+        return analizador_lexico_regex(texto)
+    if motor == "offsets":
+        return analizador_lexico_offsets(texto)
+    if motor == "dfa":
+        return analizador_lexico_dfa(texto)
+    if motor == "paralelo":
+        return analizador_lexico_paralelo(texto)
+    if motor != "clasico":
+        raise ValueError(f"Motor léxico desconocido: {motor}")
+
     tokens = []
     i = 0
     linea = 1
@@ -182,9 +184,7 @@ def analizador_lexico(texto):
                 avanzar()
             valor = texto[inicio:i]
             
-            keywords = ["if", "else", "end", "do", "while", "for", "switch", "case", "break", "int", "float", "string", "main", "cin", "cout", "def", "class", "import", "from", "return", "then"]
-            
-            if valor in keywords: 
+            if valor in PALABRAS_RESERVADAS: 
                 tokens.append(Token('PALABRA_RESERVADA', valor, linea, inicio_col))
             else:
                 tokens.append(Token('IDENTIFICADOR', valor, linea, inicio_col))
@@ -300,6 +300,953 @@ def analizador_lexico(texto):
 
     return tokens
 
+
+# Motor léxico basado en una sola expresión regular maestra.
+# Los patrones salen de ESPECIFICACION_TOKENS (automata_lexico.py), la misma
+# especificación que usan el motor "dfa" y el resaltador.
+ESPECIFICACION_LEXICA = especificacion_re(ESPECIFICACION_TOKENS)
+
+# Clases que producen exactamente un token sin afectar el cálculo de columnas
+_TIPOS_SIMPLES = {
+    nombre: tipo for nombre, _, tipo in ESPECIFICACION_TOKENS
+    if tipo is not None and nombre not in ('IDENTIFICADOR', 'OPERADOR_ARITMETICO', 'OPERADOR_LOGICO')
+}
+
+_OPERADORES_ARITMETICOS = frozenset(['+', '-', '*', '/', '%', '^', '++', '--'])
+
+
+class PatronesLexicos:
+    """Expresión maestra y patrones por clase compilados a partir de una especificación"""
+
+    def __init__(self, especificacion):
+        self.especificacion = especificacion
+        # Cada coincidencia de la expresión maestra es (espacios previos, lexema).
+        # Los espacios y tabuladores se absorben como prefijo del siguiente lexema,
+        # así el recorrido no paga una iteración por cada bloque de espacios.
+        self.maestro = re.compile(
+            r'([ \t]*)(' + '|'.join(f'(?:{patron})' for _, patron in especificacion) + ')'
+        )
+        self.clases = [(nombre, re.compile(patron)) for nombre, patron in especificacion]
+
+    def clasificar(self, lexema):
+        """Retorna la primera clase de la especificación que reconoce el lexema completo"""
+        for nombre, patron in self.clases:
+            if patron.fullmatch(lexema):
+                return nombre
+        return 'ERROR'
+
+
+PATRONES_LEXICOS = PatronesLexicos(ESPECIFICACION_LEXICA)
+PATRON_LEXICO = PATRONES_LEXICOS.maestro
+
+# Caracteres fuera de ASCII; se usan para detectar caracteres numéricos no decimales
+# (², ½, Ⅻ...) en los que str.isdigit/str.isalpha y las clases \d/\w de re no coinciden.
+_PATRON_NO_ASCII = re.compile(r'[^\x00-\x7f]')
+_patrones_exactos = None
+
+
+def _tiene_digitos_exoticos(texto):
+    """Indica si el texto contiene caracteres numéricos no decimales"""
+    if texto.isascii():
+        return False
+    return any(c.isnumeric() and not c.isdecimal() for c in set(_PATRON_NO_ASCII.findall(texto)))
+
+
+def patrones_exactos():
+    """
+    Variante de la especificación que replica exactamente str.isalpha/str.isdigit
+    para los caracteres numéricos no decimales. Se construye una sola vez y solo
+    cuando el texto los contiene.
+    """
+    global _patrones_exactos
+    if _patrones_exactos is None:
+        no_alfabeticos = []
+        digitos = []
+        for codigo in range(0x80, sys.maxunicode + 1):
+            c = chr(codigo)
+            if c.isnumeric() and not c.isdecimal():
+                no_alfabeticos.append(c)
+                if c.isdigit():
+                    digitos.append(c)
+        no_alfa = re.escape(''.join(no_alfabeticos))
+        digito = r'[\d' + re.escape(''.join(digitos)) + ']'
+        reemplazos = {
+            'IDENTIFICADOR': rf'(?![{no_alfa}])[^\W\d_]\w*',
+            'NUMERO_REAL': rf'{digito}+\.{digito}+',
+            'NUMERO_INCOMPLETO': rf'{digito}+\.',
+            'NUMERO_ENTERO': rf'{digito}+',
+        }
+        _patrones_exactos = PatronesLexicos(
+            [(nombre, reemplazos.get(nombre, patron)) for nombre, patron in ESPECIFICACION_LEXICA]
+        )
+    return _patrones_exactos
+
+
+class EstadoLexico:
+    """Estado del motor regex: posición actual, patrones en uso y caché de lexemas"""
+
+    def __init__(self, patrones=None):
+        self.patrones = patrones or PATRONES_LEXICOS
+        self.linea = 1
+        self.columna = 1
+        # Caché lexema -> tipo para los tokens simples (identificadores, números, símbolos)
+        self.simples = {}
+        # Comentario abierto al final de un bloque de lectura ('linea' o 'bloque')
+        self.comentario = None
+        self.asterisco = False
+
+    def usar_patrones_exactos(self):
+        """Cambia a patrones_exactos() para el resto del texto"""
+        if self.patrones is not _patrones_exactos:
+            self.patrones = patrones_exactos()
+
+    def avanzar_texto(self, texto):
+        """Avanza línea y columna sobre texto que no produce tokens (comentarios)"""
+        saltos = texto.count('\n')
+        if saltos:
+            self.linea += saltos
+            self.columna = len(texto) - texto.rfind('\n')
+        else:
+            self.columna += len(texto)
+
+    def iniciar_comentario(self, lexema):
+        """Registra un comentario que llegó sin cerrar al final de un bloque de lectura"""
+        if lexema.startswith('//'):
+            self.comentario = 'linea'
+        else:
+            self.comentario = 'bloque'
+            # El '*' de la apertura no cuenta para el cierre
+            self.asterisco = len(lexema) > 2 and lexema.endswith('*')
+        self.avanzar_texto(lexema)
+
+    def continuar_comentario(self, bloque):
+        """
+        Consume la parte del bloque que pertenece al comentario abierto y retorna
+        el resto. Si el comentario sigue abierto retorna ''.
+        """
+        if self.comentario == 'linea':
+            salto = bloque.find('\n')
+            if salto < 0:
+                return ''
+            self.comentario = None
+            return bloque[salto:]
+
+        if self.asterisco and bloque.startswith('/'):
+            cierre = 1
+        else:
+            cierre = bloque.find('*/')
+            if cierre < 0:
+                self.avanzar_texto(bloque)
+                self.asterisco = bloque.endswith('*')
+                return ''
+            cierre += 2
+        self.avanzar_texto(bloque[:cierre])
+        self.comentario = None
+        self.asterisco = False
+        return bloque[cierre:]
+
+    def escanear(self, pares, agregar):
+        """Convierte los pares (espacios, lexema) en tokens y los pasa a agregar"""
+        buscar_simple = self.simples.get
+        simples = self.simples
+        clasificar = self.patrones.clasificar
+        longitud = len
+        token = Token
+        linea = self.linea
+        columna = self.columna
+
+        for espacio, lexema in pares:
+            tipo = buscar_simple(lexema)
+            if tipo is not None:
+                if espacio:
+                    columna += longitud(espacio)
+                agregar(token(tipo, lexema, linea, columna))
+                columna += longitud(lexema)
+                continue
+
+            if lexema == '\n':
+                linea += 1
+                columna = 1
+                continue
+
+            columna += len(espacio)
+            if lexema in _OPERADORES_ARITMETICOS:
+                agregar(Token('OPERADOR_ARITMETICO', lexema, linea, columna))
+                # El motor clásico avanza la columna un lugar de más por cada
+                # carácter del operador aritmético; se replica para conservar posiciones.
+                columna += 2 * len(lexema)
+                continue
+
+            clase = clasificar(lexema)
+
+            if clase == 'IDENTIFICADOR':
+                tipo = 'PALABRA_RESERVADA' if lexema in PALABRAS_RESERVADAS else 'IDENTIFICADOR'
+                simples[lexema] = tipo
+                agregar(Token(tipo, lexema, linea, columna))
+                columna += len(lexema)
+            elif clase in _TIPOS_SIMPLES:
+                tipo = _TIPOS_SIMPLES[clase]
+                simples[lexema] = tipo
+                agregar(Token(tipo, lexema, linea, columna))
+                columna += len(lexema)
+            elif clase == 'OPERADOR_LOGICO':
+                # Secuencias de '&' o '|': un token por pareja y el sobrante como especial
+                cantidad = len(lexema)
+                if cantidad >= 2:
+                    operador = lexema[0] * 2
+                    for _ in range(cantidad // 2):
+                        agregar(Token('OPERADOR_LOGICO', operador, linea, columna))
+                    if cantidad % 2 != 0:
+                        agregar(Token('ESPECIAL', lexema[0], linea, columna))
+                columna += cantidad
+            elif clase == 'COMENTARIO_BLOQUE':
+                saltos = lexema.count('\n')
+                if saltos:
+                    linea += saltos
+                    columna = len(lexema) - lexema.rfind('\n')
+                else:
+                    columna += len(lexema)
+            else:
+                # COMENTARIO_LINEA: se descarta
+                columna += len(lexema)
+
+        self.linea = linea
+        self.columna = columna
+
+
+def _comentario_abierto(lexema):
+    """True si el lexema es un comentario de bloque que llegó al final del texto sin cerrar"""
+    return lexema.startswith('/*') and not (len(lexema) >= 4 and lexema.endswith('*/'))
+
+
+class _SinRecolector:
+    """
+    Desactiva el recolector de basura mientras se construyen tokens. Los tokens solo
+    contienen cadenas y enteros (sin ciclos): el recolector no tiene nada que liberar
+    y recorrerlos en cada generación es puro costo.
+    """
+
+    def __enter__(self):
+        self.activo = gc.isenabled()
+        gc.disable()
+
+    def __exit__(self, *args):
+        if self.activo:
+            gc.enable()
+
+
+def analizador_lexico_regex(texto):
+    """
+    Motor léxico de una sola pasada sobre PATRON_LEXICO.
+    Produce exactamente los mismos tokens (incluyendo ERROR, líneas y columnas)
+    que el motor clásico.
+    """
+    estado = EstadoLexico()
+    if _tiene_digitos_exoticos(texto):
+        estado.usar_patrones_exactos()
+
+    tokens = []
+    with _SinRecolector():
+        estado.escanear(estado.patrones.maestro.findall(texto), tokens.append)
+    return tokens
+
+
+def analizador_lexico_dfa(texto):
+    """
+    Motor que recorre el texto con la tabla de AUTOMATA_LEXICO: una consulta de
+    tabla por carácter. Clasifica los caracteres con str.isalpha/isdigit, así que
+    no necesita la variante de patrones_exactos.
+    """
+    estado = EstadoLexico(AUTOMATA_LEXICO)
+    tokens = []
+    with _SinRecolector():
+        estado.escanear(AUTOMATA_LEXICO.findall(texto), tokens.append)
+    return tokens
+
+
+# Por debajo de este tamaño el costo de repartir el texto entre procesos supera
+# lo que se gana: el motor "paralelo" lexea en el proceso actual.
+TAMANO_MINIMO_PARALELO = 4 * 1024 * 1024
+
+
+def _lexear_fragmento(fragmento, en_comentario=False):
+    """
+    Lexea un fragmento que empieza al inicio de una línea, con líneas contadas desde 1.
+    Retorna los tokens como (tipo, valor, linea, columna) y si el fragmento termina
+    dentro de un comentario de bloque. Se ejecuta en los procesos de
+    analizador_lexico_paralelo: las tuplas se serializan más rápido que los Token.
+    """
+    estado = EstadoLexico()
+    if en_comentario:
+        estado.comentario = 'bloque'
+        fragmento = estado.continuar_comentario(fragmento)
+        if estado.comentario is not None:
+            return [], True
+
+    if _tiene_digitos_exoticos(fragmento):
+        estado.usar_patrones_exactos()
+
+    pares = estado.patrones.maestro.findall(fragmento)
+    tokens = []
+    with _SinRecolector():
+        estado.escanear(pares, tokens.append)
+        tuplas = [(t.tipo, t.valor, t.linea, t.columna) for t in tokens]
+    return tuplas, bool(pares) and _comentario_abierto(pares[-1][1])
+
+
+def _dividir_en_lineas(texto, partes):
+    """Divide el texto en unas `partes` porciones que terminan justo después de un salto de línea"""
+    paso = max(len(texto) // partes, 1)
+    fragmentos = []
+    inicio = 0
+    while inicio < len(texto):
+        salto = texto.find('\n', inicio + paso - 1)
+        fin = len(texto) if salto < 0 else salto + 1
+        fragmentos.append(texto[inicio:fin])
+        inicio = fin
+    return fragmentos
+
+
+def analizador_lexico_paralelo(texto, procesos=None):
+    """
+    Lexea el texto repartido en fragmentos de líneas completas entre varios procesos.
+    Cada fragmento se lexea suponiendo que no empieza dentro de un comentario; al
+    unirlos, los fragmentos que sí empezaban dentro de un comentario de bloque se
+    relexean con ese estado de entrada y las líneas se desplazan según los saltos
+    de los fragmentos anteriores. El resultado es idéntico al del motor clásico.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(texto) < TAMANO_MINIMO_PARALELO:
+        return analizador_lexico_regex(texto)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Varios fragmentos por proceso para repartir mejor la carga
+    fragmentos = _dividir_en_lineas(texto, procesos * 4)
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        resultados = list(ejecutor.map(_lexear_fragmento, fragmentos))
+
+    tokens = []
+    desplazamiento = 0
+    en_comentario = False
+    with _SinRecolector():
+        for fragmento, (tuplas, termina_en_comentario) in zip(fragmentos, resultados):
+            if en_comentario:
+                tuplas, termina_en_comentario = _lexear_fragmento(fragmento, True)
+            for tipo, valor, linea, columna in tuplas:
+                tokens.append(Token(tipo, valor, linea + desplazamiento, columna))
+            desplazamiento += fragmento.count('\n')
+            en_comentario = termina_en_comentario
+    return tokens
+
+
+TAMANO_BLOQUE_LECTURA = 64 * 1024
+
+
+def iter_tokens(stream, tamano_bloque=TAMANO_BLOQUE_LECTURA):
+    """
+    Generador de tokens sobre cualquier flujo de texto (archivo, StringIO, ...).
+    Lee bloques de tamano_bloque caracteres y entrega los tokens a medida que se
+    reconocen; produce la misma secuencia que analizador_lexico. La memoria usada
+    depende del tamaño de bloque y del lexema más largo, no del tamaño del archivo:
+    los comentarios que cruzan bloques se descartan sin acumularse.
+    """
+    estado = EstadoLexico()
+    pendiente = ''  # lexema que llegó al final del bloque y podría continuar
+
+    while True:
+        bloque = stream.read(tamano_bloque)
+        fin = not bloque
+
+        if bloque and _tiene_digitos_exoticos(bloque):
+            estado.usar_patrones_exactos()
+
+        if estado.comentario is not None:
+            bloque = estado.continuar_comentario(bloque)
+            if estado.comentario is not None:
+                if fin:
+                    return
+                continue
+
+        texto = pendiente + bloque
+        pendiente = ''
+        pares = estado.patrones.maestro.findall(texto)
+        espacios_finales = 0
+        ultimo = None
+
+        if not fin:
+            consumido = 0
+            for espacio, lexema in pares:
+                consumido += len(espacio) + len(lexema)
+            if consumido < len(texto):
+                # Solo quedan espacios o tabuladores al final del bloque
+                espacios_finales = len(texto) - consumido
+            elif pares:
+                # El último lexema llega al final del bloque y podría continuar
+                ultimo = pares.pop()
+
+        tokens = []
+        with _SinRecolector():
+            estado.escanear(pares, tokens.append)
+        yield from tokens
+
+        if fin:
+            return
+
+        estado.columna += espacios_finales
+        if ultimo is not None:
+            espacio, lexema = ultimo
+            estado.columna += len(espacio)
+            if lexema.startswith('//') or _comentario_abierto(lexema):
+                estado.iniciar_comentario(lexema)
+            else:
+                pendiente = lexema
+
+
+# Modo sin interfaz para archivos muy grandes: el archivo se mapea en memoria y la
+# expresión maestra recorre los bytes directamente, sin decodificar el texto.
+# Cada clase es un grupo con nombre para saber cuál reconoció el lexema sin copiarlo.
+PATRON_LEXICO_BYTES = re.compile(
+    rb'([ \t]*)(?:'
+    + b'|'.join(f'(?P<{nombre}>{patron})'.encode('latin-1') for nombre, patron in ESPECIFICACION_LEXICA)
+    + b')'
+)
+_PALABRAS_RESERVADAS_BYTES = frozenset(palabra.encode('ascii') for palabra in PALABRAS_RESERVADAS)
+_PATRON_NO_ASCII_BYTES = re.compile(rb'[\x80-\xff]')
+
+# Cada cuántos bytes recorridos se devuelven al sistema las páginas ya leídas
+TAMANO_VENTANA_MMAP = 16 * 1024 * 1024
+
+
+class TokenMapeado:
+    """
+    Token del modo mmap: guarda el rango de bytes del lexema y lo decodifica
+    solo cuando se pide valor.
+    """
+    __slots__ = ('tipo', 'linea', 'columna', 'fuente', 'inicio', 'fin')
+
+    def __init__(self, tipo, fuente, inicio, fin, linea, columna):
+        self.tipo = tipo
+        self.fuente = fuente
+        self.inicio = inicio
+        self.fin = fin
+        self.linea = linea
+        self.columna = columna
+
+    @property
+    def valor(self):
+        return str(self.fuente[self.inicio:self.fin], 'ascii')
+
+    def __repr__(self):
+        return f"{self.tipo}('{self.valor}') en línea {self.linea}, columna {self.columna}"
+
+
+def _liberar_paginas(mapa, hasta):
+    """Descarta del mapeo las páginas anteriores a hasta (se releen del archivo si hacen falta)"""
+    hasta = min(hasta, len(mapa))
+    hasta -= hasta % mmap.PAGESIZE
+    if hasta > 0 and hasattr(mapa, 'madvise'):
+        mapa.madvise(mmap.MADV_DONTNEED, 0, hasta)
+
+
+def _contiene_no_ascii(mapa):
+    """Busca bytes no ASCII por ventanas, liberando cada ventana ya revisada"""
+    for inicio in range(0, len(mapa), TAMANO_VENTANA_MMAP):
+        if _PATRON_NO_ASCII_BYTES.search(mapa, inicio, inicio + TAMANO_VENTANA_MMAP):
+            return True
+        _liberar_paginas(mapa, inicio + TAMANO_VENTANA_MMAP)
+    return False
+
+
+def iter_tokens_mmap(ruta):
+    """
+    Generador de tokens de un archivo mapeado en memoria. Los lexemas se buscan
+    sobre un memoryview de los bytes del archivo y se entregan como TokenMapeado
+    (valor perezoso); las páginas ya recorridas se liberan cada
+    TAMANO_VENTANA_MMAP bytes, así la memoria residente no crece con el archivo.
+    Produce la misma secuencia que analizador_lexico. Si el archivo no es ASCII
+    se lee como texto UTF-8 con iter_tokens, que también usa memoria acotada.
+    """
+    with open(ruta, 'rb') as archivo:
+        if os.fstat(archivo.fileno()).st_size == 0:
+            return
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if _contiene_no_ascii(mapa):
+        mapa.close()
+        with open(ruta, 'r', encoding='utf-8', newline='') as archivo:
+            yield from iter_tokens(archivo)
+        return
+
+    # Los tokens conservan el memoryview: el mapeo se cierra cuando ya nadie lo usa
+    yield from _escanear_bytes(mapa, memoryview(mapa))
+
+
+def _escanear_bytes(mapa, fuente):
+    """Recorrido de iter_tokens_mmap; replica las columnas de EstadoLexico.escanear"""
+    linea = 1
+    columna = 1
+    siguiente_liberacion = TAMANO_VENTANA_MMAP
+    especiales = _TIPOS_SIMPLES
+
+    for coincidencia in PATRON_LEXICO_BYTES.finditer(fuente):
+        clase = coincidencia.lastgroup
+        inicio, fin = coincidencia.span(clase)
+        columna += inicio - coincidencia.start()
+
+        if clase == 'SALTO_LINEA':
+            linea += 1
+            columna = 1
+            if fin >= siguiente_liberacion:
+                _liberar_paginas(mapa, fin)
+                siguiente_liberacion = fin + TAMANO_VENTANA_MMAP
+            continue
+
+        if clase == 'IDENTIFICADOR':
+            tipo = 'PALABRA_RESERVADA' if fuente[inicio:fin] in _PALABRAS_RESERVADAS_BYTES else 'IDENTIFICADOR'
+            yield TokenMapeado(tipo, fuente, inicio, fin, linea, columna)
+            columna += fin - inicio
+        elif clase in especiales:
+            yield TokenMapeado(especiales[clase], fuente, inicio, fin, linea, columna)
+            columna += fin - inicio
+        elif clase == 'OPERADOR_ARITMETICO':
+            yield TokenMapeado('OPERADOR_ARITMETICO', fuente, inicio, fin, linea, columna)
+            # Mismo desfase de columna que el motor clásico
+            columna += 2 * (fin - inicio)
+        elif clase == 'OPERADOR_LOGICO':
+            cantidad = fin - inicio
+            if cantidad >= 2:
+                for _ in range(cantidad // 2):
+                    yield TokenMapeado('OPERADOR_LOGICO', fuente, inicio, inicio + 2, linea, columna)
+                if cantidad % 2 != 0:
+                    yield TokenMapeado('ESPECIAL', fuente, inicio, inicio + 1, linea, columna)
+            columna += cantidad
+        elif clase == 'COMENTARIO_BLOQUE':
+            ultimo_salto = mapa.rfind(b'\n', inicio, fin)
+            if ultimo_salto >= 0:
+                salto = mapa.find(b'\n', inicio, fin)
+                while salto >= 0:
+                    linea += 1
+                    salto = mapa.find(b'\n', salto + 1, fin)
+                columna = fin - ultimo_salto
+            else:
+                columna += fin - inicio
+        else:
+            # COMENTARIO_LINEA: se descarta
+            columna += fin - inicio
+
+
+class LexerIncremental:
+    """
+    Lexer incremental por líneas para el editor. Guarda por cada línea su texto,
+    sus tokens como (tipo, valor, columna) y si empieza dentro de un comentario
+    de bloque. Al editar se relexean solo las líneas tocadas y se sigue con las
+    siguientes únicamente mientras cambie el estado con el que termina cada una.
+    """
+
+    def __init__(self, texto=""):
+        self.estado = EstadoLexico()
+        self.reiniciar(texto)
+
+    def reiniciar(self, texto):
+        """Lexea el documento completo desde cero"""
+        self.textos = texto.split('\n')
+        self.tokens_linea = []
+        self.entrada = []  # True si la línea empieza dentro de un comentario de bloque
+        en_comentario = False
+        with _SinRecolector():
+            for linea in self.textos:
+                self.entrada.append(en_comentario)
+                tokens, en_comentario = self._lexear_linea(linea, en_comentario)
+                self.tokens_linea.append(tokens)
+        self.salida_final = en_comentario
+
+    def _lexear_linea(self, linea, en_comentario):
+        """Retorna los tokens de una línea y si termina dentro de un comentario de bloque"""
+        estado = self.estado
+        estado.linea = 1
+        estado.columna = 1
+        if en_comentario:
+            estado.comentario = 'bloque'
+            estado.asterisco = False
+            linea = estado.continuar_comentario(linea)
+            if estado.comentario is not None:
+                estado.comentario = None
+                return [], True
+
+        if _tiene_digitos_exoticos(linea):
+            estado.usar_patrones_exactos()
+
+        pares = estado.patrones.maestro.findall(linea)
+        tokens = []
+        estado.escanear(pares, tokens.append)
+
+        termina_en_comentario = bool(pares) and _comentario_abierto(pares[-1][1])
+        return [(t.tipo, t.valor, t.columna) for t in tokens], termina_en_comentario
+
+    def reemplazar_lineas(self, inicio, cantidad, nuevas):
+        """
+        Sustituye `cantidad` líneas a partir de `inicio` (base 0) por las líneas de
+        texto `nuevas` y relexea lo necesario. Retorna cuántas líneas se relexearon.
+        """
+        # El estado de entrada de la primera línea depende solo de las anteriores
+        en_comentario = self.entrada[inicio] if inicio < len(self.entrada) else self.salida_final
+
+        fin = inicio + cantidad
+        self.textos[inicio:fin] = nuevas
+        self.tokens_linea[inicio:fin] = [None] * len(nuevas)
+        self.entrada[inicio:fin] = [False] * len(nuevas)
+
+        total = len(self.textos)
+        indice = inicio
+        ultima_editada = inicio + len(nuevas)
+        relexeadas = 0
+        with _SinRecolector():
+            while indice < total:
+                if indice >= ultima_editada and self.entrada[indice] == en_comentario:
+                    # Desde aquí el estado coincide con el guardado: nada más cambia
+                    break
+                self.entrada[indice] = en_comentario
+                self.tokens_linea[indice], en_comentario = self._lexear_linea(self.textos[indice], en_comentario)
+                indice += 1
+                relexeadas += 1
+        if indice >= total:
+            self.salida_final = en_comentario
+        return relexeadas
+
+    def tokens(self):
+        """Lista completa de tokens del documento con sus líneas actuales"""
+        tokens = []
+        agregar = tokens.append
+        with _SinRecolector():
+            for numero, linea in enumerate(self.tokens_linea, 1):
+                for tipo, valor, columna in linea:
+                    agregar(Token(tipo, valor, numero, columna))
+        return tokens
+
+
+TIPOS_TOKEN = (
+    'PALABRA_RESERVADA', 'IDENTIFICADOR', 'NUMERO_ENTERO', 'NUMERO_REAL', 'NUMERO_DECIMAL',
+    'OPERADOR_ARITMETICO', 'OPERADOR_RELACIONAL', 'OPERADOR_LOGICO', 'OPERADOR_ASIGNACION',
+    'ESPECIAL', 'ERROR'
+)
+
+
+class VistaToken:
+    """Token ligero que entrega TokenBuffer; se usa igual que Token"""
+    __slots__ = ('tipo', 'valor', 'linea', 'columna', 'simbolo')
+
+    def __init__(self, tipo, valor, linea, columna, simbolo=None):
+        self.tipo = tipo
+        self.valor = valor
+        self.linea = linea
+        self.columna = columna
+        self.simbolo = simbolo  # id del valor en el internador del TokenBuffer
+
+    def __repr__(self):
+        return f"{self.tipo}('{self.valor}') en línea {self.linea}, columna {self.columna}"
+
+
+class TokenBuffer:
+    """
+    Secuencia compacta de tokens guardada por columnas: el tipo como código en
+    array('B'), línea y columna en array('I') y el valor como su id en el
+    internador que tomó de NOMBRES al crearse (se interna al lexear). Se indexa
+    como una lista y cada acceso entrega una VistaToken, así que
+    AnalizadorSintactico lo consume sin cambios.
+    """
+
+    def __init__(self, tokens=(), internador=None):
+        self.tipos = list(TIPOS_TOKEN)
+        self.codigo_tipo = {tipo: codigo for codigo, tipo in enumerate(self.tipos)}
+        self.internador = internador or NOMBRES.tabla()
+        self.valores = self.internador.nombres
+        self.indice_valor = self.internador.ids
+        self.codigos = array('B')
+        self.lineas = array('I')
+        self.columnas = array('I')
+        self.indices_valor = array('I')
+        self._ultima_vista = None
+        self._ultimo_indice = -1
+        for token in tokens:
+            self.agregar(token.tipo, token.valor, token.linea, token.columna)
+
+    def agregar(self, tipo, valor, linea, columna):
+        codigo, indice = self.codificar(tipo, valor)
+        self.codigos.append(codigo)
+        self.indices_valor.append(indice)
+        self.lineas.append(linea)
+        self.columnas.append(columna)
+
+    def codificar(self, tipo, valor):
+        """Código del tipo e índice del valor internado (se registran si son nuevos)"""
+        codigo = self.codigo_tipo.get(tipo)
+        if codigo is None:
+            codigo = len(self.tipos)
+            self.tipos.append(tipo)
+            self.codigo_tipo[tipo] = codigo
+
+        indice = self.indice_valor.get(valor)
+        if indice is None:
+            indice = self.internador.id(valor)
+        return codigo, indice
+
+    def empalmar(self, inicio, fin, tokens, lineas=0):
+        """
+        Nuevo TokenBuffer con los tokens [inicio, fin) reemplazados por tokens y la
+        línea de los posteriores desplazada en `lineas`. Lo demás se copia por arrays
+        y comparte el internador, salvo que este pase de NOMBRES.maximo: entonces se
+        vuelve a internar todo en la tabla vigente, para que una sesión de edición
+        larga no lo haga crecer sin límite.
+        """
+        if len(self.internador) > NOMBRES.maximo:
+            return TokenBuffer(self, NOMBRES.tabla()).empalmar(inicio, fin, tokens, lineas)
+        nuevo = TokenBuffer(internador=self.internador)
+        nuevo.tipos = list(self.tipos)
+        nuevo.codigo_tipo = dict(self.codigo_tipo)
+        nuevo.codigos = self.codigos[:inicio]
+        nuevo.indices_valor = self.indices_valor[:inicio]
+        nuevo.lineas = self.lineas[:inicio]
+        nuevo.columnas = self.columnas[:inicio]
+        for token in tokens:
+            nuevo.agregar(token.tipo, token.valor, token.linea, token.columna)
+        nuevo.codigos += self.codigos[fin:]
+        nuevo.indices_valor += self.indices_valor[fin:]
+        nuevo.columnas += self.columnas[fin:]
+        if lineas:
+            nuevo.lineas += array('I', [linea + lineas for linea in self.lineas[fin:]])
+        else:
+            nuevo.lineas += self.lineas[fin:]
+        return nuevo
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __getitem__(self, indice):
+        if indice == self._ultimo_indice:
+            return self._ultima_vista
+        if indice < 0:
+            indice += len(self.codigos)
+        simbolo = self.indices_valor[indice]
+        vista = VistaToken(
+            self.tipos[self.codigos[indice]],
+            self.valores[simbolo],
+            self.lineas[indice],
+            self.columnas[indice],
+            simbolo,
+        )
+        # El parser pide el mismo token varias veces seguidas
+        self._ultimo_indice = indice
+        self._ultima_vista = vista
+        return vista
+
+    def __iter__(self):
+        for indice in range(len(self.codigos)):
+            yield self[indice]
+
+
+def analizador_lexico_buffer(stream, tamano_bloque=TAMANO_BLOQUE_LECTURA):
+    """Lexea un flujo de texto directo a un TokenBuffer sin conservar objetos Token"""
+    return TokenBuffer(iter_tokens(stream, tamano_bloque))
+
+
+class IndiceLineas:
+    """
+    Offsets donde empieza cada línea de un texto. Convierte offset <-> (línea,
+    columna) con búsqueda binaria; líneas y columnas empiezan en 1.
+    """
+
+    def __init__(self, texto):
+        self.inicios = array('I', [0])
+        salto = texto.find('\n')
+        while salto >= 0:
+            self.inicios.append(salto + 1)
+            salto = texto.find('\n', salto + 1)
+
+    def linea_columna(self, offset):
+        linea = bisect_right(self.inicios, offset)
+        return linea, offset - self.inicios[linea - 1] + 1
+
+    def offset(self, linea, columna):
+        return self.inicios[linea - 1] + columna - 1
+
+
+class VistaTokenFuente:
+    """Token de TokensFuente: la línea y la columna se calculan solo si se piden"""
+    __slots__ = ('tipo', 'valor', 'offset', 'tokens', 'simbolo')
+
+    def __init__(self, tipo, valor, offset, tokens, simbolo=None):
+        self.tipo = tipo
+        self.valor = valor
+        self.offset = offset
+        self.tokens = tokens
+        self.simbolo = simbolo
+
+    @property
+    def linea(self):
+        return self.tokens.linea_columna(self.offset)[0]
+
+    @property
+    def columna(self):
+        return self.tokens.linea_columna(self.offset)[1]
+
+    def __repr__(self):
+        linea, columna = self.tokens.linea_columna(self.offset)
+        return f"{self.tipo}('{self.valor}') en línea {linea}, columna {columna}"
+
+
+class TokensFuente(TokenBuffer):
+    """
+    TokenBuffer que guarda solo el offset de inicio de cada token (la longitud es
+    la del valor). Línea y columna salen del IndiceLineas del texto fuente.
+    Para que las columnas coincidan con las del motor clásico, que avanza un lugar
+    de más por cada carácter de un operador aritmético, se registran esos
+    operadores y se suma su desfase dentro de la misma línea.
+    """
+
+    def __init__(self, indice_lineas):
+        super().__init__()
+        del self.lineas, self.columnas
+        self.indice_lineas = indice_lineas
+        self.offsets = array('I')
+        self.offsets_desfase = array('I')
+        self.desfase_acumulado = array('I', [0])
+
+    def agregar(self, tipo, valor, linea, columna):
+        raise TypeError("TokensFuente guarda offsets: se agrega con agregar_en_offset")
+
+    def agregar_en_offset(self, tipo, valor, offset):
+        codigo, indice = self.codificar(tipo, valor)
+        self.codigos.append(codigo)
+        self.indices_valor.append(indice)
+        self.offsets.append(offset)
+
+    def agregar_desfase(self, offset, cantidad):
+        self.offsets_desfase.append(offset)
+        self.desfase_acumulado.append(self.desfase_acumulado[-1] + cantidad)
+
+    def linea_columna(self, offset):
+        """Línea y columna (como las reporta el motor clásico) de un offset"""
+        linea, columna = self.indice_lineas.linea_columna(offset)
+        if len(self.offsets_desfase):
+            inicio = self.indice_lineas.inicios[linea - 1]
+            columna += (self.desfase_acumulado[bisect_left(self.offsets_desfase, offset)]
+                        - self.desfase_acumulado[bisect_left(self.offsets_desfase, inicio)])
+        return linea, columna
+
+    def a_token_buffer(self):
+        """TokenBuffer con línea y columna explícitas que comparte el internador"""
+        buffer = TokenBuffer(internador=self.internador)
+        buffer.tipos = list(self.tipos)
+        buffer.codigo_tipo = dict(self.codigo_tipo)
+        buffer.codigos = array('B', self.codigos)
+        buffer.indices_valor = array('I', self.indices_valor)
+        for offset in self.offsets:
+            linea, columna = self.linea_columna(offset)
+            buffer.lineas.append(linea)
+            buffer.columnas.append(columna)
+        return buffer
+
+    def empalmar(self, inicio, fin, tokens, lineas=0):
+        """
+        Los offsets solo valen para el texto lexeado, no para el editado: se empalma
+        sobre el TokenBuffer equivalente (ver TokenBuffer.empalmar)
+        """
+        return self.a_token_buffer().empalmar(inicio, fin, tokens, lineas)
+
+    def indice_en_offset(self, offset):
+        """Índice del último token que empieza en o antes de offset (-1 si no hay)"""
+        return bisect_right(self.offsets, offset) - 1
+
+    def __getitem__(self, indice):
+        if indice == self._ultimo_indice:
+            return self._ultima_vista
+        if indice < 0:
+            indice += len(self.codigos)
+        simbolo = self.indices_valor[indice]
+        vista = VistaTokenFuente(
+            self.tipos[self.codigos[indice]],
+            self.valores[simbolo],
+            self.offsets[indice],
+            self,
+            simbolo,
+        )
+        self._ultimo_indice = indice
+        self._ultima_vista = vista
+        return vista
+
+
+def analizador_lexico_offsets(texto):
+    """
+    Motor de expresión maestra que solo lleva la cuenta del offset: no actualiza
+    línea ni columna por token. Retorna un TokensFuente con las mismas
+    posiciones que el motor clásico.
+    """
+    tokens = TokensFuente(IndiceLineas(texto))
+    patrones = patrones_exactos() if _tiene_digitos_exoticos(texto) else PATRONES_LEXICOS
+    clasificar = patrones.clasificar
+    codificar = tokens.codificar
+    agregar = tokens.agregar_en_offset
+    agregar_codigo = tokens.codigos.append
+    agregar_indice = tokens.indices_valor.append
+    agregar_offset = tokens.offsets.append
+    agregar_desfase = tokens.agregar_desfase
+    # lexema -> (código de tipo, índice de valor, desfase de columna)
+    simples = {}
+    buscar_simple = simples.get
+    longitud = len
+    offset = 0
+
+    with _SinRecolector():
+        for espacio, lexema in patrones.maestro.findall(texto):
+            if espacio:
+                offset += longitud(espacio)
+            codificado = buscar_simple(lexema)
+            if codificado is not None:
+                codigo, indice, desfase = codificado
+                agregar_codigo(codigo)
+                agregar_indice(indice)
+                agregar_offset(offset)
+                if desfase:
+                    agregar_desfase(offset, desfase)
+                offset += longitud(lexema)
+                continue
+
+            if lexema == '\n':
+                offset += 1
+                continue
+
+            if lexema in _OPERADORES_ARITMETICOS:
+                # Desfase del motor clásico: un lugar de más por carácter del operador
+                simples[lexema] = codificar('OPERADOR_ARITMETICO', lexema) + (len(lexema),)
+                agregar('OPERADOR_ARITMETICO', lexema, offset)
+                agregar_desfase(offset, len(lexema))
+                offset += len(lexema)
+                continue
+
+            clase = clasificar(lexema)
+            if clase == 'IDENTIFICADOR':
+                tipo = 'PALABRA_RESERVADA' if lexema in PALABRAS_RESERVADAS else 'IDENTIFICADOR'
+                simples[lexema] = codificar(tipo, lexema) + (0,)
+                agregar(tipo, lexema, offset)
+            elif clase in _TIPOS_SIMPLES:
+                tipo = _TIPOS_SIMPLES[clase]
+                simples[lexema] = codificar(tipo, lexema) + (0,)
+                agregar(tipo, lexema, offset)
+            elif clase == 'OPERADOR_LOGICO':
+                # Secuencias de '&' o '|': un token por pareja y el sobrante como especial
+                cantidad = len(lexema)
+                if cantidad >= 2:
+                    operador = lexema[0] * 2
+                    for _ in range(cantidad // 2):
+                        agregar('OPERADOR_LOGICO', operador, offset)
+                    if cantidad % 2 != 0:
+                        agregar('ESPECIAL', lexema[0], offset)
+            # Los comentarios no producen tokens
+            offset += len(lexema)
+
+    return tokens
+
 ########################################A PARTIR DE ESTO ES LO NUEVO QUE SE AGREGO#######################
 class ErrorSintactico:
     def __init__(self, mensaje, linea, columna):
@@ -310,6 +1257,21 @@ class ErrorSintactico:
     def __str__(self):
         return f"Error: {self.mensaje} en línea {self.linea}, columna {self.columna}"
 
+class AnidamientoExcesivo(Exception):
+    """El programa supera la profundidad máxima de anidamiento del analizador"""
+    def __init__(self, maximo, linea, columna):
+        super().__init__(f"Anidamiento demasiado profundo: se superó el máximo de {maximo} niveles")
+        self.linea = linea
+        self.columna = columna
+
+class DemasiadosErrores(Exception):
+    """El análisis llegó a su máximo de errores; el último de la lista es el resumen"""
+    def __init__(self, maximo):
+        super().__init__(mensaje_limite_errores(maximo))
+
+def mensaje_limite_errores(maximo):
+    return f"Se alcanzó el máximo de {maximo} errores sintácticos; el análisis se detuvo aquí"
+
 class NodoAST:
     def __init__(self, tipo, valor=None):
         self.tipo = tipo
@@ -329,10 +1291,12 @@ class NodoAST:
         return self
 
     def debug(self, nivel=0):
-        sangria = "  " * nivel
-        print(f"{sangria}- {self.tipo} (valor={self.valor}, linea={self.linea}, columna={self.columna})")
-        for hijo in self.hijos:
-            hijo.debug(nivel + 1)
+        pila = [(self, nivel)]
+        while pila:
+            nodo, nivel = pila.pop()
+            sangria = "  " * nivel
+            print(f"{sangria}- {nodo.tipo} (valor={nodo.valor}, linea={nodo.linea}, columna={nodo.columna})")
+            pila.extend((hijo, nivel + 1) for hijo in reversed(nodo.hijos))
     
     def __str__(self):
         return f"NodoAST({self.tipo}, {self.valor})"
@@ -343,34 +1307,330 @@ class NodoAnotado(NodoAST):
         self.tipo_dato = None  # tipo semántico, ej. int, float, bool
         self.valor_evaluado = None  # resultado de la evaluación si aplica
 
+class NodoEsquema:
+    """
+    Nodo del esquema de un programa (AnalizadorSintactico.esquema): main, una
+    declaración, una sentencia o un bloque, con el tramo [inicio, fin) de índices
+    de tokens que ocupa. Los tipos son los del nodo equivalente del AST.
+    """
+    __slots__ = ('tipo', 'valor', 'linea', 'columna', 'inicio', 'fin', 'hijos')
+
+    def __init__(self, tipo, valor, linea, columna, inicio, fin=None):
+        self.tipo = tipo
+        self.valor = valor
+        self.linea = linea
+        self.columna = columna
+        self.inicio = inicio
+        self.fin = fin
+        self.hijos = []
+
+    def __str__(self):
+        return f"NodoEsquema({self.tipo}, {self.valor}, tokens {self.inicio}-{self.fin})"
+
+class RegistroLista:
+    """
+    Puntos de control de una lista_sentencias para AnalizadorIncremental. Al
+    empezar cada vuelta del ciclo de _lista_sentencias y al salir de él se anotan
+    la posición en los tokens, la cantidad de errores y la de hijos del nodo.
+    Lo que se analiza entre dos puntos depende solo de los tokens entre ellos,
+    del anterior al primero y del siguiente al último.
+
+    La posición y los errores son relativos al punto de la sentencia que contiene
+    la lista en su lista padre (absolutos en la lista de main): si esa sentencia
+    se desplaza, las listas anidadas en ella no cambian.
+    """
+    __slots__ = ('nodo', 'padre', 'profundidad', 'origen_posicion', 'origen_errores',
+                 'posiciones', 'errores', 'hijos', 'sublistas')
+
+    def __init__(self, nodo, padre, profundidad, origen_posicion=0, origen_errores=0):
+        self.nodo = nodo
+        self.padre = padre
+        self.profundidad = profundidad
+        # Valores a los que marcar() hace relativos los puntos mientras se analiza la lista
+        self.origen_posicion = origen_posicion
+        self.origen_errores = origen_errores
+        self.posiciones = []
+        self.errores = []
+        self.hijos = []
+        self.sublistas = []  # por punto: registros de las listas anidadas en la sentencia que empieza ahí
+
+    def marcar(self, posicion, errores, hijos):
+        self.posiciones.append(posicion - self.origen_posicion)
+        self.errores.append(errores - self.origen_errores)
+        self.hijos.append(hijos)
+        self.sublistas.append([])
+
+    def desplazar(self, desde, posiciones, errores, hijos=0):
+        """Suma los desplazamientos a los puntos desde el índice desde"""
+        if posiciones:
+            self.posiciones[desde:] = [posicion + posiciones for posicion in self.posiciones[desde:]]
+        if errores:
+            self.errores[desde:] = [cantidad + errores for cantidad in self.errores[desde:]]
+        if hijos:
+            self.hijos[desde:] = [cantidad + hijos for cantidad in self.hijos[desde:]]
+
+log_sintactico = logger_fase("sintactico")
+
+
+TIPOS_NUMERO = frozenset(['NUMERO_ENTERO', 'NUMERO_DECIMAL', 'NUMERO_REAL'])
+
+IZQUIERDA, DERECHA, NO_ASOCIATIVO = 'izquierda', 'derecha', 'no_asociativo'
+SIN_OPERADOR = 1000
+
+# Marcos de la pila del analizador de expresiones (ver AnalizadorSintactico._analizar_expresion)
+MARCO_BINARIO, MARCO_UNARIO, MARCO_PARENTESIS = 'binario', 'unario', 'parentesis'
+
+# Niveles de anidamiento (bloques, o paréntesis/operadores dentro de una expresión)
+# que acepta el analizador sintáctico antes de reportar AnidamientoExcesivo
+PROFUNDIDAD_MAXIMA = 100000
+
+# Errores que reporta el analizador sintáctico antes de detenerse (None: sin límite)
+MAXIMO_ERRORES_SINTACTICOS = 100
+
+
+class OperadorBinario:
+    """Entrada de OPERADORES_BINARIOS"""
+    __slots__ = ('precedencia', 'asociatividad', 'tipo_nodo', 'mensaje_error', 'error_en_operador')
+
+    def __init__(self, precedencia, asociatividad, tipo_nodo, mensaje_error, error_en_operador):
+        self.precedencia = precedencia
+        self.asociatividad = asociatividad
+        self.tipo_nodo = tipo_nodo
+        # Error si falta el operando derecho; {op} es el operador. Se reporta en la
+        # posición del operador o en la última posición válida.
+        self.mensaje_error = mensaje_error
+        self.error_en_operador = error_en_operador
+
+
+# Operadores binarios de las expresiones: tipo de token -> {valor: operador}.
+# El valor None vale para cualquier valor de ese tipo. Mayor precedencia liga más fuerte.
+OPERADORES_BINARIOS = {
+    'OPERADOR_LOGICO': {
+        None: OperadorBinario(1, IZQUIERDA, 'log_op', "Se esperaba expresión después del operador lógico", False),
+    },
+    'OPERADOR_RELACIONAL': {
+        None: OperadorBinario(2, NO_ASOCIATIVO, 'rel_op', "Se esperaba expresión después del operador relacional", False),
+    },
+    'OPERADOR_ARITMETICO': {
+        '+': OperadorBinario(3, IZQUIERDA, 'suma_op', "Se esperaba un término después del operador '{op}'", True),
+        '-': OperadorBinario(3, IZQUIERDA, 'suma_op', "Se esperaba un término después del operador '{op}'", True),
+        '*': OperadorBinario(4, IZQUIERDA, 'mult_op', "Se esperaba un factor después del operador '{op}'", True),
+        '/': OperadorBinario(4, IZQUIERDA, 'mult_op', "Se esperaba un factor después del operador '{op}'", True),
+        '%': OperadorBinario(4, IZQUIERDA, 'mult_op', "Se esperaba un factor después del operador '{op}'", True),
+        '^': OperadorBinario(5, DERECHA, 'pot_op', "Se esperaba un componente después del operador '{op}'", True),
+    },
+}
+
+# Nombres que compara el analizador sintáctico: tipos de token, palabras clave,
+# signos y operadores. Un token cuyo valor es uno de ellos tiene su propia clase.
+TERMINALES = frozenset(TIPOS_TOKEN + (
+    'main', 'int', 'float', 'bool', 'if', 'then', 'else', 'end', 'while', 'do', 'until',
+    'cin', 'cout', 'true', 'false', '{', '}', '(', ')', ';', ',', '=', '<<', '>>', '++', '--', '!',
+)).union(valor for operadores in OPERADORES_BINARIOS.values() for valor in operadores if valor is not None)
+
+
+# Terminales donde se retoma el análisis después de un error, tomados de los conjuntos
+# PRIMEROS y SIGUIENTES de la gramática. Los que pueden empezar una expresión aparecen
+# en medio de cualquier sentencia y no marcan dónde empieza la siguiente; ';' sí.
+SINCRONIZACION_PROGRAMA = terminales_sincronizacion('lista_declaracion')
+SINCRONIZACION_DECLARACION = terminales_sincronizacion('declaracion_variable', excluir=PRIMEROS['expresion']) | {';'}
+# Dentro de if, while y do una sentencia puede seguirse de 'end', 'else' o 'until';
+# en el bloque de main solo de '}' (SIGUIENTES de lista_declaracion)
+SINCRONIZACION_SENTENCIA = terminales_sincronizacion('sentencia', excluir=PRIMEROS['expresion']) | {';'}
+SINCRONIZACION_SENTENCIA_MAIN = (
+    (PRIMEROS['sentencia'] - PRIMEROS['expresion']) | SIGUIENTES['lista_declaracion'] | {';'}
+)
+
+
+class ClasesToken:
+    """
+    Códigos enteros de clase de token para el analizador sintáctico. La clase es el
+    par (tipo, valor) si el valor está en TERMINALES y (tipo, None) si no. Cada tipo
+    y cada terminal tiene una máscara con el bit de cada clase que lo cumple, así
+    coincidir('if') es un AND entre enteros en lugar de comparar cadenas.
+    Las clases se registran al aparecer y su código no cambia.
+    """
+
+    def __init__(self):
+        self.codigos = {}     # (tipo, terminal o None) -> código
+        self.mascaras = {}    # tipo o terminal -> bits de las clases que lo cumplen
+        self.operadores = []  # código -> OperadorBinario o None
+
+    def clase(self, tipo, valor):
+        clave = (tipo, valor if valor in TERMINALES else None)
+        codigo = self.codigos.get(clave)
+        if codigo is None:
+            codigo = self._registrar(clave)
+        return codigo
+
+    def _registrar(self, clave):
+        tipo, terminal = clave
+        codigo = len(self.operadores)
+        bit = 1 << codigo
+        for nombre in clave:
+            if nombre is not None:
+                self.mascaras[nombre] = self.mascaras.get(nombre, 0) | bit
+
+        operador = None
+        operadores = OPERADORES_BINARIOS.get(tipo)
+        if operadores is not None:
+            operador = operadores.get(terminal) or operadores.get(None)
+        self.operadores.append(operador)
+        self.codigos[clave] = codigo
+        return codigo
+
+    def mascara(self, *nombres):
+        """Bits de las clases cuyo tipo o valor es alguno de nombres (deben estar en TERMINALES)"""
+        mascara = 0
+        for nombre in nombres:
+            if nombre not in TERMINALES:
+                raise ValueError(f"'{nombre}' no es un terminal de la gramática")
+            mascara |= self.mascaras.get(nombre, 0)
+        return mascara
+
+    def mascara_pares(self, pares):
+        """Bits de las clases exactas (tipo, valor) de pares"""
+        mascara = 0
+        for tipo, valor in pares:
+            mascara |= 1 << self.clase(tipo, valor)
+        return mascara
+
+
+CLASES_TOKEN = ClasesToken()
+# Clase del final de los tokens: ninguna máscara la incluye y no es operador
+CLASE_FIN = CLASES_TOKEN.clase('FIN_TOKENS', None)
+
+
+class _ClasesPorPar(dict):
+    """Código de clase de cada par ya visto; uno nuevo se clasifica con clasificar(*par)"""
+
+    def __init__(self, clasificar):
+        super().__init__()
+        self.clasificar = clasificar
+
+    def __missing__(self, par):
+        codigo = self[par] = self.clasificar(*par)
+        return codigo
+
+
+_tipo_y_valor = attrgetter('tipo', 'valor')
+
+
+def clasificar_tokens(tokens, clases_token=CLASES_TOKEN):
+    """
+    Código de clase de cada token de tokens (lista o TokenBuffer). Cada par
+    (tipo, valor) distinto se clasifica una sola vez; el recorrido por token son
+    map y consultas a un diccionario, sin llamadas a funciones de Python.
+    """
+    if not isinstance(tokens, TokenBuffer):
+        clases = _ClasesPorPar(clases_token.clase)
+        return list(map(clases.__getitem__, map(_tipo_y_valor, tokens)))
+
+    # En un TokenBuffer el par es (código del tipo, id del valor)
+    tipos, valores = tokens.tipos, tokens.valores
+    clases = _ClasesPorPar(lambda codigo, indice: clases_token.clase(tipos[codigo], valores[indice]))
+    return list(map(clases.__getitem__, zip(tokens.codigos, tokens.indices_valor)))
+
+
 class AnalizadorSintactico:
     """Analizador sintáctico descendente recursivo con mejor manejo de errores"""
     
-    def __init__(self, tokens):
+    def __init__(self, tokens, profundidad_maxima=PROFUNDIDAD_MAXIMA, clasificacion=None, arena=False,
+                 maximo_errores=MAXIMO_ERRORES_SINTACTICOS):
         self.tokens = tokens
+        # La lista de tokens no cambia durante el análisis
+        self.cantidad_tokens = len(tokens)
+        # Cada token se clasifica una vez; las pruebas sobre el token actual son
+        # comparaciones de enteros. Al final queda la clase CLASE_FIN con bit 0.
+        self.clases_token = CLASES_TOKEN
+        self.mascaras = CLASES_TOKEN.mascaras
+        self.operadores = CLASES_TOKEN.operadores
+        if clasificacion is None:
+            self.clases = clasificar_tokens(tokens)
+            self.clases.append(CLASE_FIN)
+            bit_de_clase = [1 << codigo for codigo in range(len(CLASES_TOKEN.operadores))]
+            self.bits = list(map(bit_de_clase.__getitem__, self.clases))
+            self.bits[-1] = 0
+        else:
+            # (clases, bits) ya calculados, que no se modifican (AnalizadorIncremental los empalma)
+            self.clases, self.bits = clasificacion
+        # Los mensajes de depuración por producción solo se generan si el nivel DEBUG está activo
+        self.depurar = depuracion_activa(log_sintactico)
         self.posicion = 0
         self.errores = []
+        self.maximo_errores = maximo_errores
+        # Región de recuperación del último error: hasta este token (el del error o
+        # hasta donde se sincronizó después) los errores son consecuencia de él
+        self.fin_recuperacion = -1
+        self.posicion_ultimo_error = None
+        self.errores_suprimidos = 0
         self.ast = None
         self.en_modo_panico = False
-        # Tokens de sincronización definidos en __init__
-        self.tokens_sync_declaracion = [';', 'int', 'float', 'bool', '}']
-        self.tokens_sync_sentencia = [';', 'if', 'while', 'do', 'cin', 'cout', '}']
+        # Bloques if/while/do abiertos; los bloques y las expresiones se analizan sobre
+        # pilas explícitas y solo este límite acota su anidamiento
+        self.profundidad = 0
+        self.profundidad_maxima = profundidad_maxima
+        # Pila de RegistroLista de las listas abiertas; None si no se registran
+        # (solo AnalizadorIncremental los pide)
+        self.registros = None
+        self.registro_raiz = None
+        # Con arena=True los nodos se agregan a una ArenaAST (arena_ast.py) en lugar
+        # de ser objetos, y el AST es la vista NodoArena de su raíz
+        self.arena = ArenaAST() if arena else None
+        self.nodo_ast = self.arena.nodo if arena else NodoAST
+        self.nodo_anotado = self.arena.nodo if arena else NodoAnotado
+
+        mascara = CLASES_TOKEN.mascara
+        # Máscaras de sincronización y, por máscara, el último tramo [desde, hasta] de
+        # tokens revisado: el primer token de la máscara a partir de desde está en hasta
+        self.sync_main = mascara('{')
+        self.sync_programa = mascara(*SINCRONIZACION_PROGRAMA)
+        self.sync_declaracion = mascara(*SINCRONIZACION_DECLARACION)
+        self.sync_sentencia = mascara(*SINCRONIZACION_SENTENCIA)
+        self.sync_sentencia_main = mascara(*SINCRONIZACION_SENTENCIA_MAIN)
+        self.tramos_sincronizacion = {}
+        self.mascara_tipo_dato = mascara('int', 'float', 'bool')
+        self.mascara_fin_lista = mascara('}', 'end', 'else', 'until')
+        self.mascara_fin_bloque = mascara('end', 'else', 'until')
+        self.mascara_punto_y_coma = mascara(';')
+        self.mascara_identificador = mascara('IDENTIFICADOR')
+        self.mascara_asignacion = mascara('=')
+        self.mascara_incremento = mascara('++', '--')
+        # Clases que recorre _saltar_expresion
+        self.mascara_operando = mascara('IDENTIFICADOR', *TIPOS_NUMERO)
+        self.mascara_operador_binario = mascara(*OPERADORES_BINARIOS)
+        self.mascara_signo = mascara('+', '-')
+        self.mascara_abre_parentesis = mascara('(')
+        self.mascara_cierra_parentesis = mascara(')')
+        # (máscara, método, True si es un generador de bloque para ejecutar_recorrido)
+        self.inicios_sentencia = [
+            (mascara('if'), self._seleccion, True),
+            (mascara('while'), self._iteracion, True),
+            (mascara('do'), self._repeticion, True),
+            (mascara('cin'), self.sent_in, False),
+            (mascara('cout'), self.sent_out, False),
+        ]
+        self.mascara_sincronizar = CLASES_TOKEN.mascara_pares(
+            [('ESPECIAL', valor) for valor in (';', '}', '{')]
+            + [('PALABRA_RESERVADA', valor) for valor in
+               ('int', 'float', 'bool', 'if', 'while', 'do', 'cout', 'cin', 'main')]
+        )
     
     def token_actual(self):
         """Retorna el token actual o None si se acabaron los tokens"""
-        if self.posicion < len(self.tokens):
+        if self.posicion < self.cantidad_tokens:
             return self.tokens[self.posicion]
         return None
     
     def token_siguiente(self):
         """Retorna el siguiente token sin avanzar la posición"""
-        if self.posicion + 1 < len(self.tokens):
+        if self.posicion + 1 < self.cantidad_tokens:
             return self.tokens[self.posicion + 1]
         return None
     
     def avanzar(self):
         """Avanza al siguiente token"""
-        if self.posicion < len(self.tokens):
+        if self.posicion < self.cantidad_tokens:
             self.posicion += 1
     
     def obtener_token_anterior(self):
@@ -380,23 +1640,28 @@ class AnalizadorSintactico:
         return None
     
     def coincidir(self, tipo_o_valor):
+        """True si el token actual es del tipo tipo_o_valor o tiene ese valor"""
+        if tipo_o_valor in TERMINALES:
+            return self.bits[self.posicion] & self.mascaras.get(tipo_o_valor, 0) != 0
+
         token = self.token_actual()
         if token is None:
             return False
+        return token.tipo == tipo_o_valor or token.valor == tipo_o_valor
 
-        # Verificar por tipo
-        if token.tipo == tipo_o_valor:
-            return True
-        
-        # Verificar por valor para palabras reservadas y símbolos
-        if token.valor == tipo_o_valor:
-            return True
-        
-        return False
+    def coincidir_clases(self, mascara):
+        """True si la clase del token actual está en mascara (ver ClasesToken)"""
+        return self.bits[self.posicion] & mascara != 0
     
     
     def consumir(self, tipo_o_valor, mensaje_error=None):
-       
+        # Caso común: la clase del token actual cumple la máscara de tipo_o_valor
+        # (la clase CLASE_FIN del final tiene bit 0)
+        posicion = self.posicion
+        if self.bits[posicion] & self.mascaras.get(tipo_o_valor, 0):
+            self.posicion = posicion + 1
+            return self.tokens[posicion]
+
         token = self.token_actual()
         
         if token is None:
@@ -428,15 +1693,34 @@ class AnalizadorSintactico:
         return 1  # Por simplicidad, siempre columna 1
 
     def agregar_error(self, mensaje, posicion):
-        """Agrega un error a la lista de errores"""
+        """
+        Agrega un error a la lista de errores. Se descarta si repite la posición
+        del anterior o si llega dentro de su región de recuperación, sin que el
+        análisis haya pasado del token del error o del de la sincronización que
+        lo siguió. Pasados maximo_errores se agrega un resumen y el análisis se
+        detiene con DemasiadosErrores.
+        """
         if isinstance(posicion, tuple):
             linea, columna = posicion
         else:
             linea, columna = posicion, 1
-        
+
+        if self.posicion <= self.fin_recuperacion or (linea, columna) == self.posicion_ultimo_error:
+            self.errores_suprimidos += 1
+            if self.depurar:
+                log_sintactico.debug("Error en cascada suprimido: %s", mensaje)
+            return
+        self.fin_recuperacion = self.posicion
+        self.posicion_ultimo_error = (linea, columna)
+
+        if self.maximo_errores is not None and len(self.errores) >= self.maximo_errores:
+            self.errores.append(ErrorSintactico(mensaje_limite_errores(self.maximo_errores), linea, columna))
+            raise DemasiadosErrores(self.maximo_errores)
+
         error = ErrorSintactico(mensaje, linea, columna)
         self.errores.append(error)
-        print(f"Error agregado: {error}")
+        if self.depurar:
+            log_sintactico.debug("Error agregado: %s", error)
     
     def obtener_ultima_posicion_valida(self):
         """Obtiene la última posición válida conocida"""
@@ -445,74 +1729,90 @@ class AnalizadorSintactico:
             return (token_anterior.linea, token_anterior.columna + len(str(token_anterior.valor)))
         return (1, 1)
     
-    def sincronizar_hasta(self, tokens_objetivo):
-        """Sincroniza hasta encontrar uno de los tokens objetivo"""
-        print(f"Sincronizando hasta encontrar: {tokens_objetivo}")
-        posicion_inicial = self.posicion
-        
-        while self.token_actual():
-            token = self.token_actual()
-            
-            # Verificar si encontramos un token objetivo
-            for objetivo in tokens_objetivo:
-                if self.coincidir(objetivo):
-                    print(f"Sincronización completada en: {token}")
-                    # CAMBIO: No consumir automáticamente el token objetivo
-                    # Dejar que el método llamador decida
-                    return
-            
-            print(f"Saltando token durante sincronización: {token}")
-            self.avanzar()
-            
-            # Protección contra bucles infinitos
-            if self.posicion - posicion_inicial > 50:
-                print("Sincronización interrumpida: demasiados tokens saltados")
-                break
-        
-        print("Sincronización completada: final de archivo")
-    
+    def siguiente_sincronizacion(self, objetivos):
+        """
+        Posición del primer token desde la actual cuya clase está en la máscara
+        objetivos, o cantidad_tokens si no hay. La posición solo avanza durante el
+        análisis, así que cada tramo revisado se guarda: las consultas que caen
+        dentro de él responden sin recorrer nada y cada token se revisa a lo sumo
+        una vez por máscara. La búsqueda no lee más allá del token encontrado.
+        """
+        posicion = self.posicion
+        tramo = self.tramos_sincronizacion.get(objetivos)
+        if tramo is not None and tramo[0] <= posicion <= tramo[1]:
+            return tramo[1]
+
+        bits = self.bits
+        hasta = posicion
+        while hasta < self.cantidad_tokens and not bits[hasta] & objetivos:
+            hasta += 1
+        self.tramos_sincronizacion[objetivos] = (posicion, hasta)
+        return hasta
+
+    def sincronizar_hasta(self, objetivos):
+        """Salta hasta el siguiente token de la máscara objetivos, sin consumirlo"""
+        destino = self.siguiente_sincronizacion(objetivos)
+        if self.depurar:
+            log_sintactico.debug("Sincronización: se saltan %d tokens hasta %s", destino - self.posicion,
+                                 self.tokens[destino] if destino < self.cantidad_tokens else "el final")
+        if self.posicion <= self.fin_recuperacion:
+            self.fin_recuperacion = destino
+        self.posicion = destino
+
+    def sincronizar_sentencia(self):
+        """Salta hasta el ';' o el token siguiente de la sentencia actual, según el bloque donde está"""
+        self.sincronizar_hasta(self.sync_sentencia if self.profundidad else self.sync_sentencia_main)
+
+    def sincronizar_sentencia_abierta(self):
+        """
+        sincronizar_sentencia para un error dentro de una expresión o antes del
+        'then'/'end' de un bloque. Si se detendría sin avanzar en un 'end', 'else'
+        o 'until', ese token no cierra el bloque de la sentencia (un 'else' suelto
+        cortaría las listas de afuera hasta cerrar main): se salta hasta el ';', una
+        palabra clave de sentencia o '}'.
+        """
+        inicio = self.posicion
+        self.sincronizar_sentencia()
+        if self.posicion == inicio and self.bits[inicio] & self.mascara_fin_bloque:
+            # La máscara de main no incluye 'end', 'else' ni 'until'
+            self.sincronizar_hasta(self.sync_sentencia_main)
+
     def sincronizar(self):
         """Función de sincronización para recuperación de errores"""
-        self.en_modo_panico = True
-        sincron_tokens = [';', '}', '{']
-        sincron_palabras = ['int', 'float', 'bool', 'if', 'while', 'do', 'cout', 'cin', 'main']
-        
-        while self.token_actual() and self.en_modo_panico:
-            t = self.token_actual()
-            
-            # Si encontramos un token de sincronización, detenernos
-            if (t.tipo == 'ESPECIAL' and t.valor in sincron_tokens) or \
-               (t.tipo == 'PALABRA_RESERVADA' and t.valor in sincron_palabras):
-                self.en_modo_panico = False
-                break
-            
-            self.avanzar()
+        # Se detiene en un token de sincronización (ESPECIAL ; } { o una
+        # PALABRA_RESERVADA de inicio) o al final
+        destino = self.siguiente_sincronizacion(self.mascara_sincronizar)
+        if self.posicion <= self.fin_recuperacion:
+            self.fin_recuperacion = destino
+        self.posicion = destino
+        self.en_modo_panico = False
 
 
     def programa(self):
         """programa → main { lista_declaracion }"""
-        print("Analizando programa...")
+        if self.depurar:
+            log_sintactico.debug("Analizando programa...")
 
         # Crear nodo raíz del programa
         token_inicio = self.token_actual()
-        nodo_programa = NodoAST("programa")
+        nodo_programa = self.nodo_ast("programa")
         if token_inicio:
             nodo_programa.set_posicion(token_inicio.linea, token_inicio.columna)
 
         # Consumir 'main'
         if not self.consumir('main', "Se esperaba 'main' al inicio del programa"):
-            self.sincronizar_hasta(['{'])
+            self.sincronizar_hasta(self.sync_main)
             return nodo_programa
 
         # Obtener el token real de 'main' (ya fue consumido)
         token_main = self.obtener_token_anterior()
-        nodo_main = NodoAST("main")
+        nodo_main = self.nodo_ast("main")
         if token_main:
             nodo_main.set_posicion(token_main.linea, token_main.columna)
 
         # Consumir '{'
         if not self.consumir('{', "Se esperaba '{' después de 'main'"):
-            self.sincronizar_hasta(['int', 'float', 'bool', 'IDENTIFICADOR'])
+            self.sincronizar_hasta(self.sync_programa)
 
         # Analizar lista de declaraciones dentro de main
         lista_decl = self.lista_declaracion()
@@ -532,18 +1832,19 @@ class AnalizadorSintactico:
 
     def lista_declaracion(self):
         """lista_declaracion → { declaracion_variable } lista_sentencias"""
-        print("Analizando lista de declaraciones...")
+        if self.depurar:
+            log_sintactico.debug("Analizando lista de declaraciones...")
         
         # Si solo hay declaraciones y sentencias, no debe encapsularse todo en un nodo contenedor.
         nodos = []
 
         # Declaraciones de variables (cero o más)
-        while self.token_actual() and (self.coincidir('int') or self.coincidir('float') or self.coincidir('bool')):
+        while self.coincidir_clases(self.mascara_tipo_dato):
             decl = self.declaracion_variable()
             if decl:
                 nodos.append(decl)
             else:
-                self.sincronizar_hasta(self.tokens_sync_declaracion)
+                self.sincronizar_hasta(self.sync_declaracion)
         
         # Sentencias (también pueden ser cero o más)
         lista_sent = self.lista_sentencias()
@@ -555,7 +1856,7 @@ class AnalizadorSintactico:
         if len(nodos) == 1:
             return nodos[0]
         elif len(nodos) > 1:
-            nodo_lista = NodoAST("bloque")  # Puedes llamarlo "programa" o similar si lo prefieres
+            nodo_lista = self.nodo_ast("bloque")  # Puedes llamarlo "programa" o similar si lo prefieres
             for n in nodos:
                 nodo_lista.agregar_hijo(n)
             return nodo_lista
@@ -564,15 +1865,16 @@ class AnalizadorSintactico:
     
     def declaracion_variable(self):
         """declaracion_variable → tipo identificador ;"""
-        print("Analizando declaración de variable...")
+        if self.depurar:
+            log_sintactico.debug("Analizando declaración de variable...")
 
         # Capturar token de tipo (int, float, bool)
         token_tipo = self.token_actual()
-        if not (self.coincidir('int') or self.coincidir('float') or self.coincidir('bool')):
+        if not self.coincidir_clases(self.mascara_tipo_dato):
             return None
 
         # Crear nodo principal de la declaración
-        nodo = NodoAST("declaracion_variable")
+        nodo = self.nodo_ast("declaracion_variable")
         if token_tipo:
             nodo.set_posicion(token_tipo.linea, token_tipo.columna)
 
@@ -580,7 +1882,7 @@ class AnalizadorSintactico:
         self.avanzar()
 
         # Nodo hijo: tipo
-        nodo_tipo = NodoAST("tipo", token_tipo.valor)
+        nodo_tipo = self.nodo_ast("tipo", token_tipo.valor)
         if token_tipo:
             nodo_tipo.set_posicion(token_tipo.linea, token_tipo.columna)
         nodo.agregar_hijo(nodo_tipo)
@@ -595,16 +1897,17 @@ class AnalizadorSintactico:
 
         # Consumir ';'
         if not self.consumir(';', "Se esperaba ';' después de la declaración"):
-            self.sincronizar_hasta(self.tokens_sync_declaracion)
+            self.sincronizar_hasta(self.sync_declaracion)
 
         return nodo
 
         
     def identificador(self):
         """identificador → id | identificador , id"""
-        print("Analizando identificador...")
+        if self.depurar:
+            log_sintactico.debug("Analizando identificador...")
 
-        nodo = NodoAST("identificador")
+        nodo = self.nodo_ast("identificador")
 
         token_id = self.token_actual()
         if not self.coincidir('IDENTIFICADOR'):
@@ -614,7 +1917,7 @@ class AnalizadorSintactico:
             nodo.set_posicion(token_id.linea, token_id.columna)
 
         self.avanzar()
-        nodo_id = NodoAST("id", token_id.valor)
+        nodo_id = self.nodo_ast("id", token_id.valor)
         if token_id:
             nodo_id.set_posicion(token_id.linea, token_id.columna)
         nodo.agregar_hijo(nodo_id)
@@ -627,7 +1930,7 @@ class AnalizadorSintactico:
                 break
             self.avanzar()
 
-            nuevo_id = NodoAST("id", token_id.valor)
+            nuevo_id = self.nodo_ast("id", token_id.valor)
             nuevo_id.set_posicion(token_id.linea, token_id.columna)
             nodo.agregar_hijo(nuevo_id)
 
@@ -635,33 +1938,53 @@ class AnalizadorSintactico:
         
     def lista_sentencias(self):
         """lista_sentencias → lista_sentencias sentencia | ε"""
-        print("Analizando lista de sentencias...")
-        nodo_lista = NodoAnotado("lista_sentencias")
-
-        while (
-            self.token_actual()
-            and not self.coincidir('}')
-            and not self.coincidir('end')
-            and not self.coincidir('else')
-            and not self.coincidir('until')
-        ):
-            # VALIDACIÓN: Si encontramos un ';' al inicio, es un error
-            if self.token_actual().valor == ';':
+        return ejecutar_recorrido(self._lista_sentencias())
+
+    def _lista_sentencias(self, nodo_lista=None, registro=None, resincronizar=None):
+        """
+        Generador de lista_sentencias para ejecutar_recorrido: los bloques anidados
+        se piden con yield en lugar de llamarse recursivamente.
+
+        AnalizadorIncremental lo usa para seguir una lista desde la posición actual:
+        pasa el nodo y el registro donde continuar y resincronizar(posicion), que
+        al dar True termina el ciclo al comienzo de esa vuelta.
+        """
+        if self.depurar:
+            log_sintactico.debug("Analizando lista de sentencias...")
+        if nodo_lista is None:
+            nodo_lista = self.nodo_anotado("lista_sentencias")
+        if registro is None and self.registros is not None:
+            registro = self._abrir_registro(nodo_lista)
+
+        while self.posicion < self.cantidad_tokens and not self.coincidir_clases(self.mascara_fin_lista):
+            if registro is not None:
+                registro.marcar(self.posicion, len(self.errores), len(nodo_lista.hijos))
+                if resincronizar is not None and resincronizar(self.posicion):
+                    return nodo_lista
+            # Cada vuelta empieza sincronizada: los errores de la anterior no suprimen los
+            # suyos, y lo que se reporta depende solo de los tokens de la vuelta
+            self.fin_recuperacion = -1
+            self.posicion_ultimo_error = None
+
+            # VALIDACIÓN: Si encontramos un ';' al inicio, es un error (uno para varios seguidos)
+            if self.coincidir_clases(self.mascara_punto_y_coma):
                 self.agregar_error(
                     "';' inesperado. No se esperaba punto y coma aquí",
                     (self.token_actual().linea, self.token_actual().columna)
                 )
                 self.avanzar()
+                while self.coincidir_clases(self.mascara_punto_y_coma):
+                    self.avanzar()
                 continue
 
             # Guardar posición antes de procesar la sentencia
             posicion_antes = self.posicion
-            sent = self.sentencia()
+            sent = yield self._sentencia()
 
             if sent:
-                # Asegurar que sea un NodoAnotado
-                if not isinstance(sent, NodoAnotado):
-                    sent_anotado = NodoAnotado(sent.tipo, getattr(sent, "valor", None))
+                # Asegurar que sea un NodoAnotado (en la arena todos los nodos son iguales)
+                if self.arena is None and not isinstance(sent, NodoAnotado):
+                    sent_anotado = self.nodo_anotado(sent.tipo, getattr(sent, "valor", None))
                     sent_anotado.linea = getattr(sent, "linea", 0)
                     sent_anotado.columna = getattr(sent, "columna", 0)
                     for hijo in getattr(sent, "hijos", []):
@@ -673,67 +1996,81 @@ class AnalizadorSintactico:
                 # Manejo de errores o tokens no consumidos
                 if self.token_actual():
                     if self.posicion == posicion_antes:
-                        print(f"Token no procesado por sentencia(): {self.token_actual()}")
-                        self.sincronizar_hasta(self.tokens_sync_sentencia)
+                        if self.depurar:
+                            log_sintactico.debug("Token no procesado por sentencia(): %s", self.token_actual())
+                        self.sincronizar_sentencia()
                         if self.posicion == posicion_antes:
-                            print("No se pudo sincronizar, saltando token problemático")
+                            if self.depurar:
+                                log_sintactico.debug("No se pudo sincronizar, saltando token problemático")
                             self.avanzar()
-                            if (
-                                self.token_actual()
-                                and (
-                                    self.coincidir('}')
-                                    or self.coincidir('end')
-                                    or self.coincidir('else')
-                                    or self.coincidir('until')
-                                )
-                            ):
+                            if self.coincidir_clases(self.mascara_fin_lista):
                                 break
                     else:
-                        print("Sentencia parcialmente procesada, continuando...")
+                        if self.depurar:
+                            log_sintactico.debug("Sentencia parcialmente procesada, continuando...")
                 else:
                     break
 
+        # Lo que sigue a la lista (su 'end', '}'...) tampoco depende de sus errores
+        self.fin_recuperacion = -1
+        self.posicion_ultimo_error = None
+        if registro is not None:
+            registro.marcar(self.posicion, len(self.errores), len(nodo_lista.hijos))
+            self.registros.pop()
         return nodo_lista if nodo_lista.hijos else None
 
+    def _abrir_registro(self, nodo_lista):
+        """RegistroLista de la lista que empieza, anotado en la sentencia actual de la lista que la contiene"""
+        padre = self.registros[-1] if self.registros else None
+        if padre is None:
+            registro = RegistroLista(nodo_lista, None, self.profundidad)
+            self.registro_raiz = registro
+        else:
+            registro = RegistroLista(nodo_lista, padre, self.profundidad,
+                                     padre.origen_posicion + padre.posiciones[-1],
+                                     padre.origen_errores + padre.errores[-1])
+            padre.sublistas[-1].append(registro)
+        self.registros.append(registro)
+        return registro
+
     def sentencia(self):
         """sentencia → seleccion | iteracion | repeticion | sent_in | sent_out | asignacion"""
-        print("Analizando sentencia...")
-        token = self.token_actual()
+        return ejecutar_recorrido(self._sentencia())
 
-        if not token:
+    def _sentencia(self):
+        """Generador de sentencia para ejecutar_recorrido"""
+        if self.depurar:
+            log_sintactico.debug("Analizando sentencia...")
+        if self.posicion >= self.cantidad_tokens:
             return None
 
-        # Selección (if)
-        if self.coincidir('if'):
-            return self.seleccion()
-
-        # Iteración (while)
-        elif self.coincidir('while'):
-            return self.iteracion()
-
-        # Repetición (do ... until)
-        elif self.coincidir('do'):
-            return self.repeticion()
-
-        # Entrada (cin)
-        elif self.coincidir('cin'):
-            return self.sent_in()
-
-        # Salida (cout)
-        elif self.coincidir('cout'):
-            return self.sent_out()
+        # Selección (if), iteración (while), repetición (do ... until), entrada (cin), salida (cout)
+        bit = self.bits[self.posicion]
+        for mascara, analizar, es_bloque in self.inicios_sentencia:
+            if bit & mascara:
+                if not es_bloque:
+                    return analizar()
+                if self.profundidad >= self.profundidad_maxima:
+                    token = self.token_actual()
+                    raise AnidamientoExcesivo(self.profundidad_maxima, token.linea, token.columna)
+                self.profundidad += 1
+                nodo = yield analizar()
+                self.profundidad -= 1
+                return nodo
 
         # Asignación o incremento/decremento
-        elif self.coincidir('IDENTIFICADOR'):
-            siguiente = self.token_siguiente()
+        if bit & self.mascara_identificador:
+            # bits termina en 0, así que el siguiente siempre existe
+            bit_siguiente = self.bits[self.posicion + 1]
 
-            if siguiente and siguiente.valor == '=':
+            if bit_siguiente & self.mascara_asignacion:
                 return self.asignacion()
 
-            elif siguiente and siguiente.valor in ('++', '--'):
+            elif bit_siguiente & self.mascara_incremento:
                 return self.incremento_decremento()
 
             else:
+                token = self.token_actual()
                 self.agregar_error(
                     f"Se esperaba '=' después del identificador '{token.valor}'",
                     (token.linea, token.columna)
@@ -743,6 +2080,7 @@ class AnalizadorSintactico:
 
         # Token no reconocido como sentencia
         else:
+            token = self.token_actual()
             self.agregar_error(
                 f"Token inesperado '{token.valor}' ({token.tipo}). Se esperaba una sentencia válida",
                 (token.linea, token.columna)
@@ -752,7 +2090,8 @@ class AnalizadorSintactico:
 
     def asignacion(self):
         """asignacion → id = sent_expresion"""
-        print("Analizando asignación...")
+        if self.depurar:
+            log_sintactico.debug("Analizando asignación...")
         
         # Capturar identificador
         token_id = self.token_actual()
@@ -761,7 +2100,7 @@ class AnalizadorSintactico:
                             self.obtener_ultima_posicion_valida())
             return None
         
-        nodo = NodoAST("asignacion", token_id.valor)
+        nodo = self.nodo_ast("asignacion", token_id.valor)
         # Establecer posición
         if token_id:
             nodo.set_posicion(token_id.linea, token_id.columna)
@@ -770,7 +2109,7 @@ class AnalizadorSintactico:
         
         # Consumir '='
         if not self.consumir('=', "Se esperaba '=' después del identificador"):
-            self.sincronizar_hasta([';'])
+            self.sincronizar_sentencia()
             return nodo
         
         # Consumir sent_expresion
@@ -786,13 +2125,14 @@ class AnalizadorSintactico:
 
     def sent_expresion(self):
         """sent_expresion → expresion ; | ;"""
-        print("Analizando sentencia de expresión...")
+        if self.depurar:
+            log_sintactico.debug("Analizando sentencia de expresión...")
 
         # Si encontramos directamente ';', es una expresión vacía
         if self.coincidir(';'):
             token_puntoycoma = self.token_actual()
             self.avanzar()
-            nodo_vacio = NodoAST("expresion_vacia")
+            nodo_vacio = self.nodo_ast("expresion_vacia")
             if token_puntoycoma:
                 nodo_vacio.set_posicion(token_puntoycoma.linea, token_puntoycoma.columna)
             return nodo_vacio
@@ -805,15 +2145,25 @@ class AnalizadorSintactico:
             nodo.set_posicion(self.token_actual().linea, self.token_actual().columna)
 
         if not self.consumir(';', "Se esperaba ';' después de la expresión"):
-            self.sincronizar_hasta(self.tokens_sync_sentencia)
+            self.sincronizar_sentencia()
 
         return nodo
 
 
     def expresion(self):
-        """expresion → expresion_logica"""
-        print("Analizando expresión...")
-        nodo = self.expresion_logica()
+        """
+        expresion → expresion_logica
+        expresion_logica → expresion_relacional { OPERADOR_LOGICO expresion_relacional }
+        expresion_relacional → expresion_simple [ OPERADOR_RELACIONAL expresion_simple ]
+        expresion_simple → termino { suma_op termino }
+        termino → factor { mult_op factor }
+        factor → componente [ '^' factor ]
+
+        Se analiza en un solo ciclo por precedencia (ver OPERADORES_BINARIOS).
+        """
+        if self.depurar:
+            log_sintactico.debug("Analizando expresión...")
+        nodo, _ = self.expresion_binaria(1)
 
         # Seguridad: si no hay posición, tomarla del token actual
         if nodo and nodo.linea is None and self.token_actual():
@@ -822,266 +2172,255 @@ class AnalizadorSintactico:
         return nodo
 
 
-    def expresion_logica(self):
-        """expresion_logica → expresion_relacional { OPERADOR_LOGICO expresion_relacional }"""
-        print("Analizando expresión lógica...")
-
-        nodo_izq = self.expresion_relacional()
-        if not nodo_izq:
-            return None
-
-        while self.token_actual() and self.token_actual().tipo == 'OPERADOR_LOGICO':
-            op_token = self.token_actual()
-            self.avanzar()
-
-            nodo_der = self.expresion_relacional()
-            if not nodo_der:
-                self.agregar_error("Se esperaba expresión después del operador lógico",
-                                self.obtener_ultima_posicion_valida())
-                return nodo_izq
-
-            nuevo_nodo = NodoAST("log_op", op_token.valor)
-            nuevo_nodo.agregar_hijo(nodo_izq)
-            nuevo_nodo.agregar_hijo(nodo_der)
-
-            # Posición del operador lógico
-            if op_token:
-                nuevo_nodo.set_posicion(op_token.linea, op_token.columna)
-
-            nodo_izq = nuevo_nodo
-
-        return nodo_izq
-
-
-    def expresion_relacional(self):
-        """expresion_relacional → expresion_simple [ OPERADOR_RELACIONAL expresion_simple ]"""
-        print("Analizando expresión relacional...")
-
-        nodo_izq = self.expresion_simple()
-        if not nodo_izq:
-            return None
-
-        if self.token_actual() and self.token_actual().tipo == 'OPERADOR_RELACIONAL':
-            op_token = self.token_actual()
-            self.avanzar()
-
-            nodo_der = self.expresion_simple()
-            if not nodo_der:
-                self.agregar_error("Se esperaba expresión después del operador relacional",
-                                self.obtener_ultima_posicion_valida())
-                return nodo_izq
-
-            nodo_op = NodoAST("rel_op", op_token.valor)
-            nodo_op.agregar_hijo(nodo_izq)
-            nodo_op.agregar_hijo(nodo_der)
-
-            # Asignar posición al nodo del operador relacional
-            if op_token:
-                nodo_op.set_posicion(op_token.linea, op_token.columna)
-
-            return nodo_op
-
-        return nodo_izq
-
-
-
-    def expresion_simple(self):
-        """expresion_simple → termino { suma_op termino }"""
-        print("Analizando expresión simple...")
-
-        nodo_izq = self.termino()
-        if not nodo_izq:
-            return None
-
-        while (self.token_actual() and self.token_actual().tipo == 'OPERADOR_ARITMETICO' and 
-            self.token_actual().valor in ['+', '-']):
-            
-            op_token = self.token_actual()
-            self.avanzar()
-
-            nodo_der = self.termino()
-            if not nodo_der:
-                self.agregar_error(
-                    f"Se esperaba un término después del operador '{op_token.valor}'",
-                    (op_token.linea, op_token.columna)
-                )
-                return nodo_izq  # Retornar lo que se pudo analizar
-
-            # Crear nuevo nodo raíz con el operador
-            nuevo_nodo = NodoAST("suma_op", op_token.valor)
-            nuevo_nodo.agregar_hijo(nodo_izq)
-            nuevo_nodo.agregar_hijo(nodo_der)
-
-            # Asignar posición desde el token del operador
-            if op_token:
-                nuevo_nodo.set_posicion(op_token.linea, op_token.columna)
-
-            nodo_izq = nuevo_nodo
-
-        # Si el nodo no tiene posición, usar la del primer término
-        if nodo_izq and nodo_izq.linea is None and self.token_actual():
-            nodo_izq.set_posicion(self.token_actual().linea, self.token_actual().columna)
-
-        return nodo_izq
-
-
-    def termino(self):
-        """termino → factor { mult_op factor }"""
-        print("Analizando término...")
-
-        nodo_izq = self.factor()
-        if not nodo_izq:
-            return None
-
-        while (self.token_actual() and self.token_actual().tipo == 'OPERADOR_ARITMETICO' and 
-            self.token_actual().valor in ['*', '/', '%']):
-
-            op_token = self.token_actual()
-            self.avanzar()  # Consumir el operador
-
-            nodo_der = self.factor()
-            if not nodo_der:
-                self.agregar_error(
-                    f"Se esperaba un factor después del operador '{op_token.valor}'",
-                    (op_token.linea, op_token.columna)
-                )
-                return nodo_izq  # Retornar lo que se pudo construir
-
-            # Crear nuevo nodo raíz con el operador
-            nuevo_nodo = NodoAST("mult_op", op_token.valor)
-            nuevo_nodo.agregar_hijo(nodo_izq)
-            nuevo_nodo.agregar_hijo(nodo_der)
-
-            # Asignar línea y columna
-            if op_token:
-                nuevo_nodo.set_posicion(op_token.linea, op_token.columna)
-
-            nodo_izq = nuevo_nodo  # Este pasa a ser el nodo base para el siguiente operador
-
-        return nodo_izq
-
-
-    def factor(self):
-        
-        """factor → componente { '^' componente }"""
-        print("Analizando factor...")
-
-        nodo_izq = self.componente()
-        if not nodo_izq:
-            return None
-
-        while self.token_actual() and self.token_actual().valor == '^':
-            op_token = self.token_actual()
-            self.avanzar()  # Consumir '^'
-
-            nodo_der = self.componente()
-            if not nodo_der:
-                self.agregar_error(
-                    f"Se esperaba un componente después del operador '^'",
-                    (op_token.linea, op_token.columna)
-                )
-                return nodo_izq
-
-            # En la potencia el operador es **asociativo a la derecha**
-            nuevo_nodo = NodoAST("pot_op", op_token.valor)
-            nuevo_nodo.agregar_hijo(nodo_izq)
-            nuevo_nodo.agregar_hijo(nodo_der)
-
-            # Asignar posición desde el operador
-            if op_token:
-                nuevo_nodo.set_posicion(op_token.linea, op_token.columna)
-
-            nodo_izq = nuevo_nodo
-
-        return nodo_izq
+    def expresion_binaria(self, precedencia_minima):
+        """
+        Analiza componente { operador expresión } aceptando solo operadores de
+        precedencia >= precedencia_minima. Retorna (nodo, tope): si falta el operando
+        derecho de un operador, el error se reporta como en la gramática por niveles
+        y desde ahí se aceptan solo operadores de precedencia menor que tope.
+        """
+        return self._analizar_expresion([MARCO_BINARIO, precedencia_minima, None, SIN_OPERADOR, SIN_OPERADOR, None, None])
 
 
     def componente(self):
         """componente → ( expresion ) | número | id | bool | op_unario componente"""
-        print("Analizando componente...")
-        token = self.token_actual()
-
-        if not token:
-            self.agregar_error("Se esperaba una expresión", self.obtener_ultima_posicion_valida())
-            return None
+        return self._analizar_expresion(None)
+
+
+    def _analizar_expresion(self, marco_inicial):
+        """
+        Analizador de expresiones sin recursión. Los paréntesis, los operadores
+        unarios y el operando derecho de cada operador apilan un marco en `pila`
+        en lugar de llamar otra vez a expresion_binaria o componente:
+
+          [MARCO_BINARIO, precedencia_minima, izquierdo, nivel_izq, tope, op_token, operador]
+          [MARCO_UNARIO, nodo, token]
+          [MARCO_PARENTESIS, token]
+
+        Cada vuelta lee un componente (los prefijos apilan su marco y siguen) y lo
+        entrega a los marcos de arriba, que terminan o piden otro componente.
+        Con marco_inicial None se analiza un solo componente.
+        """
+        pila = [] if marco_inicial is None else [marco_inicial]
+        tokens = self.tokens
+        clases = self.clases
+        bits = self.bits
+        mascara_operando = self.mascara_operando
+        operadores = self.operadores
+        maximo = self.profundidad_maxima
+        cantidad_tokens = self.cantidad_tokens
+        nodo_ast = self.nodo_ast
+        depurar = self.depurar
+        # Un paréntesis apila dos marcos pero cuenta como un nivel
+        parentesis = 0
+
+        while True:
+            # ---- componente ----
+            while True:
+                if depurar:
+                    log_sintactico.debug("Analizando componente...")
+                if self.posicion >= cantidad_tokens:
+                    self.agregar_error("Se esperaba una expresión", self.obtener_ultima_posicion_valida())
+                    resultado = None
+                    break
 
-        # ---- Operadores aritméticos unarios ----
-        if token.tipo == 'OPERADOR_ARITMETICO' and token.valor in ['-', '+']:
-            nodo = NodoAST("unario", token.valor)
-            nodo.set_posicion(token.linea, token.columna)
-            self.avanzar()  # consumir el operador
-            comp = self.componente()
-            if comp:
-                nodo.agregar_hijo(comp)
-            else:
-                self.agregar_error(f"Se esperaba un componente después del operador '{token.valor}'",
-                                (token.linea, token.columna))
-            return nodo
+                token = tokens[self.posicion]
+                tipo = token.tipo
+                valor = token.valor
 
-        # ---- Operador lógico unario ----
-        if token.tipo == 'OPERADOR_LOGICO' and token.valor == '!':
-            nodo = NodoAST("componente_logico")
-            nodo.set_posicion(token.linea, token.columna)
+                # Identificadores y booleanos
+                if tipo == 'IDENTIFICADOR':
+                    resultado = nodo_ast("bool" if valor in ('true', 'false') else "id", valor)
+                    resultado.set_posicion(token.linea, token.columna)
+                    self.posicion += 1
+                    break
 
-            op_nodo = NodoAST("op_logico", token.valor)
-            op_nodo.set_posicion(token.linea, token.columna)
+                # Números
+                if tipo in TIPOS_NUMERO:
+                    resultado = nodo_ast("numero", valor)
+                    resultado.set_posicion(token.linea, token.columna)
+                    self.posicion += 1
+                    break
 
-            nodo.agregar_hijo(op_nodo)
-            self.avanzar()
+                if len(pila) - parentesis >= maximo:
+                    raise AnidamientoExcesivo(maximo, token.linea, token.columna)
+
+                # Operadores aritméticos unarios
+                if tipo == 'OPERADOR_ARITMETICO' and valor in ('-', '+'):
+                    nodo = nodo_ast("unario", valor)
+                    nodo.set_posicion(token.linea, token.columna)
+                    self.avanzar()  # consumir el operador
+                    pila.append([MARCO_UNARIO, nodo, token])
+                    continue
+
+                # Operador lógico unario
+                if tipo == 'OPERADOR_LOGICO' and valor == '!':
+                    nodo = nodo_ast("componente_logico")
+                    nodo.set_posicion(token.linea, token.columna)
+                    op_nodo = nodo_ast("op_logico", valor)
+                    op_nodo.set_posicion(token.linea, token.columna)
+                    nodo.agregar_hijo(op_nodo)
+                    self.avanzar()
+                    pila.append([MARCO_UNARIO, nodo, token])
+                    continue
 
-            comp = self.componente()
-            if comp:
-                nodo.agregar_hijo(comp)
-            else:
-                self.agregar_error("Se esperaba un componente después del operador '!'", 
-                                (token.linea, token.columna))
-            return nodo
+                # Paréntesis: ( expresion )
+                if valor == '(':
+                    self.avanzar()
+                    if depurar:
+                        log_sintactico.debug("Analizando expresión...")
+                    parentesis += 1
+                    pila.append([MARCO_PARENTESIS, token])
+                    pila.append([MARCO_BINARIO, 1, None, SIN_OPERADOR, SIN_OPERADOR, None, None])
+                    continue
+
+                # Error
+                self.agregar_error(
+                    f"Se esperaba número, identificador, expresión entre paréntesis o operador unario, se encontró '{token.valor}' ({token.tipo})",
+                    (token.linea, token.columna)
+                )
+                resultado = None
+                break
 
-        # ---- Paréntesis ----
-        if self.coincidir('('):
-            token_par = token
-            self.avanzar()
-            expr = self.expresion()
-            if not self.consumir(')', "Se esperaba ')' después de la expresión"):
-                self.sincronizar_hasta([';'])
-            if expr and expr.linea is None:
-                expr.set_posicion(token_par.linea, token_par.columna)
-            return expr  
-
-        # ---- Números ----
-        if token.tipo in ['NUMERO_ENTERO', 'NUMERO_DECIMAL', 'NUMERO_REAL']:
-            nodo = NodoAST("numero", token.valor)
-            nodo.set_posicion(token.linea, token.columna)
-            self.avanzar()
-            return nodo
+            # ---- entregar el resultado a los marcos de la pila ----
+            # resultado es un nodo (componente) o, al cerrar un MARCO_BINARIO, (nodo, tope)
+            while pila:
+                marco = pila[-1]
+                clase_marco = marco[0]
+
+                if clase_marco is MARCO_UNARIO:
+                    pila.pop()
+                    nodo, token = marco[1], marco[2]
+                    if resultado:
+                        nodo.agregar_hijo(resultado)
+                    else:
+                        self.agregar_error(f"Se esperaba un componente después del operador '{token.valor}'",
+                                        (token.linea, token.columna))
+                    resultado = nodo
+                    continue
+
+                if clase_marco is MARCO_PARENTESIS:
+                    pila.pop()
+                    parentesis -= 1
+                    token_par = marco[1]
+                    expr = resultado[0]
+                    # Como en expresion(): si no hay posición, tomarla del token actual
+                    if expr and expr.linea is None and self.token_actual():
+                        expr.set_posicion(self.token_actual().linea, self.token_actual().columna)
+                    if not self.consumir(')', "Se esperaba ')' después de la expresión"):
+                        self.sincronizar_sentencia_abierta()
+                    if expr and expr.linea is None:
+                        expr.set_posicion(token_par.linea, token_par.columna)
+                    resultado = expr
+                    continue
+
+                # MARCO_BINARIO
+                op_token = marco[5]
+                if op_token is None:
+                    # Operando izquierdo
+                    if not resultado:
+                        pila.pop()
+                        resultado = (None, SIN_OPERADOR)
+                        continue
+                    marco[2] = resultado
+                else:
+                    # Operando derecho del operador op_token
+                    nodo_der, tope_der = resultado
+                    operador = marco[6]
+                    precedencia = operador.precedencia
+                    if tope_der < marco[4]:
+                        marco[4] = tope_der
+                    if nodo_der:
+                        nuevo_nodo = nodo_ast(operador.tipo_nodo, op_token.valor)
+                        nuevo_nodo.agregar_hijo(marco[2])
+                        nuevo_nodo.agregar_hijo(nodo_der)
+                        # Posición del operador
+                        nuevo_nodo.set_posicion(op_token.linea, op_token.columna)
+                        marco[2] = nuevo_nodo
+                        marco[3] = precedencia
+                    else:
+                        mensaje = operador.mensaje_error.format(op=op_token.valor)
+                        if operador.error_en_operador:
+                            self.agregar_error(mensaje, (op_token.linea, op_token.columna))
+                        else:
+                            self.agregar_error(mensaje, self.obtener_ultima_posicion_valida())
+                        if precedencia < marco[4]:
+                            marco[4] = precedencia
+                    marco[5] = None
+
+                # Siguientes operadores que este marco acepta
+                # (la clase CLASE_FIN del final no es operador)
+                while True:
+                    posicion = self.posicion
+                    operador = operadores[clases[posicion]]
+                    if operador is None:
+                        break
+                    precedencia = operador.precedencia
+                    if (precedencia < marco[1] or precedencia >= marco[4]
+                            # No asociativo: a < b < c deja de analizar en el segundo operador
+                            or (operador.asociatividad == NO_ASOCIATIVO and marco[3] <= precedencia)):
+                        operador = None
+                        break
+
+                    op_token = tokens[posicion]
+                    if len(pila) - parentesis >= maximo:
+                        raise AnidamientoExcesivo(maximo, op_token.linea, op_token.columna)
+                    posicion += 1
+                    self.posicion = posicion
+                    siguiente = precedencia if operador.asociatividad == DERECHA else precedencia + 1
+
+                    # Operando derecho que es un identificador o número y no toma el
+                    # operador que le sigue: el marco que se apilaría solo lo devolvería,
+                    # así que el nodo se arma aquí y este marco sigue con el próximo operador
+                    if bits[posicion] & mascara_operando:
+                        operador_siguiente = operadores[clases[posicion + 1]]
+                        if operador_siguiente is None or operador_siguiente.precedencia < siguiente:
+                            if depurar:
+                                log_sintactico.debug("Analizando componente...")
+                            token = tokens[posicion]
+                            valor = token.valor
+                            if token.tipo == 'IDENTIFICADOR':
+                                hoja = nodo_ast("bool" if valor in ('true', 'false') else "id", valor)
+                            else:
+                                hoja = nodo_ast("numero", valor)
+                            hoja.set_posicion(token.linea, token.columna)
+                            self.posicion = posicion + 1
+                            nuevo_nodo = nodo_ast(operador.tipo_nodo, op_token.valor)
+                            nuevo_nodo.agregar_hijo(marco[2])
+                            nuevo_nodo.agregar_hijo(hoja)
+                            nuevo_nodo.set_posicion(op_token.linea, op_token.columna)
+                            marco[2] = nuevo_nodo
+                            marco[3] = precedencia
+                            continue
+
+                    marco[5] = op_token
+                    marco[6] = operador
+                    pila.append([MARCO_BINARIO, siguiente, None, SIN_OPERADOR, SIN_OPERADOR, None, None])
+                    break
 
-        # ---- Identificadores y booleanos ----
-        if token.tipo == 'IDENTIFICADOR':
-            if token.valor in ['true', 'false']:
-                nodo = NodoAST("bool", token.valor)
+                if operador is None:
+                    pila.pop()
+                    resultado = (marco[2], marco[4])
+                    continue
+                break
             else:
-                nodo = NodoAST("id", token.valor)
-            nodo.set_posicion(token.linea, token.columna)
-            self.avanzar()
-            return nodo
-
-        # ---- Error ----
-        self.agregar_error(
-            f"Se esperaba número, identificador, expresión entre paréntesis o operador unario, se encontró '{token.valor}' ({token.tipo})",
-            (token.linea, token.columna)
-        )
-        return None
+                return resultado
 
 
     def seleccion(self):
         """seleccion → if expresion then lista_sentencias [ else lista_sentencias ] end"""
-        print("Analizando selección (if)...")
+        return ejecutar_recorrido(self._seleccion())
+
+    def _seleccion(self):
+        """Generador de seleccion para ejecutar_recorrido"""
+        if self.depurar:
+            log_sintactico.debug("Analizando selección (if)...")
         token_if = self.token_actual()
-        nodo_seleccion = NodoAnotado("seleccion", valor="if")
+        nodo_seleccion = self.nodo_anotado("seleccion", valor="if")
 
         # Consumir 'if'
         if not self.consumir('if', "Se esperaba 'if' al inicio de la selección"):
-            self.sincronizar_hasta(self.tokens_sync_sentencia)
+            self.sincronizar_sentencia()
             return None
 
         # Guardar posición del 'if'
@@ -1091,7 +2430,7 @@ class AnalizadorSintactico:
         # Expresión de condición
         expr = self.expresion()
         if expr:
-            nodo_cond = NodoAnotado("condicion")
+            nodo_cond = self.nodo_anotado("condicion")
             nodo_cond.agregar_hijo(expr)
             nodo_seleccion.agregar_hijo(nodo_cond)
         else:
@@ -1101,13 +2440,13 @@ class AnalizadorSintactico:
 
         # Consumir 'then'
         if not self.consumir('then', "Se esperaba 'then' después de la condición en el 'if'"):
-            self.sincronizar_hasta(self.tokens_sync_sentencia)
+            self.sincronizar_sentencia_abierta()
             return None
 
         # Lista de sentencias del bloque if
-        lista_if = self.lista_sentencias()
+        lista_if = yield self._lista_sentencias()
         if lista_if:
-            nodo_if = NodoAnotado("bloque_if")
+            nodo_if = self.nodo_anotado("bloque_if")
             nodo_if.agregar_hijo(lista_if)
             nodo_seleccion.agregar_hijo(nodo_if)
         else:
@@ -1119,8 +2458,8 @@ class AnalizadorSintactico:
             token_else = self.token_actual()
             self.avanzar()
 
-            lista_else = self.lista_sentencias()
-            nodo_else = NodoAnotado("bloque_else", valor="else")
+            lista_else = yield self._lista_sentencias()
+            nodo_else = self.nodo_anotado("bloque_else", valor="else")
             nodo_else.linea = getattr(token_else, "linea", 0)
             nodo_else.columna = getattr(token_else, "columna", 0)
 
@@ -1134,7 +2473,7 @@ class AnalizadorSintactico:
 
         # Consumir 'end'
         if not self.consumir('end', "Se esperaba 'end' para cerrar el bloque 'if'"):
-            self.sincronizar_hasta(self.tokens_sync_sentencia)
+            self.sincronizar_sentencia_abierta()
             return None
 
         return nodo_seleccion
@@ -1143,13 +2482,18 @@ class AnalizadorSintactico:
 
     def iteracion(self):
         """iteracion → while expresion lista_sentencias end"""
-        print("Analizando iteración (while)...")
+        return ejecutar_recorrido(self._iteracion())
+
+    def _iteracion(self):
+        """Generador de iteracion para ejecutar_recorrido"""
+        if self.depurar:
+            log_sintactico.debug("Analizando iteración (while)...")
         token_while = self.token_actual()
-        nodo_iteracion = NodoAnotado("iteracion", valor="while")
+        nodo_iteracion = self.nodo_anotado("iteracion", valor="while")
 
         # Consumir 'while'
         if not self.consumir('while', "Se esperaba 'while' para iniciar la iteración"):
-            self.sincronizar_hasta(self.tokens_sync_sentencia)
+            self.sincronizar_sentencia()
             return None
 
         # Guardar posición del 'while'
@@ -1159,7 +2503,7 @@ class AnalizadorSintactico:
         # Condición del while
         expr = self.expresion()
         if expr:
-            nodo_cond = NodoAnotado("condicion")
+            nodo_cond = self.nodo_anotado("condicion")
             nodo_cond.agregar_hijo(expr)
             nodo_iteracion.agregar_hijo(nodo_cond)
         else:
@@ -1168,9 +2512,9 @@ class AnalizadorSintactico:
             return None
 
         # Lista de sentencias del cuerpo del while
-        lista = self.lista_sentencias()
+        lista = yield self._lista_sentencias()
         if lista:
-            nodo_lista = NodoAnotado("bloque_while")
+            nodo_lista = self.nodo_anotado("bloque_while")
             nodo_lista.agregar_hijo(lista)
             nodo_iteracion.agregar_hijo(nodo_lista)
         else:
@@ -1179,16 +2523,21 @@ class AnalizadorSintactico:
 
         # Consumir 'end'
         if not self.consumir('end', "Se esperaba 'end' para cerrar el bloque 'while'"):
-            self.sincronizar_hasta(self.tokens_sync_sentencia)
+            self.sincronizar_sentencia_abierta()
 
         return nodo_iteracion
 
 
     def repeticion(self):
         """repeticion → do lista_sentencias (while|until) expresion"""
-        print("Analizando repetición (do-while/do-until)…")
+        return ejecutar_recorrido(self._repeticion())
+
+    def _repeticion(self):
+        """Generador de repeticion para ejecutar_recorrido"""
+        if self.depurar:
+            log_sintactico.debug("Analizando repetición (do-while/do-until)…")
         token_do = self.token_actual()
-        nodo = NodoAnotado("repeticion", valor="do")
+        nodo = self.nodo_anotado("repeticion", valor="do")
 
         # Consumir 'do'
         if not self.consumir('do', "Se esperaba 'do' al inicio de la repetición"):
@@ -1198,9 +2547,9 @@ class AnalizadorSintactico:
         nodo.columna = token_do.columna
 
         # Cuerpo del bucle
-        lista = self.lista_sentencias()
+        lista = yield self._lista_sentencias()
         if lista:
-            nodo_bloque = NodoAnotado("bloque_do")
+            nodo_bloque = self.nodo_anotado("bloque_do")
             nodo_bloque.agregar_hijo(lista)
             nodo.agregar_hijo(nodo_bloque)
 
@@ -1213,7 +2562,7 @@ class AnalizadorSintactico:
             # Condición
             expr = self.expresion()
             if expr:
-                nodo_cond = NodoAnotado("condicion", valor=tipo)
+                nodo_cond = self.nodo_anotado("condicion", valor=tipo)
                 nodo_cond.linea = token_tipo.linea
                 nodo_cond.columna = token_tipo.columna
                 nodo_cond.agregar_hijo(expr)
@@ -1230,10 +2579,11 @@ class AnalizadorSintactico:
 
     def sent_in(self):
         """sent_in → cin >> id ;"""
-        print("Analizando sentencia de entrada (cin)...")
+        if self.depurar:
+            log_sintactico.debug("Analizando sentencia de entrada (cin)...")
 
         token_cin = self.token_actual()
-        nodo = NodoAnotado("sent_in", valor="cin")
+        nodo = self.nodo_anotado("sent_in", valor="cin")
 
         if token_cin:
             nodo.linea = token_cin.linea
@@ -1244,7 +2594,7 @@ class AnalizadorSintactico:
 
         # Consumir '>>'
         if not self.consumir('>>', "Se esperaba '>>' después de cin"):
-            self.sincronizar_hasta([';'])
+            self.sincronizar_sentencia()
             return nodo
 
         # Identificador
@@ -1252,10 +2602,10 @@ class AnalizadorSintactico:
         if not self.coincidir('IDENTIFICADOR'):
             self.agregar_error("Se esperaba identificador después de cin >>",
                             self.obtener_ultima_posicion_valida())
-            self.sincronizar_hasta([';'])
+            self.sincronizar_sentencia()
             return nodo
 
-        nodo_id = NodoAnotado("id", valor=token_id.valor)
+        nodo_id = self.nodo_anotado("id", valor=token_id.valor)
         nodo_id.linea = token_id.linea
         nodo_id.columna = token_id.columna
         nodo.agregar_hijo(nodo_id)
@@ -1263,17 +2613,18 @@ class AnalizadorSintactico:
 
         # Consumir ';'
         if not self.consumir(';', "Se esperaba ';' después de la sentencia cin"):
-            self.sincronizar_hasta(self.tokens_sync_sentencia)
+            self.sincronizar_sentencia()
 
         return nodo
 
 
     def sent_out(self):
         """sent_out → cout << salida ;"""
-        print("Analizando sentencia de salida (cout)...")
+        if self.depurar:
+            log_sintactico.debug("Analizando sentencia de salida (cout)...")
 
         token_cout = self.token_actual()
-        nodo = NodoAnotado("sent_out", valor="cout")
+        nodo = self.nodo_anotado("sent_out", valor="cout")
 
         if token_cout:
             nodo.linea = token_cout.linea
@@ -1284,7 +2635,7 @@ class AnalizadorSintactico:
 
         # Consumir '<<'
         if not self.consumir('<<', "Se esperaba '<<' después de cout"):
-            self.sincronizar_hasta([';'])
+            self.sincronizar_sentencia()
             return nodo
 
         # Procesar salida
@@ -1294,15 +2645,16 @@ class AnalizadorSintactico:
 
         # Consumir ';'
         if not self.consumir(';', "Se esperaba ';' después de la sentencia cout"):
-            self.sincronizar_hasta(self.tokens_sync_sentencia)
+            self.sincronizar_sentencia()
 
         return nodo
 
 
     def salida(self):
         """salida → cadena | expresion | cadena << expresion | expresion << cadena"""
-        print("Analizando salida...")
-        nodo = NodoAnotado("salida")
+        if self.depurar:
+            log_sintactico.debug("Analizando salida...")
+        nodo = self.nodo_anotado("salida")
 
         token = self.token_actual()
         if not token:
@@ -1312,7 +2664,7 @@ class AnalizadorSintactico:
 
         # Si es cadena literal
         if token.tipo == 'CADENA':
-            nodo_cadena = NodoAnotado("cadena", valor=token.valor)
+            nodo_cadena = self.nodo_anotado("cadena", valor=token.valor)
             nodo_cadena.linea = token.linea
             nodo_cadena.columna = token.columna
             nodo.agregar_hijo(nodo_cadena)
@@ -1334,7 +2686,7 @@ class AnalizadorSintactico:
                 self.avanzar()
                 token_cad = self.token_actual()
                 if token_cad and token_cad.tipo == 'CADENA':
-                    nodo_cad = NodoAnotado("cadena", valor=token_cad.valor)
+                    nodo_cad = self.nodo_anotado("cadena", valor=token_cad.valor)
                     nodo_cad.linea = token_cad.linea
                     nodo_cad.columna = token_cad.columna
                     nodo.agregar_hijo(nodo_cad)
@@ -1348,7 +2700,8 @@ class AnalizadorSintactico:
 
     def incremento_decremento(self):
         """Maneja operadores ++ y -- como asignaciones implícitas"""
-        print("Analizando incremento/decremento...")
+        if self.depurar:
+            log_sintactico.debug("Analizando incremento/decremento...")
 
         token_id = self.consumir('IDENTIFICADOR')
         if not token_id:
@@ -1363,21 +2716,21 @@ class AnalizadorSintactico:
             self.avanzar()
 
             # Nodo asignación anotado
-            nodo_asig = NodoAnotado("asignacion", valor=token_id.valor)
+            nodo_asig = self.nodo_anotado("asignacion", valor=token_id.valor)
             nodo_asig.linea = token_id.linea
             nodo_asig.columna = token_id.columna
 
             # Nodo operación aritmética
             op = '+' if operador == '++' else '-'
-            nodo_expr = NodoAnotado("expresion_simple", valor=op)
+            nodo_expr = self.nodo_anotado("expresion_simple", valor=op)
             nodo_expr.linea = token_op.linea
             nodo_expr.columna = token_op.columna
 
             # Hijos
-            nodo_id = NodoAnotado("id", valor=token_id.valor)
+            nodo_id = self.nodo_anotado("id", valor=token_id.valor)
             nodo_id.linea = token_id.linea
             nodo_id.columna = token_id.columna
-            nodo_num = NodoAnotado("numero", valor="1")
+            nodo_num = self.nodo_anotado("numero", valor="1")
 
             nodo_expr.agregar_hijo(nodo_id)
             nodo_expr.agregar_hijo(nodo_num)
@@ -1385,30 +2738,28 @@ class AnalizadorSintactico:
 
             # Consumir ';'
             if not self.consumir(';', "Se esperaba ';' después del incremento/decremento"):
-                self.sincronizar_hasta(self.tokens_sync_sentencia)
+                self.sincronizar_sentencia()
 
             return nodo_asig
 
         # Si no hay ++ o --
         self.agregar_error("Se esperaba operador '++' o '--' después del identificador",
                         self.obtener_ultima_posicion_valida())
-        self.sincronizar_hasta(self.tokens_sync_sentencia)
+        self.sincronizar_sentencia()
         return None
 
     
     def analizar(self):
         """Inicia el análisis sintáctico"""
         try:
-            print("Iniciando análisis sintáctico...")
-            print(f"Tokens a analizar: {len(self.tokens)}")
+            log_sintactico.info("Iniciando análisis sintáctico: %d tokens", len(self.tokens))
             
             if not self.tokens:
                 self.agregar_error("No hay tokens para analizar", (1, 1))
                 return None, self.errores
             
             self.ast = self.programa()
-            print("AST generado:")
-            print(self.ast)
+            log_sintactico.debug("AST generado: %s", self.ast)
                         
 
             # print("\n=== ÁRBOL SINTÁCTICO CON POSICIONES ===")
@@ -1422,16 +2773,185 @@ class AnalizadorSintactico:
                     (token.linea, token.columna)
                 )
             
-            print(f"Análisis completado. Errores encontrados: {len(self.errores)}")
+            log_sintactico.info("Análisis completado. Errores encontrados: %d", len(self.errores))
             return self.ast, self.errores
             
+        except AnidamientoExcesivo as e:
+            log_sintactico.warning("%s", e)
+            self.errores.append(ErrorSintactico(str(e), e.linea, e.columna))
+            return None, self.errores
+
+        except DemasiadosErrores as e:
+            log_sintactico.warning("%s (%d errores en cascada suprimidos)", e, self.errores_suprimidos)
+            return None, self.errores
+
         except Exception as e:
-            print(f"Error interno del analizador: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            self.agregar_error(f"Error interno del analizador: {str(e)}", self.obtener_ultima_posicion_valida())
+            log_sintactico.exception("Error interno del analizador: %s", e)
+            linea, columna = self.obtener_ultima_posicion_valida()
+            self.errores.append(ErrorSintactico(f"Error interno del analizador: {str(e)}", linea, columna))
             return None, self.errores
 
+    def esquema(self):
+        """
+        Análisis de esqueleto: reconoce main, las declaraciones y los límites de
+        las sentencias y bloques if/while/do, y salta las expresiones con
+        _saltar_expresion sin armar sus nodos. Retorna el NodoEsquema 'programa'
+        (None si no hay tokens) para mostrar la estructura del programa; no
+        reporta errores, y ante uno sigue desde el siguiente token que reconoce.
+        Recorre los tokens una vez con una pila de bloques abiertos.
+        """
+        if not self.tokens:
+            return None
+        mascara = CLASES_TOKEN.mascara
+        m_tipo, m_identificador = self.mascara_tipo_dato, self.mascara_identificador
+        m_if, m_while, m_do = mascara('if'), mascara('while'), mascara('do')
+        m_else, m_end, m_until = mascara('else'), mascara('end'), mascara('until')
+        m_entrada_salida, m_flecha = mascara('cin', 'cout'), mascara('<<', '>>')
+        m_id_o_coma, m_coma = mascara('IDENTIFICADOR', ','), mascara(',')
+        m_llave_abre, m_llave_cierra = mascara('{'), mascara('}')
+        m_punto_y_coma, m_asignacion, m_incremento = self.mascara_punto_y_coma, self.mascara_asignacion, self.mascara_incremento
+        m_then = mascara('then')
+        # 'bool' es IDENTIFICADOR para el léxico: seguido de '=', '++' o '--' es una asignación
+        m_sigue_asignacion = m_asignacion | m_incremento
+        tokens, bits, n = self.tokens, self.bits, self.cantidad_tokens
+        saltar_expresion = self._saltar_expresion
+
+        def nodo(tipo, valor, i):
+            token = tokens[i]
+            return NodoEsquema(tipo, valor, token.linea, token.columna, i)
+
+        raiz = nodo("programa", None, 0)
+        abiertos = [raiz]
+        i = 0
+        if bits[0] & mascara('main'):
+            nodo_main = nodo("main", None, 0)
+            raiz.hijos.append(nodo_main)
+            abiertos.append(nodo_main)
+            i = 2 if bits[1] & m_llave_abre else 1
+
+        while i < n:
+            b = bits[i]
+            actual = abiertos[-1]
+            if b & m_tipo and not (b & m_identificador and bits[i + 1] & m_sigue_asignacion):
+                declaracion = nodo("declaracion_variable", tokens[i].valor, i)
+                j = i + 1
+                while bits[j] & m_id_o_coma:
+                    if not bits[j] & m_coma:
+                        declaracion.hijos.append(nodo("id", tokens[j].valor, j))
+                        declaracion.hijos[-1].fin = j + 1
+                    j += 1
+                if bits[j] & m_punto_y_coma:
+                    j += 1
+                declaracion.fin = j
+                actual.hijos.append(declaracion)
+                i = j
+            elif b & m_until:
+                # Cierra el do abierto con su condición; fuera de un do se ignora
+                j = i + 1
+                if actual.tipo == "repeticion":
+                    j = saltar_expresion(j)
+                    actual.fin = j
+                    abiertos.pop()
+                i = j
+            elif b & m_identificador:
+                asignacion = nodo("asignacion", tokens[i].valor, i)
+                j = i + 1
+                if bits[j] & m_asignacion:
+                    j = saltar_expresion(j + 1)
+                elif bits[j] & m_incremento:
+                    j += 1
+                if bits[j] & m_punto_y_coma:
+                    j += 1
+                asignacion.fin = j
+                actual.hijos.append(asignacion)
+                i = j
+            elif b & (m_if | m_while | m_do):
+                if b & m_if:
+                    bloque = nodo("seleccion", "if", i)
+                    j = saltar_expresion(i + 1)
+                    if bits[j] & m_then:
+                        j += 1
+                elif b & m_while:
+                    bloque = nodo("iteracion", "while", i)
+                    j = saltar_expresion(i + 1)
+                else:
+                    bloque = nodo("repeticion", "do", i)
+                    j = i + 1
+                actual.hijos.append(bloque)
+                abiertos.append(bloque)
+                i = j
+            elif b & m_else:
+                if actual.tipo == "seleccion":
+                    bloque_else = nodo("bloque_else", "else", i)
+                    actual.hijos.append(bloque_else)
+                    abiertos.append(bloque_else)
+                i += 1
+            elif b & m_end:
+                if actual.tipo == "bloque_else":
+                    actual.fin = i
+                    abiertos.pop()
+                    actual = abiertos[-1]
+                if actual.tipo in ("seleccion", "iteracion"):
+                    actual.fin = i + 1
+                    abiertos.pop()
+                i += 1
+            elif b & m_entrada_salida:
+                token = tokens[i]
+                sentencia = nodo("sent_in" if token.valor == "cin" else "sent_out", token.valor, i)
+                j = i + 1
+                if bits[j] & m_flecha:
+                    j += 1
+                j = saltar_expresion(j)
+                if bits[j] & m_punto_y_coma:
+                    j += 1
+                sentencia.fin = j
+                actual.hijos.append(sentencia)
+                i = j
+            elif b & m_llave_cierra and len(abiertos) > 1 and abiertos[1].tipo == "main":
+                # '}' cierra main y los bloques que hayan quedado abiertos en él
+                while len(abiertos) > 1:
+                    abiertos.pop().fin = i + 1
+                i += 1
+            else:
+                i += 1
+
+        # Los bloques que el programa no cierra llegan hasta el final
+        for bloque in abiertos:
+            if bloque.fin is None:
+                bloque.fin = n
+        raiz.fin = n
+        return raiz
+
+    def _saltar_expresion(self, j):
+        """
+        Índice del primer token después de la expresión que empieza en j, sin
+        analizarla: alterna operandos y operadores binarios, acepta signos
+        unarios y solo cuenta los paréntesis para saber cuál la cierra. j si no
+        empieza una expresión.
+        """
+        bits = self.bits
+        m_operando = self.mascara_operando
+        m_operador = self.mascara_operador_binario
+        m_signo, m_abre, m_cierra = self.mascara_signo, self.mascara_abre_parentesis, self.mascara_cierra_parentesis
+        parentesis = 0
+        esperando_operando = True
+        while True:
+            b = bits[j]
+            if esperando_operando:
+                if b & m_operando:
+                    esperando_operando = False
+                elif b & m_abre:
+                    parentesis += 1
+                elif not b & m_signo:
+                    return j
+            elif b & m_operador:
+                esperando_operando = True
+            elif b & m_cierra and parentesis:
+                parentesis -= 1
+            else:
+                return j
+            j += 1
+
     def procesar_declaracion(self, nodo, nodo_anotado):
         """Procesa declaración de variables."""
         tipo_dato = None
@@ -1476,19 +2996,379 @@ class AnalizadorSintactico:
                         nodo_anotado.agregar_hijo(id_anotado)
     
         nodo_anotado.tipo_dato = tipo_dato
+
+
+class TablaPredictiva:
+    """
+    TABLA_LL1 de gramatica.py pasada a clases de token. Cada no terminal tiene un
+    número y una fila indexada por el código de clase del token actual, con la
+    alternativa a expandir: (acción o None, símbolos en orden inverso para apilar;
+    los no terminales son enteros y los terminales sus nombres). Una clase cumple su
+    tipo y su valor; si los dos tienen celda gana el valor, como en el analizador
+    descendente, que prueba antes las palabras clave (('IDENTIFICADOR', 'true')
+    es un literal, no una variable). Sin celda, un no terminal anulable toma su alternativa vacía.
+    Las filas crecen cuando ClasesToken registra clases nuevas.
+    """
+
+    def __init__(self, inicial=INICIAL, producciones=PRODUCCIONES, acciones=ACCIONES, tabla=TABLA_LL1):
+        self.nombres = list(producciones)
+        numero = {nombre: indice for indice, nombre in enumerate(self.nombres)}
+        self.inicial = numero[inicial]
+        self.acciones = sorted({accion for lista in acciones.values() for accion in lista if accion})
+        # Por no terminal: {terminal: alternativa compilada} y la alternativa vacía o None
+        self.celdas = []
+        self.vacias = []
+        for nombre in self.nombres:
+            compiladas = [
+                (accion, tuple(numero.get(simbolo, simbolo) for simbolo in reversed(alternativa)))
+                for alternativa, accion in zip(producciones[nombre], acciones[nombre])
+            ]
+            self.celdas.append({terminal: compiladas[indice] for terminal, indice in tabla[nombre].items()
+                                if terminal != FIN})
+            vacia = [compilada for alternativa, compilada in zip(producciones[nombre], compiladas) if not alternativa]
+            self.vacias.append(vacia[0] if vacia else None)
+        self.filas = [[] for _ in self.nombres]
+        self.claves = []  # código de clase -> (tipo, valor) de las columnas ya armadas
+
+    def para(self, clases_token):
+        """Las filas, con una columna por cada clase registrada en clases_token"""
+        if len(self.claves) < len(clases_token.codigos):
+            por_codigo = {codigo: clave for clave, codigo in clases_token.codigos.items()}
+            nuevas = [por_codigo[codigo] for codigo in range(len(self.claves), len(por_codigo))]
+            for fila, celdas, vacia in zip(self.filas, self.celdas, self.vacias):
+                for tipo, valor in nuevas:
+                    celda = celdas.get(valor) if valor is not None else None
+                    fila.append(celda or celdas.get(tipo) or vacia)
+            self.claves.extend(nuevas)
+        return self.filas
+
+
+TABLA_PREDICTIVA = TablaPredictiva()
+
+
+class AnalizadorPredictivo(AnalizadorSintactico):
+    """
+    Analizador LL(1) dirigido por TablaPredictiva: expande los no terminales en una
+    pila explícita según la clase del token actual, sin recursión, y arma el AST con
+    las acciones de la gramática (métodos accion_*), con los mismos nodos que el
+    analizador descendente. Se elige con motor="tabla" en analizador_sintactico_tokens.
+    Agregar producciones no cambia el costo por token: cada paso es una celda.
+
+    Cada terminal aporta su token a la pila de valores y cada acción reemplaza los
+    valores de su alternativa por el nodo que arma; lo que falta por un error queda
+    como None, así los valores de una alternativa están siempre en su lugar.
+
+    Recuperación de errores en modo pánico: un no terminal sin celda salta tokens
+    hasta uno de sus PRIMEROS (y se reintenta) o de sus SIGUIENTES (y se abandona);
+    un terminal que falta salta hasta encontrarlo o hasta un token de sincronización
+    de sentencia (y se da por insertado). Hasta volver a coincidir un terminal no se
+    reportan más errores. No lleva RegistroLista: AnalizadorIncremental usa siempre
+    el analizador descendente.
+    """
+
+    def __init__(self, tokens, profundidad_maxima=PROFUNDIDAD_MAXIMA, clasificacion=None, arena=False,
+                 maximo_errores=MAXIMO_ERRORES_SINTACTICOS):
+        super().__init__(tokens, profundidad_maxima, clasificacion, arena, maximo_errores)
+        self.tabla = TABLA_PREDICTIVA
+        self.filas = TABLA_PREDICTIVA.para(CLASES_TOKEN)
+        self.acciones = {nombre: getattr(self, "accion_" + nombre) for nombre in TABLA_PREDICTIVA.acciones}
+        # No terminal -> (máscara de PRIMEROS, máscara de SIGUIENTES), al recuperarse
+        self.mascaras_no_terminal = {}
+
+    def programa(self):
+        """Ejecuta la tabla desde el símbolo inicial; retorna el nodo programa"""
+        filas = self.filas
+        acciones = self.acciones
+        mascaras = self.mascaras
+        tokens, clases, bits = self.tokens, self.clases, self.bits
+        pila = [self.tabla.inicial]
+        valores = []
+
+        while pila:
+            simbolo = pila.pop()
+            clase_simbolo = simbolo.__class__
+            if clase_simbolo is int:
+                alternativa = filas[simbolo][clases[self.posicion]]
+                if alternativa is None:
+                    self._recuperar_no_terminal(simbolo, pila, valores)
+                    continue
+                accion, simbolos = alternativa
+                if accion is not None:
+                    pila.append((acciones[accion], len(valores)))
+                pila.extend(simbolos)
+            elif clase_simbolo is str:
+                if bits[self.posicion] & mascaras.get(simbolo, 0):
+                    valores.append(tokens[self.posicion])
+                    self.posicion += 1
+                    self.en_modo_panico = False
+                else:
+                    self._recuperar_terminal(simbolo, pila, valores)
+            else:
+                metodo, inicio = simbolo
+                nodo = metodo(valores[inicio:])
+                del valores[inicio:]
+                valores.append(nodo)
+
+        if valores and valores[0] is not None:
+            return valores[0]
+        # Sin 'main' el descendente también retorna un programa vacío
+        nodo_programa = self.nodo_ast("programa")
+        if self.tokens:
+            nodo_programa.set_posicion(self.tokens[0].linea, self.tokens[0].columna)
+        return nodo_programa
+
+    # -------- RECUPERACIÓN DE ERRORES -------- #
+
+    def _error(self, esperado):
+        """Reporta que se esperaba `esperado` en el token actual, salvo en modo pánico"""
+        if self.en_modo_panico:
+            return
+        self.en_modo_panico = True
+        token = self.token_actual()
+        if token is None:
+            self.agregar_error(f"Se esperaba {esperado} pero se alcanzó el final del archivo",
+                               self.obtener_ultima_posicion_valida())
+        else:
+            self.agregar_error(f"Se esperaba {esperado} pero se encontró '{token.valor}' ({token.tipo})",
+                               (token.linea, token.columna))
+
+    def _recuperar_terminal(self, terminal, pila, valores):
+        self._error(f"'{terminal}'")
+        mascara = CLASES_TOKEN.mascara(terminal)
+        self.sincronizar_hasta(mascara | self.sync_sentencia)
+        if self.bits[self.posicion] & mascara:
+            pila.append(terminal)
+        else:
+            valores.append(None)
+
+    def _recuperar_no_terminal(self, simbolo, pila, valores):
+        nombre = self.tabla.nombres[simbolo]
+        self._error(nombre.replace('_', ' '))
+        mascaras = self.mascaras_no_terminal.get(simbolo)
+        if mascaras is None:
+            mascaras = self.mascaras_no_terminal[simbolo] = (
+                CLASES_TOKEN.mascara(*(PRIMEROS[nombre] - {VACIO})),
+                CLASES_TOKEN.mascara(*(SIGUIENTES[nombre] - {FIN})),
+            )
+        primeros, siguientes = mascaras
+        self.sincronizar_hasta(primeros | siguientes)
+        if self.bits[self.posicion] & primeros:
+            pila.append(simbolo)
+        else:
+            valores.append(None)
+
+    # -------- ACCIONES -------- #
+    # Cada una recibe los valores de su alternativa: tokens, nodos o None
+
+    def accion_programa(self, valores):
+        token_main = valores[0]
+        nodo_programa = self.nodo_ast("programa")
+        token_inicio = self.tokens[0]
+        nodo_programa.set_posicion(token_inicio.linea, token_inicio.columna)
+        nodo_main = self.nodo_ast("main")
+        if token_main is not None:
+            nodo_main.set_posicion(token_main.linea, token_main.columna)
+
+        # Como lista_declaracion: un solo nodo aporta sus hijos
+        nodos = [nodo for nodo in valores[2:-1] if nodo is not None]
+        if len(nodos) == 1:
+            nodos = nodos[0].hijos
+        for nodo in nodos:
+            nodo_main.agregar_hijo(nodo)
+        nodo_programa.agregar_hijo(nodo_main)
+        return nodo_programa
+
+    def accion_declaracion_variable(self, valores):
+        token_tipo, nodo_identificador = valores[0], valores[1]
+        nodo = self.nodo_ast("declaracion_variable")
+        nodo.set_posicion(token_tipo.linea, token_tipo.columna)
+        nodo.agregar_hijo(self.nodo_ast("tipo", token_tipo.valor).set_posicion(token_tipo.linea, token_tipo.columna))
+        nodo.agregar_hijo(nodo_identificador)
+        return nodo
+
+    def accion_identificador(self, valores):
+        # IDENTIFICADOR (',' IDENTIFICADOR)*
+        ids = [token for token in valores[::2] if token is not None]
+        nodo = self.nodo_ast("identificador").set_posicion(ids[0].linea, ids[0].columna)
+        for token in ids:
+            nodo.agregar_hijo(self.nodo_ast("id", token.valor).set_posicion(token.linea, token.columna))
+        return nodo
+
+    def accion_asignacion(self, valores):
+        # IDENTIFICADOR '=' expresion ';' | IDENTIFICADOR '=' ';' | IDENTIFICADOR ('++' | '--') ';'
+        token_id, token_op = valores[0], valores[1]
+        nodo = self.nodo_anotado("asignacion", token_id.valor)
+        nodo.set_posicion(token_id.linea, token_id.columna)
+        if token_op is None:
+            return nodo
+
+        if token_op.valor in ('++', '--'):
+            nodo_expr = self.nodo_anotado("expresion_simple", '+' if token_op.valor == '++' else '-')
+            nodo_expr.set_posicion(token_op.linea, token_op.columna)
+            nodo_expr.agregar_hijo(self.nodo_anotado("id", token_id.valor).set_posicion(token_id.linea, token_id.columna))
+            nodo_expr.agregar_hijo(self.nodo_anotado("numero", "1"))
+            nodo.agregar_hijo(nodo_expr)
+        elif isinstance(valores[2], (NodoAST, NodoArena)):
+            nodo.agregar_hijo(valores[2])
+        elif valores[2] is not None:
+            token_puntoycoma = valores[2]
+            nodo.agregar_hijo(self.nodo_ast("expresion_vacia").set_posicion(token_puntoycoma.linea, token_puntoycoma.columna))
+        return nodo
+
+    def _lista(self, valores):
+        """NodoAnotado lista_sentencias con las sentencias de valores, o None si no hay"""
+        sentencias = [sentencia for sentencia in valores if sentencia is not None]
+        if not sentencias:
+            return None
+        lista = self.nodo_anotado("lista_sentencias")
+        for sentencia in sentencias:
+            lista.agregar_hijo(sentencia)
+        return lista
+
+    def _bloque(self, tipo, lista, mensaje_vacio=None):
+        if lista is None:
+            if mensaje_vacio:
+                self.agregar_error(mensaje_vacio, self.obtener_ultima_posicion_valida())
+            return None
+        nodo = self.nodo_anotado(tipo)
+        nodo.agregar_hijo(lista)
+        return nodo
+
+    def accion_bloque_if(self, valores):
+        return self._bloque("bloque_if", self._lista(valores), "El bloque 'if' no contiene sentencias válidas")
+
+    def accion_bloque_while(self, valores):
+        return self._bloque("bloque_while", self._lista(valores), "El bloque 'while' no contiene sentencias válidas")
+
+    def accion_bloque_do(self, valores):
+        return self._bloque("bloque_do", self._lista(valores))
+
+    def accion_bloque_else(self, valores):
+        token_else = valores[0]
+        nodo = self.nodo_anotado("bloque_else", valor="else").set_posicion(token_else.linea, token_else.columna)
+        lista = self._lista(valores[1:])
+        if lista is None:
+            self.agregar_error("El bloque 'else' no contiene sentencias válidas", self.obtener_ultima_posicion_valida())
+        else:
+            nodo.agregar_hijo(lista)
+        return nodo
+
+    def _condicion(self, expr, token=None):
+        nodo = self.nodo_anotado("condicion", valor=token.valor if token is not None else None)
+        if token is not None:
+            nodo.set_posicion(token.linea, token.columna)
+        nodo.agregar_hijo(expr)
+        return nodo
+
+    def accion_seleccion(self, valores):
+        # 'if' expresion 'then' bloque_if [bloque_else] 'end'
+        token_if, expr = valores[0], valores[1]
+        nodo = self.nodo_anotado("seleccion", valor="if").set_posicion(token_if.linea, token_if.columna)
+        if expr is not None:
+            nodo.agregar_hijo(self._condicion(expr))
+        nodo.agregar_hijo(valores[3])
+        if len(valores) == 6:
+            nodo.agregar_hijo(valores[4])
+        return nodo
+
+    def accion_iteracion(self, valores):
+        # 'while' expresion bloque_while 'end'
+        token_while, expr = valores[0], valores[1]
+        nodo = self.nodo_anotado("iteracion", valor="while").set_posicion(token_while.linea, token_while.columna)
+        if expr is not None:
+            nodo.agregar_hijo(self._condicion(expr))
+        nodo.agregar_hijo(valores[2])
+        return nodo
+
+    def accion_repeticion(self, valores):
+        # 'do' bloque_do 'until' expresion
+        token_do, bloque, token_until, expr = valores
+        nodo = self.nodo_anotado("repeticion", valor="do").set_posicion(token_do.linea, token_do.columna)
+        nodo.agregar_hijo(bloque)
+        if token_until is not None and expr is not None:
+            nodo.agregar_hijo(self._condicion(expr, token_until))
+        return nodo
+
+    def accion_sent_in(self, valores):
+        # 'cin' '>>' IDENTIFICADOR ';'
+        token_cin, token_id = valores[0], valores[2]
+        nodo = self.nodo_anotado("sent_in", valor="cin").set_posicion(token_cin.linea, token_cin.columna)
+        if token_id is not None:
+            nodo.agregar_hijo(self.nodo_anotado("id", valor=token_id.valor).set_posicion(token_id.linea, token_id.columna))
+        return nodo
+
+    def accion_sent_out(self, valores):
+        # 'cout' '<<' expresion ';'
+        token_cout, expr = valores[0], valores[2]
+        nodo = self.nodo_anotado("sent_out", valor="cout").set_posicion(token_cout.linea, token_cout.columna)
+        if valores[1] is not None:
+            salida = self.nodo_anotado("salida")
+            salida.agregar_hijo(expr)
+            nodo.agregar_hijo(salida)
+        return nodo
+
+    def accion_binaria(self, valores):
+        # operando (operador operando)*, agrupado a la izquierda
+        nodo = valores[0]
+        for i in range(1, len(valores), 2):
+            token_op, derecho = valores[i], valores[i + 1]
+            if nodo is None or derecho is None:
+                nodo = nodo or derecho
+                continue
+            operadores = OPERADORES_BINARIOS[token_op.tipo]
+            operador = operadores.get(token_op.valor) or operadores[None]
+            nuevo = self.nodo_ast(operador.tipo_nodo, token_op.valor).set_posicion(token_op.linea, token_op.columna)
+            nuevo.agregar_hijo(nodo)
+            nuevo.agregar_hijo(derecho)
+            nodo = nuevo
+        return nodo
+
+    def accion_hoja(self, valores):
+        token = valores[0]
+        if token.tipo == 'IDENTIFICADOR':
+            nodo = self.nodo_ast("bool" if token.valor in ('true', 'false') else "id", token.valor)
+        else:
+            nodo = self.nodo_ast("numero", token.valor)
+        return nodo.set_posicion(token.linea, token.columna)
+
+    def accion_parentesis(self, valores):
+        return valores[1]
+
+    def accion_unario(self, valores):
+        token_op, componente = valores
+        nodo = self.nodo_ast("unario", token_op.valor).set_posicion(token_op.linea, token_op.columna)
+        nodo.agregar_hijo(componente)
+        return nodo
+
+
+# Analizadores sintácticos que se pueden elegir con motor=
+MOTORES_SINTACTICOS = {
+    "descendente": AnalizadorSintactico,
+    "tabla": AnalizadorPredictivo,
+}
+
+
 # lectura Lexico
 def leer_tokens_desde_archivo(nombre_archivo="tokens.txt"):
     """
-    Lee tokens desde un archivo de texto generado por el analizador léxico
+    Lee tokens desde un archivo generado por el analizador léxico: binario
+    (ver archivo_tokens.py) o de texto
     """
+    if es_archivo_binario(nombre_archivo):
+        return [
+            Token(mapear_tipo_token(token.tipo), token.valor, token.linea, token.columna)
+            for token in ArchivoTokens(nombre_archivo)
+        ]
+
     tokens = []
+    depurar = depuracion_activa(log_sintactico)
     
     try:
         with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
             contenido = archivo.read().strip()
             
         if not contenido:
-            print("Advertencia: El archivo de tokens está vacío")
+            log_sintactico.warning("El archivo de tokens está vacío")
             return tokens
             
         # Dividir por líneas y procesar cada línea
@@ -1524,49 +3404,38 @@ def leer_tokens_desde_archivo(nombre_archivo="tokens.txt"):
                 # Si se parseó correctamente, agregarlo
                 if token_parseado:
                     tokens.append(token_parseado)
-                    print(f"Token parseado: {token_parseado}")
+                    if depurar:
+                        log_sintactico.debug("Token parseado: %s", token_parseado)
                 else:
-                    print(f"No se pudo parsear la línea {num_linea}: {linea_texto}")
+                    log_sintactico.warning("No se pudo parsear la línea %d: %s", num_linea, linea_texto)
                     
             except Exception as e:
-                print(f"Error al procesar línea {num_linea}: {linea_texto} - {e}")
+                log_sintactico.warning("Error al procesar línea %d: %s - %s", num_linea, linea_texto, e)
                 continue
     
     except FileNotFoundError:
-        print(f"Error: No se pudo encontrar el archivo {nombre_archivo}")
+        log_sintactico.error("No se pudo encontrar el archivo %s", nombre_archivo)
         return []
     except Exception as e:
-        print(f"Error al leer el archivo de tokens: {e}")
+        log_sintactico.error("Error al leer el archivo de tokens: %s", e)
         return []
     
-    print(f"Total de tokens leídos: {len(tokens)}")
+    log_sintactico.info("Total de tokens leídos: %d", len(tokens))
     return tokens
 
 def mapear_tipo_token(tipo_lexico):
     """
     Mapea los tipos de tokens del analizador léxico a los esperados por el sintáctico
+    (TIPOS_SINTACTICOS de automata_lexico.py); los demás se conservan
     """
-    mapeo = {
-        'PALABRA_RESERVADA': 'PALABRA_RESERVADA',
-        'IDENTIFICADOR': 'IDENTIFICADOR',
-        'NUMERO_ENTERO': 'NUMERO_ENTERO',
-        'NUMERO_REAL': 'NUMERO_DECIMAL',
-        'OPERADOR_ARITMETICO': 'OPERADOR_ARITMETICO',
-        'OPERADOR_RELACIONAL': 'OPERADOR_RELACIONAL',
-        'OPERADOR_LOGICO': 'OPERADOR_LOGICO',
-        'OPERADOR_ASIGNACION': 'OPERADOR_ASIGNACION',
-        'ESPECIAL': 'ESPECIAL',
-        'ERROR': 'ERROR'
-    }
-    
-    return mapeo.get(tipo_lexico, tipo_lexico)
+    return TIPOS_SINTACTICOS.get(tipo_lexico, tipo_lexico)
 
 
 def analizador_sintactico(archivo_tokens="tokens.txt"):
     """
     Función principal del analizador sintáctico
     """
-    print(f"Iniciando análisis sintáctico desde archivo: {archivo_tokens}")
+    log_sintactico.info("Iniciando análisis sintáctico desde archivo: %s", archivo_tokens)
     
     # Leer tokens desde archivo
     tokens = leer_tokens_desde_archivo(archivo_tokens)
@@ -1575,17 +3444,16 @@ def analizador_sintactico(archivo_tokens="tokens.txt"):
         return None, [ErrorSintactico("No se pudieron cargar los tokens del archivo", 1, 1)]
     
     # Filtrar tokens que no necesita el analizador sintáctico
-    tokens_validos = []
-    for token in tokens:
-        if token.tipo not in ['ERROR']:
-            tokens_validos.append(token)
+    tokens_validos = TokenBuffer(token for token in tokens if token.tipo not in ['ERROR'])
+    del tokens
     
     if not tokens_validos:
         return None, [ErrorSintactico("No se encontraron tokens válidos para analizar", 1, 1)]
     
-    print(f"Tokens válidos para análisis: {len(tokens_validos)}")
-    for i, token in enumerate(tokens_validos):
-        print(f"  {i}: {token}")
+    log_sintactico.info("Tokens válidos para análisis: %d", len(tokens_validos))
+    if depuracion_activa(log_sintactico):
+        for i, token in enumerate(tokens_validos):
+            log_sintactico.debug("  %d: %s", i, token)
     
     # Crear analizador y ejecutar análisis
     analizador = AnalizadorSintactico(tokens_validos)
@@ -1593,17 +3461,381 @@ def analizador_sintactico(archivo_tokens="tokens.txt"):
     
     return ast, errores
 
+def tokens_sintacticos(tokens):
+    """TokenBuffer de los tokens del analizador léxico sin los ERROR y con los tipos de mapear_tipo_token"""
+    tokens_validos = TokenBuffer()
+    for token in tokens:
+        if token.tipo != 'ERROR':
+            tokens_validos.agregar(mapear_tipo_token(token.tipo), token.valor, token.linea, token.columna)
+    return tokens_validos
+
+def analizador_sintactico_tokens(tokens, motor="descendente", arena=False, maximo_errores=MAXIMO_ERRORES_SINTACTICOS):
+    """
+    Analiza directamente la lista de tokens del analizador léxico, sin pasar
+    por tokens.txt. Descarta los ERROR y mapea los tipos como mapear_tipo_token.
+    motor: "descendente" (AnalizadorSintactico) o "tabla" (AnalizadorPredictivo,
+    LL(1) con la tabla generada de gramatica.py). Con arena=True el AST se arma
+    en una ArenaAST y se retorna la vista NodoArena de su raíz. Con más de
+    maximo_errores errores el análisis se detiene y no hay AST.
+    """
+    clase_analizador = MOTORES_SINTACTICOS.get(motor)
+    if clase_analizador is None:
+        raise ValueError(f"Motor sintáctico desconocido: {motor}")
+
+    tokens_validos = tokens_sintacticos(tokens)
+
+    if not tokens_validos:
+        return None, [ErrorSintactico("No se encontraron tokens válidos para analizar", 1, 1)]
+
+    analizador = clase_analizador(tokens_validos, arena=arena, maximo_errores=maximo_errores)
+    return analizador.analizar()
+
+
+def esquema_tokens(tokens):
+    """
+    NodoEsquema del programa de los tokens del analizador léxico (ver
+    AnalizadorSintactico.esquema), con los mismos tokens que analiza
+    analizador_sintactico_tokens; None si no hay tokens válidos.
+    """
+    tokens_validos = tokens_sintacticos(tokens)
+    if not tokens_validos:
+        return None
+    return AnalizadorSintactico(tokens_validos).esquema()
+
+
+def _linea_token(token):
+    return token.linea
+
+
+def _desplazar_lineas(nodos, lineas):
+    """Suma lineas a la línea de los nodos y de todos sus descendientes"""
+    if not lineas:
+        return
+    pila = list(nodos)
+    while pila:
+        nodo = pila.pop()
+        if nodo.linea:
+            nodo.linea += lineas
+        pila.extend(nodo.hijos)
+
+
+def _camino_hasta(nodo, buscado):
+    """Índices de los hijos que llevan de nodo a buscado (hasta dos niveles), o None"""
+    for i, hijo in enumerate(nodo.hijos):
+        if hijo is buscado:
+            return [i]
+        for j, nieto in enumerate(hijo.hijos):
+            if nieto is buscado:
+                return [i, j]
+    return None
+
+
+def _copiar_camino(nodo, camino, nuevo, lineas):
+    """
+    Copia de nodo en la que el descendiente de camino pasa a ser nuevo. Solo se
+    copian los nodos del camino; los hermanos que quedan después se reutilizan
+    con la línea desplazada en lineas.
+    """
+    copia = copy.copy(nodo)
+    copia.hijos = list(nodo.hijos)
+    indice = camino[0]
+    _desplazar_lineas(copia.hijos[indice + 1:], lineas)
+    if len(camino) > 1:
+        copia.hijos[indice] = _copiar_camino(nodo.hijos[indice], camino[1:], nuevo, lineas)
+    else:
+        copia.hijos[indice] = nuevo
+    return copia
+
+
+class AnalizadorIncremental:
+    """
+    Análisis sintáctico del editor que reutiliza el resultado anterior. Cada cambio
+    del texto se informa por líneas con registrar_edicion(); analizar() vuelve a
+    analizar desde la sentencia de la lista más interna que contiene lo editado y
+    se detiene en cuanto la posición coincide con un punto de control del análisis
+    anterior (ver RegistroLista). Si la lista no resincroniza, se sigue con la
+    sentencia que la contiene, y si ni la de main lo hace (o la edición toca las
+    declaraciones) se analiza todo.
+
+    Los subárboles de las sentencias no tocadas se reutilizan por referencia y
+    los nodos desde la lista editada hasta la raíz se copian. Si la edición cambia
+    la cantidad de líneas, a los nodos y errores reutilizados que siguen se les
+    corrige la línea en su lugar. El resultado es el de analizador_sintactico_tokens.
+
+    Las listas se reanalizan sin límite de errores y el límite se aplica al
+    resultado (ver _resultado); un análisis completo que lo alcanza no se reutiliza.
+
+    generacion cambia cada vez que se corrige la línea de nodos o errores de un
+    resultado ya entregado: un resultado guardado sigue siendo válido mientras no cambie.
+    """
+
+    def __init__(self, profundidad_maxima=PROFUNDIDAD_MAXIMA, maximo_errores=MAXIMO_ERRORES_SINTACTICOS):
+        self.profundidad_maxima = profundidad_maxima
+        self.maximo_errores = maximo_errores
+        self.generacion = 0
+        self.invalidar()
+
+    def invalidar(self):
+        """El próximo analizar() analiza todo desde cero"""
+        self.tokens = None  # TokenBuffer del último análisis
+        self.clasificacion = None  # (clases, bits) de AnalizadorSintactico para esos tokens
+        self.ast = None
+        self.errores = None
+        self.raiz = None  # RegistroLista de la lista de sentencias de main
+        self.declaraciones = 0  # hijos de main anteriores a esa lista
+        # (inicio, fin en el texto analizado, fin en el texto actual) de las líneas editadas
+        self.edicion = None
+
+    def registrar_edicion(self, linea, viejas, nuevas):
+        """
+        Las líneas [linea, linea + viejas) (base 1) se reemplazaron por `nuevas`
+        líneas. Las ediciones se acumulan hasta el próximo analizar().
+        """
+        if self.edicion is None:
+            self.edicion = (linea, linea + viejas, linea + nuevas)
+            return
+        inicio, fin_viejo, fin_nuevo = self.edicion
+        fin = max(fin_nuevo, linea + viejas)
+        self.edicion = (min(inicio, linea), fin - (fin_nuevo - fin_viejo), fin + nuevas - viejas)
+
+    def analizar(self, tokens):
+        """
+        (ast, errores) de tokens (los del analizador léxico del texto actual), igual
+        que analizador_sintactico_tokens(tokens)
+        """
+        edicion, self.edicion = self.edicion, None
+        if self.tokens is not None and edicion is None:
+            return self._resultado()
+
+        if self.raiz is not None and edicion is not None:
+            try:
+                if self._reanalizar(tokens, *edicion):
+                    return self._resultado()
+            except Exception as e:
+                # Al analizar todo se repite y se reporta como corresponde
+                log_sintactico.debug("Reanálisis incremental descartado: %s", e)
+        return self._analizar_todo(tokens)
+
+    def _analizar_todo(self, tokens):
+        self.invalidar()
+        buffer = tokens_sintacticos(tokens)
+        if not buffer:
+            return None, [ErrorSintactico("No se encontraron tokens válidos para analizar", 1, 1)]
+
+        # Si se detiene por el límite de errores no hay AST y no queda nada para reutilizar
+        analizador = AnalizadorSintactico(buffer, self.profundidad_maxima, maximo_errores=self.maximo_errores)
+        analizador.registros = []
+        ast, errores = analizador.analizar()
+        self.tokens = buffer
+        self.clasificacion = (analizador.clases, analizador.bits)
+        self.ast, self.errores = ast, errores
+
+        raiz = analizador.registro_raiz
+        if ast is not None and raiz is not None and len(ast.hijos) == 1:
+            main = ast.hijos[0]
+            declaraciones = len(main.hijos) - len(raiz.nodo.hijos)
+            # Con un solo hijo, lista_declaracion() entrega ese nodo y main toma sus hijos
+            if (len(main.hijos) >= 2 and declaraciones >= 0 and main.hijos[declaraciones:] == raiz.nodo.hijos
+                    and all(hijo.tipo == "declaracion_variable" for hijo in main.hijos[:declaraciones])):
+                self.raiz = raiz
+                self.declaraciones = declaraciones
+        return ast, list(errores)
+
+    def _resultado(self):
+        """
+        (ast, errores) del análisis actual como los daría AnalizadorSintactico con
+        maximo_errores: si hay más, los primeros y el resumen en la posición del
+        siguiente, sin AST
+        """
+        maximo = self.maximo_errores
+        if maximo is None or len(self.errores) <= maximo:
+            return self.ast, list(self.errores)
+        siguiente = self.errores[maximo]
+        resumen = ErrorSintactico(mensaje_limite_errores(maximo), siguiente.linea, siguiente.columna)
+        return None, self.errores[:maximo] + [resumen]
+
+    def _reanalizar(self, tokens, inicio, fin_viejo, fin_nuevo):
+        """Aplica la edición reanalizando una lista; False si hay que analizar todo"""
+        viejos = self.tokens
+        a = bisect_left(viejos.lineas, inicio)
+        b_viejo = bisect_left(viejos.lineas, fin_viejo)
+        desde = bisect_left(tokens, inicio, key=_linea_token)
+        hasta = bisect_left(tokens, fin_nuevo, key=_linea_token)
+        editados = []
+        for indice in range(desde, hasta):
+            token = tokens[indice]
+            if token.tipo != 'ERROR':
+                editados.append(Token(mapear_tipo_token(token.tipo), token.valor, token.linea, token.columna))
+        b_nuevo = a + len(editados)
+        lineas = fin_nuevo - fin_viejo
+
+        camino = self._lista_afectada(a, b_viejo)
+        if camino is None:
+            return False
+        buffer = viejos.empalmar(a, b_viejo, editados, lineas)
+        clases, bits = self.clasificacion
+        clases_editados = clasificar_tokens(editados)
+        clasificacion = (clases[:a] + clases_editados + clases[b_viejo:],
+                         bits[:a] + [1 << clase for clase in clases_editados] + bits[b_viejo:])
+
+        # Desde la lista más interna hacia main, hasta que una resincronice
+        for nivel in range(len(camino), 0, -1):
+            if self._reanalizar_lista(buffer, clasificacion, camino[:nivel], a, b_viejo, b_nuevo, lineas):
+                self.tokens = buffer
+                self.clasificacion = clasificacion
+                log_sintactico.info("Reanálisis incremental: %d tokens editados", len(editados))
+                return True
+        return False
+
+    def _lista_afectada(self, a, b_viejo):
+        """
+        Camino [(registro, posición base, errores base), ...] desde la lista de main
+        hasta la lista más interna con un punto de control antes del token a y otro
+        después de b_viejo; None si la edición no cae en la lista de main
+        """
+        registro = self.raiz
+        if not (registro.posiciones[0] < a and registro.posiciones[-1] > b_viejo):
+            return None
+        camino = [(registro, 0, 0)]
+        base_posicion = base_errores = 0
+        while True:
+            i = bisect_left(registro.posiciones, a - base_posicion) - 1
+            inicio = base_posicion + registro.posiciones[i]
+            for sublista in registro.sublistas[i]:
+                if (inicio + sublista.posiciones[0] < a and inicio + sublista.posiciones[-1] > b_viejo
+                        and registro.hijos[i + 1] - registro.hijos[i] == 1
+                        and _camino_hasta(registro.nodo.hijos[registro.hijos[i]], sublista.nodo) is not None):
+                    base_posicion, base_errores = inicio, base_errores + registro.errores[i]
+                    registro = sublista
+                    camino.append((registro, base_posicion, base_errores))
+                    break
+            else:
+                return camino
+
+    def _reanalizar_lista(self, buffer, clasificacion, camino, a, b_viejo, b_nuevo, lineas):
+        """
+        Vuelve a analizar las sentencias de la última lista de camino desde la que
+        contiene el token a hasta resincronizar. False (sin cambiar nada) si no lo hace.
+        """
+        registro, base_posicion, base_errores = camino[-1]
+        posiciones = registro.posiciones
+        ultimo = len(posiciones) - 1
+        i = bisect_left(posiciones, a - base_posicion) - 1
+        desplazamiento = b_nuevo - b_viejo
+
+        analizador = AnalizadorSintactico(buffer, self.profundidad_maxima, clasificacion, maximo_errores=None)
+        analizador.posicion = base_posicion + posiciones[i]
+        analizador.profundidad = registro.profundidad
+        # Los errores de analizador empiezan en 0 donde la lista tenía registro.errores[i]
+        parcial = RegistroLista(NodoAnotado("lista_sentencias"), None, registro.profundidad,
+                                base_posicion, -registro.errores[i])
+        analizador.registros = [parcial]
+        encontrado = []
+
+        def resincronizar(posicion):
+            # Pasada la edición, una vuelta que empieza donde empezaba una del análisis
+            # anterior sigue igual que aquella
+            if posicion <= b_nuevo:
+                return False
+            anterior = posicion - desplazamiento - base_posicion
+            j = bisect_left(posiciones, anterior)
+            if j < ultimo and posiciones[j] == anterior:
+                encontrado.append(j)
+                return True
+            return False
+
+        ejecutar_recorrido(analizador._lista_sentencias(parcial.nodo, parcial, resincronizar))
+        if encontrado:
+            j = encontrado[0]
+        elif (base_posicion + parcial.posiciones[-1] > b_nuevo
+              and parcial.posiciones[-1] - desplazamiento == posiciones[ultimo]):
+            j = ultimo
+        else:
+            return False
+
+        viejo = registro.nodo
+        h_i, h_j = registro.hijos[i], registro.hijos[j]
+        e_i, e_j = base_errores + registro.errores[i], base_errores + registro.errores[j]
+        nuevos = parcial.nodo.hijos
+        total_hijos = len(viejo.hijos) - (h_j - h_i) + len(nuevos)
+        # Una lista que queda vacía cambia la sentencia que la contiene
+        if registro.padre is None:
+            if self.declaraciones + total_hijos < 2:
+                return False
+        elif total_hijos == 0:
+            return False
+
+        errores_sufijo = self.errores[e_j:]
+        if lineas:
+            self.generacion += 1
+            for error in errores_sufijo:
+                error.linea += lineas
+        self.errores = self.errores[:e_i] + analizador.errores + errores_sufijo
+        sufijo = viejo.hijos[h_j:]
+        _desplazar_lineas(sufijo, lineas)
+        nodo = copy.copy(viejo)
+        nodo.hijos = viejo.hijos[:h_i] + nuevos + sufijo
+
+        # Puntos de control: los nuevos en lugar de [i, j) y los siguientes desplazados
+        # (las listas anidadas en esas sentencias son relativas a ellos)
+        cambio_errores = len(analizador.errores) - (e_j - e_i)
+        registro.desplazar(j, desplazamiento, cambio_errores, len(nuevos) - (h_j - h_i))
+        for sublistas in parcial.sublistas:
+            for sublista in sublistas:
+                sublista.padre = registro
+        n = len(parcial.posiciones) - 1
+        registro.posiciones[i:j] = parcial.posiciones[:n]
+        registro.errores[i:j] = parcial.errores[:n]
+        registro.hijos[i:j] = [cantidad + h_i for cantidad in parcial.hijos[:n]]
+        registro.sublistas[i:j] = parcial.sublistas[:n]
+        registro.nodo = nodo
+
+        # Copiar el camino hasta main; lo que sigue a la lista en cada nivel se desplaza
+        hijo_viejo = viejo
+        for nivel in range(len(camino) - 1, 0, -1):
+            actual, base_actual, _ = camino[nivel]
+            padre, base_padre, _ = camino[nivel - 1]
+            k = bisect_left(padre.posiciones, base_actual - base_padre)
+            hermanas = padre.sublistas[k]
+            for sublista in hermanas[hermanas.index(actual) + 1:]:
+                sublista.desplazar(0, desplazamiento, cambio_errores)
+            padre.desplazar(k + 1, desplazamiento, cambio_errores)
+
+            indice = padre.hijos[k]
+            nodo_padre = copy.copy(padre.nodo)
+            nodo_padre.hijos = list(padre.nodo.hijos)
+            item = nodo_padre.hijos[indice]
+            nodo_padre.hijos[indice] = _copiar_camino(item, _camino_hasta(item, hijo_viejo), actual.nodo, lineas)
+            _desplazar_lineas(nodo_padre.hijos[indice + 1:], lineas)
+            hijo_viejo = padre.nodo
+            padre.nodo = nodo_padre
+
+        main = self.ast.hijos[0]
+        nuevo_main = copy.copy(main)
+        nuevo_main.hijos = main.hijos[:self.declaraciones] + self.raiz.nodo.hijos
+        programa = copy.copy(self.ast)
+        programa.hijos = [nuevo_main]
+        self.ast = programa
+        return True
+
 def mostrar_ast_texto(nodo, nivel=0):
     """Muestra el AST en formato de texto con indentación"""
     if nodo is None:
         return ""
-    
-    indentacion = "  " * nivel
-    resultado = f"{indentacion}{nodo.tipo}"
-        
-    resultado += "\n"
-    
-    for hijo in nodo.hijos:
-        resultado += mostrar_ast_texto(hijo, nivel + 1)
-    
-    return resultado
\ No newline at end of file
+
+    if isinstance(nodo, NodoArena):
+        # Recorrido por índices sobre los arreglos de la arena, sin crear vistas
+        arena = nodo.arena
+        nombres, tipos = arena.internador.nombres, arena.tipos
+        return "".join(f"{'  ' * nivel}{nombres[tipos[indice]]}\n"
+                       for indice, nivel in arena.preorden(nodo.indice, nivel))
+
+    # Recorrido en preorden con una pila explícita (sin límite de profundidad)
+    lineas = []
+    pila = [(nodo, nivel)]
+    while pila:
+        nodo, nivel = pila.pop()
+        lineas.append(f"{'  ' * nivel}{nodo.tipo}\n")
+        pila.extend((hijo, nivel + 1) for hijo in reversed(nodo.hijos))
+
+    return "".join(lineas)
@@ -0,0 +1,216 @@
+# pipeline.py
+# Compilación en memoria: cada fase recibe directamente el resultado de la anterior
+# (tokens, AST, AST anotado, tabla de símbolos, cuádruplas) sin escribir ni releer
+# tokens.txt. Los archivos de artefactos se escriben solo si se piden.
+
+import os
+
+from archivo_tokens import tokens_binarios
+from escritor_artefactos import escritor_artefactos
+from logic import analizador_lexico, analizador_sintactico_tokens, esquema_tokens, mostrar_ast_texto
+from analizador_semantico import ejecutar_analisis_semantico
+from generador_codigo_intermedio import CodigoIntermedioGenerator
+
+
+def texto_ast_anotado(nodo, nivel=0):
+    """Genera representación en texto del AST anotado"""
+    if nodo is None:
+        return ""
+
+    # Preorden con una pila explícita: la profundidad del AST no está limitada
+    lineas = []
+    pila = [(nodo, nivel)]
+    while pila:
+        nodo, nivel = pila.pop()
+        indentacion = "  " * nivel
+        resultado = f"{indentacion}{nodo.tipo}"
+
+        if hasattr(nodo, 'valor') and nodo.valor:
+            resultado += f": {nodo.valor}"
+
+        if hasattr(nodo, 'tipo_dato') and nodo.tipo_dato:
+            resultado += f" | Tipo: {nodo.tipo_dato}"
+
+        if hasattr(nodo, 'valor_calculado') and nodo.valor_calculado is not None:
+            resultado += f" | Valor: {nodo.valor_calculado}"
+
+        lineas.append(resultado + "\n")
+        pila.extend((hijo, nivel + 1) for hijo in reversed(nodo.hijos))
+
+    return "".join(lineas)
+
+
+def texto_tabla_simbolos(tabla_simbolos):
+    """Tabla de símbolos en el formato de tabla_simbolos.txt"""
+    tabla = "TABLA DE SÍMBOLOS\n"
+    tabla += "=" * 100 + "\n"
+    tabla += f"{'NAME':<15} {'TYPE':<10} {'OFFSET':<10} {'COUNT':<7} {'LINES':<30}\n"
+    tabla += "-" * 100 + "\n"
+    for offset, simbolo in enumerate(tabla_simbolos.listar_simbolos()):
+        count = len(simbolo.ubicaciones)
+        lines = ", ".join([str(l) for l, c in simbolo.ubicaciones])
+        tabla += f"{simbolo.nombre:<15} {simbolo.tipo or '':<10} {offset:<10} {count:<7} {lines:<30}\n"
+    return tabla
+
+
+class CompilationPipeline:
+    """
+    Ejecuta las fases del compilador bajo demanda y guarda el resultado de cada una:
+    pedir una fase ejecuta antes las que falten y pedirla otra vez no la repite.
+    Con escribir_artefactos=True cada fase guarda además sus archivos
+    (tokens.bin, ast.txt, tabla_simbolos.txt...) en `directorio`; el texto se
+    genera y se escribe en el hilo de `escritor` (por defecto el compartido).
+    Con un AnalizadorIncremental la fase sintáctica reutiliza su análisis anterior.
+    motor_sintactico elige el analizador sintáctico (ver MOTORES_SINTACTICOS); el
+    incremental se usa solo con el descendente.
+    """
+
+    def __init__(self, texto="", tokens=None, escribir_artefactos=False, directorio=".", motor="regex",
+                 escritor=None, cache=None, analizador_incremental=None, motor_sintactico="descendente"):
+        self.texto = texto
+        self.motor = motor
+        self.motor_sintactico = motor_sintactico
+        self.escribir_artefactos = escribir_artefactos
+        self.directorio = directorio
+        self.escritor = escritor
+        # CacheFases opcional: los resultados se buscan por el hash de texto
+        self.cache = cache
+        self.clave = cache.clave(texto) if cache is not None else None
+        self.analizador_incremental = analizador_incremental
+        self._tokens = tokens
+        self._sintactico = None
+        self._esquema = None
+        self._semantico = None
+        self._cuadruplas = None
+        if tokens is not None and escribir_artefactos:
+            self._guardar_lexico()
+
+    def lexico(self):
+        """Lista de tokens del análisis léxico (incluye los ERROR)"""
+        if self._tokens is None:
+            self._tokens = self._desde_cache('lexico', lambda: analizador_lexico(self.texto, self.motor))
+            if self.escribir_artefactos:
+                self._guardar_lexico()
+        return self._tokens
+
+    def sintactico(self):
+        """Retorna (ast, errores_sintacticos)"""
+        if self._sintactico is None:
+            # Los errores dependen del motor: cada uno tiene su entrada en la caché
+            fase = 'sintactico' if self.motor_sintactico == "descendente" else f'sintactico_{self.motor_sintactico}'
+            if self.analizador_incremental is not None and self.motor_sintactico == "descendente":
+                # Da el mismo resultado que el análisis completo, así que sirve su entrada
+                self._sintactico = self._buscar_en_cache(fase) or self._sintactico_incremental()
+            else:
+                self._sintactico = self._desde_cache(
+                    fase, lambda: analizador_sintactico_tokens(self.lexico(), self.motor_sintactico)
+                )
+            if self.escribir_artefactos:
+                self._guardar_sintactico()
+        return self._sintactico
+
+    def _sintactico_incremental(self):
+        """
+        (ast, errores) del analizador incremental. Su AST comparte nodos con los de
+        otras versiones del texto y les corrige la línea en su lugar: se guarda solo en
+        memoria, junto con el analizador y su generación, y vale mientras no cambien.
+        """
+        analizador = self.analizador_incremental
+        guardado = self._buscar_en_cache('sintactico_incremental', solo_memoria=True)
+        if guardado is not None and guardado[0] is analizador and guardado[1] == analizador.generacion:
+            return guardado[2]
+        resultado = analizador.analizar(self.lexico())
+        self._guardar_en_cache('sintactico_incremental', (analizador, analizador.generacion, resultado),
+                               solo_memoria=True)
+        return resultado
+
+    def esquema(self):
+        """NodoEsquema del programa (análisis de esqueleto, ver AnalizadorSintactico.esquema)"""
+        if self._esquema is None:
+            self._esquema = esquema_tokens(self.lexico())
+        return self._esquema
+
+    def semantico(self):
+        """Retorna (ast_anotado, tabla_simbolos, errores_semanticos); None si no hay AST"""
+        if self._semantico is None:
+            # Con la entrada en la caché no hace falta el análisis sintáctico
+            self._semantico = self._buscar_en_cache('semantico')
+            if self._semantico is None:
+                ast, _ = self.sintactico()
+                if not ast:
+                    return None
+                self._semantico = ejecutar_analisis_semantico(ast)
+                self._guardar_en_cache('semantico', self._semantico)
+            if self.escribir_artefactos:
+                self._guardar_semantico()
+        return self._semantico
+
+    def codigo_intermedio(self):
+        """
+        Cuádruplas como strings "(op, a1, a2, res)". None si no hay AST o si el
+        análisis semántico encontró errores.
+        """
+        if self._cuadruplas is None:
+            # Con la entrada en la caché no hacen falta las fases anteriores
+            self._cuadruplas = self._buscar_en_cache('codigo_intermedio')
+            if self._cuadruplas is None:
+                semantico = self.semantico()
+                if semantico is None:
+                    return None
+                ast_anotado, _, errores_sem = semantico
+                if errores_sem:
+                    return None
+                self._cuadruplas = CodigoIntermedioGenerator().generar(ast_anotado)
+                self._guardar_en_cache('codigo_intermedio', self._cuadruplas)
+        return self._cuadruplas
+
+    def _buscar_en_cache(self, fase, solo_memoria=False):
+        """Resultado guardado de la fase para este texto, o None"""
+        if self.cache is None:
+            return None
+        return self.cache.obtener(self.clave, fase, solo_memoria)
+
+    def _guardar_en_cache(self, fase, resultado, solo_memoria=False):
+        if self.cache is not None:
+            self.cache.guardar(self.clave, fase, resultado, solo_memoria)
+
+    def _desde_cache(self, fase, calcular):
+        """Resultado de la fase desde la caché, o calculado y guardado en ella"""
+        resultado = self._buscar_en_cache(fase)
+        if resultado is None:
+            resultado = calcular()
+            self._guardar_en_cache(fase, resultado)
+        return resultado
+
+    # -------- ARTEFACTOS -------- #
+
+    def _guardar(self, nombre, contenido):
+        """Programa la escritura; contenido puede ser una función que genere el texto"""
+        escritor = self.escritor or escritor_artefactos()
+        escritor.escribir(os.path.join(self.directorio, nombre), contenido)
+
+    def _guardar_lexico(self):
+        tokens = self._tokens
+        # tokens.bin: formato binario de archivo_tokens.py (python archivo_tokens.py tokens.bin --text)
+        self._guardar("tokens.bin", lambda: tokens_binarios(token for token in tokens if token.tipo != 'ERROR'))
+        self._guardar("errores.txt", lambda: "".join(f"{token}\n" for token in tokens if token.tipo == 'ERROR'))
+
+    def _guardar_sintactico(self):
+        ast, errores = self._sintactico
+        if ast:
+            self._guardar("ast.txt", lambda: mostrar_ast_texto(ast))
+        else:
+            self._guardar("ast.txt", "No se pudo generar el AST debido a errores sintácticos")
+        if errores:
+            self._guardar("errores_sintacticos.txt", "".join(f"{error}\n" for error in errores))
+        else:
+            self._guardar("errores_sintacticos.txt", "No se encontraron errores sintácticos")
+
+    def _guardar_semantico(self):
+        ast_anotado, tabla_simbolos, errores_sem = self._semantico
+        self._guardar("ast_anotado.txt", lambda: texto_ast_anotado(ast_anotado))
+        self._guardar("tabla_simbolos.txt", lambda: texto_tabla_simbolos(tabla_simbolos))
+        if errores_sem:
+            self._guardar("errores_semanticos.txt", "".join(f"{error}\n" for error in errores_sem))
+        else:
+            self._guardar("errores_semanticos.txt", "No se encontraron errores semánticos\n")
@@ -0,0 +1,37 @@
+# recorrido.py
+# Ejecución de recorridos recursivos sobre una pila explícita. Un recorrido se
+# escribe como generador: en lugar de llamarse a sí mismo hace
+#     resultado = yield self._visitar(hijo)
+# y ejecutar_recorrido() corre los generadores anidados en una lista, así que la
+# profundidad del árbol (o del anidamiento del programa) no consume marcos de
+# Python y no hay RecursionError. Las excepciones se propagan al generador padre
+# como si la llamada fuera directa.
+
+
+def ejecutar_recorrido(generador):
+    """Ejecuta generador y los que este pida con yield; retorna el valor del primero"""
+    pila = [generador]
+    valor = None
+    error = None
+    while True:
+        actual = pila[-1]
+        try:
+            if error is None:
+                pedido = actual.send(valor)
+            else:
+                lanzado, error = error, None
+                pedido = actual.throw(lanzado)
+        except StopIteration as fin:
+            pila.pop()
+            valor = fin.value
+            if not pila:
+                return valor
+            continue
+        except BaseException as e:
+            pila.pop()
+            if not pila:
+                raise
+            error = e
+            continue
+        pila.append(pedido)
+        valor = None
@@ -0,0 +1,91 @@
+# registro.py
+# Registro de mensajes del compilador por fase sobre el módulo logging.
+# Cada fase tiene su logger ("compilador.lexico", "compilador.sintactico",
+# "compilador.semantico", ...). Importar el módulo solo agrega un NullHandler: la
+# aplicación que lo usa decide dónde van los mensajes. Los puntos de entrada (ide.py,
+# los benchmarks) llaman a configurar(), que los muestra por consola desde el nivel
+# de la variable de entorno COMPILADOR_LOG (DEBUG, INFO, ...; WARNING por defecto).
+# Los mensajes se formatean con argumentos (log.debug("x=%s", x)) y solo si el
+# nivel está activo. En los caminos calientes se consulta antes depuracion_activa().
+
+import logging
+import os
+from collections import deque
+from contextlib import contextmanager
+
+RAIZ = "compilador"
+FORMATO = "%(name)s %(levelname)s %(message)s"
+
+_raiz = logging.getLogger(RAIZ)
+_raiz.addHandler(logging.NullHandler())
+_consola = None
+
+
+def logger_fase(fase):
+    """Logger de una fase del compilador"""
+    return logging.getLogger(f"{RAIZ}.{fase}")
+
+
+def depuracion_activa(log):
+    """True si log emite mensajes DEBUG; los analizadores lo consultan una vez al crearse"""
+    return log.isEnabledFor(logging.DEBUG)
+
+
+def configurar(nivel=None):
+    """
+    Muestra por consola (stderr) los mensajes del compilador desde nivel; sin
+    nivel se usa COMPILADOR_LOG
+    """
+    global _consola
+    if nivel is None:
+        nivel = os.environ.get("COMPILADOR_LOG", "WARNING")
+    if isinstance(nivel, str):
+        nivel = logging.getLevelName(nivel.upper())
+        if not isinstance(nivel, int):
+            nivel = logging.WARNING
+    if _consola is None:
+        _consola = logging.StreamHandler()
+        _consola.setFormatter(logging.Formatter(FORMATO))
+        _raiz.addHandler(_consola)
+        _raiz.propagate = False
+    _consola.setLevel(nivel)
+    _raiz.setLevel(nivel)
+
+
+class TrazaCircular(logging.Handler):
+    """
+    Guarda los últimos `capacidad` registros en memoria. Los mensajes no se
+    formatean al guardarlos, solo al pedir lineas().
+    """
+
+    def __init__(self, capacidad=10000):
+        super().__init__(logging.DEBUG)
+        self.registros = deque(maxlen=capacidad)
+        self.setFormatter(logging.Formatter(FORMATO))
+
+    def emit(self, registro):
+        self.registros.append(registro)
+
+    def lineas(self):
+        return [self.format(registro) for registro in self.registros]
+
+
+@contextmanager
+def capturar_traza(capacidad=10000, nivel=logging.DEBUG):
+    """
+    Activa los mensajes desde nivel solo dentro del bloque y los guarda en una
+    TrazaCircular; la consola conserva su propio nivel.
+
+        with capturar_traza() as traza:
+            analizador_sintactico_tokens(tokens)
+        print("\\n".join(traza.lineas()))
+    """
+    traza = TrazaCircular(capacidad)
+    nivel_anterior = _raiz.level
+    _raiz.addHandler(traza)
+    _raiz.setLevel(min(nivel, nivel_anterior) if nivel_anterior else nivel)
+    try:
+        yield traza
+    finally:
+        _raiz.removeHandler(traza)
+        _raiz.setLevel(nivel_anterior)
@@ -0,0 +1,36 @@
+# test_recuperacion.py
+# Pruebas de regresión de la recuperación de errores sintácticos.
+# Uso: python -m unittest test_recuperacion   (o python -m pytest test_recuperacion.py)
+
+import unittest
+
+from pipeline import CompilationPipeline
+
+
+class PruebaRecuperacion(unittest.TestCase):
+
+    def test_terminador_de_bloque_dentro_de_expresion(self):
+        # El 'else' suelto dentro de la condición no debe cerrar el while ni main
+        fuente = "main { bool total; while (total else true; total = true; end }"
+        pipeline = CompilationPipeline(fuente)
+        ast, errores = pipeline.sintactico()
+
+        main = ast.hijos[0]
+        iteracion = main.hijos[-1]
+        self.assertEqual(iteracion.tipo, "iteracion")
+        self.assertEqual([hijo.tipo for hijo in iteracion.hijos], ["condicion", "bloque_while"])
+        self.assertFalse(any("final del programa" in str(error) for error in errores))
+
+        _, _, errores_semanticos = pipeline.semantico()
+        self.assertEqual(errores_semanticos, [])
+
+    def test_bloques_incompletos_en_el_semantico(self):
+        # Un while sin cuerpo o un do sin condición no rompen el análisis semántico
+        for fuente in ("main { int x; while x < 1 end }",
+                       "main { int x; do x = 1; }"):
+            with self.subTest(fuente=fuente):
+                CompilationPipeline(fuente).semantico()
+
+
+if __name__ == "__main__":
+    unittest.main()